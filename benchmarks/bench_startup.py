@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+Startup-time budget check for Toolkit.py, based on `python -X importtime`.
+
+Imports Toolkit in fresh interpreters and takes the best cumulative import time of
+several runs, and times a short command for both launch styles (python Toolkit.py
+and python -m Toolkit) against a bare interpreter. Fails (exit code 1) when the
+import or either launch exceeds its budget, or when a module that should only load
+with its tool is imported at startup. Also prints the slowest imports.
+
+USAGE
+    python benchmarks/bench_startup.py [--budget-ms 50] [--launch-budget-ms 75] [--runs 5] [--top 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only the tools using them may import
+DEFERRED = ("asyncio", "smtplib", "email.message", "csv", "ctypes", "socket", "subprocess",
+            "getpass", "colorama", "http.server", "concurrent.futures", "urllib.parse")
+
+
+def import_times():
+    """
+    Imports Toolkit once with -X importtime. Returns (total_us, imports), where
+    imports maps each module Toolkit pulled in to its cumulative time in us.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import Toolkit"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    nested = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == "Toolkit" and not name.startswith("  "):
+            return int(cumulative), dict(nested)
+        if not name.startswith("  "):
+            nested = [] # A top-level import that happened before Toolkit
+            continue
+        nested.append((name.strip(), int(cumulative)))
+    raise RuntimeError("Toolkit did not show up in the -X importtime output")
+
+
+def command_ms(args, runs):
+    """Best wall time of running a command, in ms."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="maximum import time (default: 50)")
+    parser.add_argument("--launch-budget-ms", type=float, default=75.0,
+                        help="maximum time a launch takes beyond a bare interpreter (default: 75)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    import_times() # Writes the bytecode cache, so the runs below time the cached import
+    runs = [import_times() for _ in range(args.runs)]
+    total_us, imports = min(runs, key=lambda run: run[0])
+
+    print(f"import Toolkit: {total_us / 1000:8.1f} ms (best of {args.runs}, budget {args.budget_ms:g} ms)")
+    print(f"slowest of {len(imports)} imports:")
+    for name, us in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"    {us / 1000:8.1f} ms  {name}")
+
+    python_ms = command_ms([sys.executable, "-c", "pass"], args.runs)
+    script_ms = command_ms([sys.executable, "Toolkit.py", "password"], args.runs)
+    module_ms = command_ms([sys.executable, "-m", "Toolkit", "password"], args.runs)
+    print(f"python -c pass:              {python_ms:8.1f} ms")
+    print(f"python Toolkit.py password:  {script_ms:8.1f} ms  (+{script_ms - python_ms:.1f} ms, "
+          f"budget +{args.launch_budget_ms:g} ms)")
+    print(f"python -m Toolkit password:  {module_ms:8.1f} ms  (+{module_ms - python_ms:.1f} ms)")
+
+    failed = False
+    eager = [name for name in DEFERRED if name in imports]
+    if eager:
+        print(f"FAIL: imported at startup, should load with their tool: {', '.join(eager)}")
+        failed = True
+    if total_us / 1000 > args.budget_ms:
+        print(f"FAIL: startup import time {total_us / 1000:.1f} ms exceeds the {args.budget_ms:g} ms budget")
+        failed = True
+    for launch, ms in (("python Toolkit.py", script_ms), ("python -m Toolkit", module_ms)):
+        if ms - python_ms > args.launch_budget_ms:
+            print(f"FAIL: '{launch}' takes {ms - python_ms:.1f} ms beyond the interpreter, "
+                  f"over the {args.launch_budget_ms:g} ms budget")
+            failed = True
+    if not failed:
+        print("OK: within the startup budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark suite for the Toolkit.py tool engines, on deterministic synthetic fixtures.
+
+Times the engines behind the menus (no prompts) on generated directory trees, a CSV
+file, a large text log and a local HTTP image site. Every run of a case happens in a
+fresh interpreter, so its peak RSS is its own. Prints a table to stderr and a JSON
+report (best and median wall time, throughput, peak RSS) to stdout or --output.
+With --baseline, each case is compared against a saved report and the exit code is 1
+when one got slower than the tolerance allows.
+
+USAGE
+    python benchmarks/bench_suite.py [--only csv,search] [--repeat 3]
+                                     [--save-baseline base.json | --baseline base.json]
+    python benchmarks/bench_suite.py --log-mb 4096      # multi-GB log
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import importlib.util
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures
+
+REPORT_VERSION = 1
+DEFAULT_FIXTURES = os.path.join(tempfile.gettempdir(), "toolkit-bench-fixtures")
+
+
+def tree_stats(root):
+    """Returns (file count, total bytes) under root."""
+    files = size = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            files += 1
+            size += os.path.getsize(os.path.join(dirpath, name))
+    return files, size
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (or its largest child), in MB; None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except (ImportError, AttributeError):
+            return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# --- Cases ---
+# Each case gets the fixture folder, a scratch folder and the image site URL, does its
+# untimed setup and returns (timed function, bytes processed). The function returns
+# (items processed, details dict).
+
+def case_organize(Toolkit, fx, work, url):
+    src = shutil.copytree(os.path.join(fx, "flat"), os.path.join(work, "flat"))
+    size = tree_stats(src)[1]
+
+    def run():
+        result = Toolkit.organize_folder(src, os.path.join(work, "sorted"))
+        return len(result["moved"]) + len(result["uncategorized"]), {
+            "moved": len(result["moved"]), "uncategorized": len(result["uncategorized"]),
+            "errors": len(result["errors"])}
+    return run, size
+
+
+def case_clean(Toolkit, fx, work, url):
+    # copytree keeps the aged mtimes of files and folders
+    tree = shutil.copytree(os.path.join(fx, "tree"), os.path.join(work, "tree"))
+    files, size = tree_stats(tree)
+
+    def run():
+        old_files, empty_dirs = Toolkit.find_old_items(tree, 30)
+        for path in old_files:
+            Toolkit.remove_item(path)
+        for path in empty_dirs:
+            Toolkit.remove_item(path, is_file=False)
+        return files, {"deleted_files": len(old_files), "deleted_dirs": len(empty_dirs)}
+    return run, size
+
+
+def case_clean_free(Toolkit, fx, work, url):
+    tree = shutil.copytree(os.path.join(fx, "tree"), os.path.join(work, "tree"))
+    files, size = tree_stats(tree)
+
+    def run():
+        # Asks for half the tree's size more free space than the drive has now
+        plan = Toolkit.plan_free_space(tree, shutil.disk_usage(tree).free + size // 2)
+        result = Toolkit.free_space(plan)
+        return files, {"selected": len(plan["files"]), "deleted": len(result["deleted"]),
+                       "target_reached": result["target_reached"]}
+    return run, size
+
+
+def case_rename(Toolkit, fx, work, url):
+    src = shutil.copytree(os.path.join(fx, "flat"), os.path.join(work, "flat"))
+
+    def run():
+        result = Toolkit.rename_files(src, "bench-")
+        return len(result["renamed"]), {"errors": len(result["errors"])}
+    return run, None
+
+
+def case_csv(Toolkit, fx, work, url):
+    path = os.path.join(fx, "data.csv")
+
+    def run():
+        rows = malformed = 0
+        for record in Toolkit.iter_csv_totals(path, has_header=True):
+            rows += 1
+            if record is None:
+                malformed += 1
+        return rows, {"malformed": malformed}
+    return run, os.path.getsize(path)
+
+
+def case_search(Toolkit, fx, work, url):
+    tree = os.path.join(fx, "tree")
+    files, size = tree_stats(tree)
+
+    def run():
+        hits = sum(1 for _ in Toolkit.term_fetch(tree, fixtures.NEEDLE))
+        return files, {"matches": hits}
+    return run, size
+
+
+def case_search_indexed(Toolkit, fx, work, url):
+    tree = os.path.join(fx, "tree")
+    index_path = os.path.join(work, "tree.tri")
+    index = Toolkit.TrigramIndex(tree, index_path)
+    index.update()
+    index.save()
+    files, size = tree_stats(tree)
+
+    def run():
+        # A repeat search: load the saved index, check it is current, search candidates
+        index = Toolkit.TrigramIndex(tree, index_path)
+        index.load()
+        index.update()
+        hits = sum(1 for _ in Toolkit.term_fetch(tree, fixtures.NEEDLE, index=index))
+        return files, {"matches": hits}
+    return run, size
+
+
+def case_log_tail(Toolkit, fx, work, url):
+    path = os.path.join(fx, "app.log")
+
+    def run():
+        matches = Toolkit.tail_matches(path, 100, level="error")
+        return len(matches), {}
+    return run, None
+
+
+def _log_bounds(fx):
+    with open(os.path.join(fx, "manifest.json"), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return datetime.fromisoformat(manifest["log_first"]), datetime.fromisoformat(manifest["log_last"])
+
+
+def case_log_range(Toolkit, fx, work, url):
+    path = os.path.join(fx, "app.log")
+    first, last = _log_bounds(fx)
+    start = first + (last - first) / 2
+    end = start + timedelta(minutes=10)
+
+    def run():
+        lines = sum(1 for _ in Toolkit.time_range_lines(path, start, end))
+        return lines, {"start": start.isoformat(), "end": end.isoformat()}
+    return run, None
+
+
+def case_log_scan(Toolkit, fx, work, url):
+    # A full scan: every line of the log is parsed and filtered
+    path = os.path.join(fx, "app.log")
+    first, last = _log_bounds(fx)
+
+    def run():
+        errors = sum(1 for _ in Toolkit.time_range_lines(path, first, last, level="error"))
+        return errors, {}
+    return run, os.path.getsize(path)
+
+
+def case_log_cluster(Toolkit, fx, work, url):
+    path = os.path.join(fx, "app.log")
+
+    def run():
+        rows, stats = Toolkit.cluster_error_signatures([path], level="error")
+        return stats["lines"], {"matched": stats["matched"], "signatures": len(rows)}
+    return run, os.path.getsize(path)
+
+
+def case_tarball(Toolkit, fx, work, url):
+    # The archive step of the TarBall Mailer; the SMTP notification is not timed
+    tree = os.path.join(fx, "tree")
+    files, size = tree_stats(tree)
+
+    def run():
+        archive = Toolkit.create_backup_archive(tree, os.path.join(work, "backups"))
+        return files, {"archive_bytes": os.path.getsize(archive)}
+    return run, size
+
+
+def case_images(Toolkit, fx, work, url):
+    save_dir = os.path.join(work, "images")
+
+    def run():
+        result = Toolkit.extract_images(url + "index.html", save_dir)
+        return len(result["downloaded"]), {"errors": len(result["errors"])}
+    return run, tree_stats(os.path.join(fx, "site", "img"))[1]
+
+
+CASES = {
+    "organize": case_organize,
+    "clean": case_clean,
+    "clean-free": case_clean_free,
+    "rename": case_rename,
+    "csv": case_csv,
+    "search": case_search,
+    "search-indexed": case_search_indexed,
+    "log-tail": case_log_tail,
+    "log-range": case_log_range,
+    "log-scan": case_log_scan,
+    "log-cluster": case_log_cluster,
+    "tarball": case_tarball,
+    "images": case_images,
+}
+
+# Cases that need optional packages; they are skipped when one is missing
+CASE_PACKAGES = {"images": ("requests", "bs4")}
+
+
+def run_case(name, fx, url):
+    """Runs one case once in this process and prints its measurement as JSON."""
+    real_stdout = sys.stdout
+    work = tempfile.mkdtemp(prefix=f"{name}-", dir=fx)
+    try:
+        # The engines report unreadable files through out_error; keep stdout for the result
+        sys.stdout = sys.stderr
+        import Toolkit
+        run, size = CASES[name](Toolkit, fx, work, url)
+        start = time.perf_counter()
+        items, details = run()
+        wall = time.perf_counter() - start
+    finally:
+        sys.stdout = real_stdout
+        shutil.rmtree(work, ignore_errors=True)
+    json.dump({"wall_s": wall, "items": items, "bytes": size, "details": details,
+               "peak_rss_mb": peak_rss_mb()}, sys.stdout)
+    return 0
+
+
+def measure(name, fx, url, repeat):
+    """Runs a case `repeat` times, each in a fresh interpreter, and summarizes the runs."""
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-case", name,
+                               "--fixtures", fx, "--url", url or ""],
+                              cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            return {"error": f"exit code {proc.returncode}"}
+        runs.append(json.loads(proc.stdout))
+
+    walls = [run["wall_s"] for run in runs]
+    best = min(walls)
+    last = runs[-1]
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "runs": walls,
+        "wall_s": best,
+        "median_s": statistics.median(walls),
+        "items": last["items"],
+        "bytes": last["bytes"],
+        "items_per_s": last["items"] / best if best else None,
+        "mb_per_s": last["bytes"] / (1024 * 1024) / best if best and last["bytes"] else None,
+        "peak_rss_mb": max(rss) if rss else None,
+        "details": last["details"],
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Compares the best wall time of every case in both reports. Returns {case: {...}}
+    with the time ratio (current / baseline) and 'slower', 'faster' or 'same'.
+    """
+    comparison = {}
+    for name, case in report["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base or "wall_s" not in base or "wall_s" not in case:
+            continue
+        ratio = case["wall_s"] / base["wall_s"] if base["wall_s"] else None
+        if ratio is None:
+            status = "same"
+        elif ratio > 1 + tolerance:
+            status = "slower"
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = "same"
+        entry = {"baseline_s": base["wall_s"], "current_s": case["wall_s"], "ratio": ratio, "status": status}
+        if base.get("peak_rss_mb") and case.get("peak_rss_mb"):
+            entry["rss_ratio"] = case["peak_rss_mb"] / base["peak_rss_mb"]
+        comparison[name] = entry
+    return comparison
+
+
+def print_table(report, stream):
+    comparison = report.get("comparison", {})
+    print(f"{'case':<15} {'best s':>9} {'median s':>9} {'items/s':>11} {'MB/s':>8} {'RSS MB':>8}  vs baseline",
+          file=stream)
+    for name, case in report["cases"].items():
+        if "wall_s" not in case:
+            print(f"{name:<15} {case.get('skipped') or case.get('error')}", file=stream)
+            continue
+        items_per_s = f"{case['items_per_s']:11.0f}" if case["items_per_s"] else f"{'-':>11}"
+        mb_per_s = f"{case['mb_per_s']:8.1f}" if case["mb_per_s"] else f"{'-':>8}"
+        rss = f"{case['peak_rss_mb']:8.1f}" if case["peak_rss_mb"] else f"{'-':>8}"
+        versus = ""
+        if name in comparison and comparison[name]["ratio"] is not None:
+            versus = f"x{comparison[name]['ratio']:.2f} {comparison[name]['status']}"
+        print(f"{name:<15} {case['wall_s']:9.3f} {case['median_s']:9.3f} {items_per_s} {mb_per_s} {rss}  {versus}",
+              file=stream)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--files", type=int, default=2000, help="files in the directory tree (default: 2000)")
+    parser.add_argument("--depth", type=int, default=3, help="tree depth (default: 3)")
+    parser.add_argument("--fanout", type=int, default=4, help="sub-folders per folder (default: 4)")
+    parser.add_argument("--file-kb", type=int, default=2, help="average tree file size in KB (default: 2)")
+    parser.add_argument("--flat-files", type=int, default=2000, help="files in the flat folder (default: 2000)")
+    parser.add_argument("--csv-rows", type=int, default=500000, help="CSV rows (default: 500000)")
+    parser.add_argument("--log-mb", type=int, default=256, help="log size in MB (default: 256)")
+    parser.add_argument("--images", type=int, default=200, help="images on the test site (default: 200)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best is reported (default: 3)")
+    parser.add_argument("--only", help="comma-separated cases to run: " + ", ".join(CASES))
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES,
+                        help="fixture folder, reused while the sizes stay the same")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="compare against this saved report")
+    parser.add_argument("--save-baseline", metavar="FILE", help="also save the report as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed slowdown against the baseline (default: 0.10 = 10%%)")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    fx = os.path.abspath(args.fixtures)
+    if args.run_case:
+        return run_case(args.run_case, fx, args.url)
+
+    names = list(CASES)
+    if args.only:
+        names = [name.strip() for name in args.only.split(",") if name.strip()]
+        unknown = [name for name in names if name not in CASES]
+        if unknown:
+            parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    params = {"files": args.files, "depth": args.depth, "fanout": args.fanout, "file_kb": args.file_kb,
+              "flat_files": args.flat_files, "csv_rows": args.csv_rows, "log_mb": args.log_mb,
+              "images": args.images}
+    start = time.perf_counter()
+    fixtures.prepare(fx, params)
+    print(f"fixtures ready in {fx} ({time.perf_counter() - start:.1f} s)", file=sys.stderr)
+
+    report = {
+        "version": REPORT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": params,
+        "repeat": args.repeat,
+        "cases": {},
+    }
+    with fixtures.serve_directory(os.path.join(fx, "site")) as url:
+        for name in names:
+            missing = [pkg for pkg in CASE_PACKAGES.get(name, ()) if importlib.util.find_spec(pkg) is None]
+            if missing:
+                report["cases"][name] = {"skipped": f"not installed: {', '.join(missing)}"}
+            else:
+                report["cases"][name] = measure(name, fx, url, args.repeat)
+            print(f"  {name}: done", file=sys.stderr)
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("params") != params:
+            print("warning: the baseline was measured with different fixture sizes", file=sys.stderr)
+        report["baseline"] = {"file": args.baseline, "created": baseline.get("created")}
+        report["comparison"] = compare(report, baseline, args.tolerance)
+        failed = any(entry["status"] == "slower" for entry in report["comparison"].values())
+    failed = failed or any("error" in case for case in report["cases"].values())
+
+    print_table(report, sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    if failed:
+        print(f"FAIL: slower than the baseline by more than {args.tolerance:.0%}, or a case failed",
+              file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
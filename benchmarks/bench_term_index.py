@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for the Term/Phase Fetcher trigram index (Toolkit.TrigramIndex).
+
+Builds a synthetic corpus in a temporary folder and reports:
+    - full index build time
+    - incremental update time after touching 1% of the files
+    - query latency with the index vs. a plain full scan
+
+USAGE
+    python benchmarks/bench_term_index.py [--files 2000] [--lines 200] [--queries 20]
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+
+def make_corpus(root, n_files, n_lines, seed=42):
+    """Writes n_files text files of n_lines random words each. Returns the word list."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(5000)]
+    for i in range(n_files):
+        sub = os.path.join(root, f"d{i % 50:02d}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"f{i:05d}.log"), 'w', encoding='utf-8') as f:
+            for _ in range(n_lines):
+                f.write(" ".join(rng.choices(words, k=8)) + "\n")
+    return words
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus")
+        words = make_corpus(corpus, args.files, args.lines)
+        index_path = os.path.join(tmp, "bench.tri")
+
+        index = Toolkit.TrigramIndex(corpus, index_path)
+        build_s, stats = timed(index.update)
+        print(f"build:       {build_s:8.3f} s  ({stats['added']} files, {stats['bytes_read'] / 1e6:.1f} MB, "
+              f"index {os.path.getsize(index_path) / 1e6:.2f} MB)")
+
+        rng = random.Random(7)
+        all_files = [path for path, _ in Toolkit.iter_files(corpus)]
+        for path in rng.sample(all_files, max(1, len(all_files) // 100)):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("appended line\n")
+        index = Toolkit.TrigramIndex(corpus, index_path)
+        load_s, _ = timed(index.load)
+        update_s, stats = timed(index.update)
+        print(f"load:        {load_s:8.3f} s")
+        print(f"incremental: {update_s:8.3f} s  ({stats['added']} re-indexed, {stats['unchanged']} unchanged)")
+
+        terms = [" ".join(rng.sample(words, 2)) for _ in range(args.queries)]
+        scan_s = index_s = 0.0
+        for term in terms:
+            fresh = Toolkit.TrigramIndex(corpus, index_path)
+            t, _ = timed(lambda: (fresh.load(), list(Toolkit.term_fetch(corpus, term, False, fresh))))
+            index_s += t
+            t, _ = timed(lambda: list(Toolkit.term_fetch(corpus, term, False)))
+            scan_s += t
+        print(f"query scan:  {scan_s / len(terms) * 1000:8.1f} ms/query")
+        print(f"query index: {index_s / len(terms) * 1000:8.1f} ms/query (incl. index load)")
+
+
+if __name__ == "__main__":
+    main()
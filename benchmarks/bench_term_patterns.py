@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for multi-pattern matching in the Term/Phase Fetcher (Toolkit.AhoCorasick).
+
+Scales the number of literal patterns and compares one Aho-Corasick pass per line
+against the naive approach of testing every pattern against every line.
+
+USAGE
+    python benchmarks/bench_term_patterns.py [--lines 20000] [--counts 1,10,100,500,2000]
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--counts", default="1,10,100,500,2000")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12))) for _ in range(20000)]
+    lines = [" ".join(rng.choices(words, k=10)) + "\n" for _ in range(args.lines)]
+    mb = sum(len(line) for line in lines) / 1e6
+
+    print(f"{'patterns':>8} {'build ms':>9} {'aho-corasick MB/s':>18} {'naive MB/s':>11} {'hits':>7}")
+    for count in (int(c) for c in args.counts.split(",")):
+        patterns = rng.sample(words, count)
+
+        start = time.perf_counter()
+        matcher = Toolkit.build_line_matcher(patterns, "multi")
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        hits = sum(1 for line in lines if matcher(line))
+        ac_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        naive_hits = sum(1 for line in lines if any(p in line for p in patterns))
+        naive_s = time.perf_counter() - start
+        assert hits == naive_hits, (hits, naive_hits)
+
+        print(f"{count:>8} {build_s * 1000:>9.1f} {mb / ac_s:>18.2f} {mb / naive_s:>11.2f} {hits:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Deterministic synthetic fixtures for the Toolkit benchmarks.
+
+Every generator takes a seed and always writes byte-identical content for the same
+arguments, so timings from different runs and machines compare like for like.
+File ages are relative to "now" (the Curf Remover compares against the clock), so
+age_tree() re-applies them whenever cached fixtures are reused.
+"""
+
+import os
+import json
+import random
+import shutil
+import string
+import threading
+import zlib
+import contextlib
+import http.server
+from datetime import datetime, timedelta
+
+# Extensions the Folder Organizer knows, plus some it has to log as uncategorized
+EXTENSIONS = (".jpg", ".png", ".txt", ".pdf", ".docx", ".csv", ".xlsx", ".py", ".sh",
+              ".zip", ".gz", ".pptx", ".mp3", ".mp4", ".dat", ".bin", ".tmp")
+
+# The Term/Phase Fetcher benchmark searches for this; about 1% of tree files contain it
+NEEDLE = "needle-7f3a9c"
+
+LOG_START = datetime(2024, 1, 1)
+LOG_COMPONENTS = ("api", "db", "auth", "cache", "worker", "scheduler", "mailer", "storage")
+LOG_ERRORS = (
+    "Timeout after {n} ms waiting for upstream {host}",
+    "Connection refused by {host}:{port}",
+    "Failed to write {n} bytes to /var/data/{word}.dat: disk full",
+    "User {word} not found in directory",
+    "Deadlock detected in transaction 0x{hex}",
+    "NullReferenceException at {word}.Handler.Process line {n}",
+    "Certificate for {host} expired {n} days ago",
+    "Queue {word} is over capacity ({n} messages)",
+)
+
+
+def words(rng, count=2000):
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(count)]
+
+
+def _text(rng, vocabulary, size):
+    """Returns about `size` bytes of lines of random words."""
+    lines, total = [], 0
+    while total < size:
+        line = " ".join(rng.choices(vocabulary, k=10)) + "\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines)
+
+
+def make_tree(root, files=2000, depth=3, fanout=4, file_kb=2, seed=1):
+    """
+    Writes `files` files spread over a directory tree `depth` levels deep with
+    `fanout` sub-folders per folder, plus a few empty folders. Returns the file count.
+    """
+    rng = random.Random(seed)
+    vocabulary = words(rng)
+    folders = [root]
+    level = [root]
+    for _ in range(depth):
+        level = [os.path.join(parent, f"d{i}") for parent in level for i in range(fanout)]
+        folders.extend(level)
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+    for i in range(files):
+        folder = folders[i % len(folders)]
+        text = _text(rng, vocabulary, rng.randint(file_kb * 512, file_kb * 1536))
+        if i % 100 == 7:
+            text += f"this line holds the {NEEDLE} term\n"
+        with open(os.path.join(folder, f"f{i:06d}{EXTENSIONS[i % len(EXTENSIONS)]}"), 'w', encoding='utf-8') as f:
+            f.write(text)
+    for i in range(max(1, len(folders) // 8)):
+        os.makedirs(os.path.join(folders[i * 8 % len(folders)], f"empty{i}"), exist_ok=True)
+    return files
+
+
+def age_tree(root, max_days=120, seed=1):
+    """
+    Sets every file's and folder's mtime to an age of 0..max_days days before now,
+    derived from its relative path (so it does not depend on directory listing order).
+    """
+    now = datetime.now().timestamp()
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        for name in filenames + dirnames:
+            path = os.path.join(dirpath, name)
+            key = f"{seed}:{os.path.relpath(path, root)}".replace(os.sep, "/").encode()
+            age = zlib.crc32(key) / 0xFFFFFFFF * max_days * 86400
+            os.utime(path, (now - age, now - age))
+
+
+def make_flat(root, files=2000, seed=2):
+    """Writes `files` small files with mixed extensions into one folder."""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    for i in range(files):
+        with open(os.path.join(root, f"scan_{i:06d}{EXTENSIONS[i % len(EXTENSIONS)]}"), 'wb') as f:
+            f.write(rng.randbytes(rng.randint(64, 4096)))
+    return files
+
+
+def make_csv(path, rows=500000, seed=3):
+    """Writes a Name,ID,Val1,Val2 CSV with about 0.5% malformed rows. Returns the row count."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write("Name,ID,Val1,Val2\n")
+        chunk = []
+        for i in range(rows):
+            if rng.random() < 0.005:
+                chunk.append(f"broken{i},{i},n/a\n")
+            else:
+                chunk.append(f"user{i % 9973},{i},{rng.uniform(0, 1000):.2f},{rng.uniform(0, 1000):.2f}\n")
+            if len(chunk) == 10000:
+                f.write("".join(chunk))
+                chunk = []
+        f.write("".join(chunk))
+    return rows
+
+
+def make_log(path, size_mb=256, seed=4):
+    """
+    Writes a time-sorted text log of about size_mb MB (use thousands for multi-GB):
+    one line every ~50 ms from LOG_START, ~1% ERROR and ~4% WARNING lines.
+    Returns (lines, first_timestamp, last_timestamp).
+    """
+    rng = random.Random(seed)
+    vocabulary = words(rng, 500)
+    hosts = [f"10.0.{i // 256}.{i % 256}" for i in range(64)]
+    bodies = [" ".join(rng.choices(vocabulary, k=rng.randint(5, 14))) for _ in range(4096)]
+    limit = size_mb * 1024 * 1024
+    written = lines = 0
+    millis = 0
+    stamp_second, stamp = -1, ""
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        chunk = []
+        while written < limit:
+            millis += rng.randint(1, 100)
+            second = millis // 1000
+            if second != stamp_second:
+                stamp_second = second
+                stamp = (LOG_START + timedelta(seconds=second)).strftime("%Y-%m-%d %H:%M:%S")
+            roll = rng.random()
+            component = LOG_COMPONENTS[int(roll * 1000) % len(LOG_COMPONENTS)]
+            if roll < 0.01:
+                message = rng.choice(LOG_ERRORS).format(
+                    n=rng.randint(1, 99999), host=rng.choice(hosts), port=rng.choice((80, 443, 5432)),
+                    word=rng.choice(vocabulary), hex=f"{rng.getrandbits(32):08x}")
+                line = f"{stamp}.{millis % 1000:03d} ERROR [{component}] {message}\n"
+            elif roll < 0.05:
+                line = f"{stamp}.{millis % 1000:03d} WARNING [{component}] {bodies[int(roll * 1e6) % 4096]}\n"
+            else:
+                level = "INFO" if roll < 0.8 else "DEBUG"
+                line = f"{stamp}.{millis % 1000:03d} {level} [{component}] {bodies[int(roll * 1e6) % 4096]}\n"
+            chunk.append(line)
+            written += len(line)
+            lines += 1
+            if len(chunk) == 20000:
+                f.write("".join(chunk))
+                chunk = []
+        f.write("".join(chunk))
+    return lines, LOG_START, LOG_START + timedelta(seconds=stamp_second)
+
+
+def make_image_site(root, images=200, seed=5):
+    """Writes index.html linking `images` small image files (half <img>, half <a>)."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, "img"), exist_ok=True)
+    tags = []
+    for i in range(images):
+        name = f"img/photo_{i:05d}{('.jpg', '.png', '.gif')[i % 3]}"
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(rng.randbytes(rng.randint(2048, 32768)))
+        tags.append(f'<img src="{name}">' if i % 2 else f'<a href="/{name}">photo {i}</a>')
+    with open(os.path.join(root, "index.html"), 'w', encoding='utf-8') as f:
+        f.write("<html><body>\n" + "\n".join(tags) + "\n</body></html>\n")
+    return images
+
+
+@contextlib.contextmanager
+def serve_directory(root):
+    """Serves `root` over HTTP on a free localhost port; yields the base URL."""
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=root, **kwargs)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def prepare(root, params):
+    """
+    Builds every fixture under `root`, or reuses the ones a previous run built with
+    the same params (recorded in manifest.json). Returns the manifest.
+    """
+    manifest_path = os.path.join(root, "manifest.json")
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    if manifest.get("params") != params:
+        os.makedirs(root, exist_ok=True)
+        for name in ("tree", "flat", "site"):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        tree = os.path.join(root, "tree")
+        log_lines, log_first, log_last = make_log(os.path.join(root, "app.log"), params["log_mb"])
+        manifest = {
+            "params": params,
+            "tree_files": make_tree(tree, params["files"], params["depth"], params["fanout"], params["file_kb"]),
+            "flat_files": make_flat(os.path.join(root, "flat"), params["flat_files"]),
+            "csv_rows": make_csv(os.path.join(root, "data.csv"), params["csv_rows"]),
+            "log_lines": log_lines,
+            "log_first": log_first.isoformat(),
+            "log_last": log_last.isoformat(),
+            "images": make_image_site(os.path.join(root, "site"), params["images"]),
+        }
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    age_tree(os.path.join(root, "tree"))
+    return manifest
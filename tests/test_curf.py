@@ -0,0 +1,106 @@
+"""
+Curf Remover free-space target mode: the plan, and deleting from it after the dry run.
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from collections import namedtuple
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+Usage = namedtuple("Usage", "total used free")
+
+
+class FreeSpaceTests(unittest.TestCase):
+    def setUp(self):
+        self.tree = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tree, True)
+        self.paths = []
+        for i in range(40):
+            path = os.path.join(self.tree, f"old{i:02}.bin")
+            with open(path, 'wb') as f:
+                f.write(b"x" * 8192)
+            os.utime(path, (1_600_000_000 + i * 60,) * 2) # old00 is the oldest
+            self.paths.append(path)
+
+    def plan_all(self):
+        # A target past anything the tree can free, so every file is selected
+        return Toolkit.plan_free_space(self.tree, shutil.disk_usage(self.tree).total)
+
+    def test_plan_is_oldest_first(self):
+        plan = self.plan_all()
+        self.assertEqual([item["path"] for item in plan["files"]], self.paths)
+        self.assertFalse(plan["reachable"])
+
+    def test_changed_files_are_kept(self):
+        plan = self.plan_all()
+        rewritten, grown = self.paths[3], self.paths[7]
+        with open(rewritten, 'wb') as f: # Same size, new mtime
+            f.write(b"y" * 8192)
+        with open(grown, 'ab') as f:
+            f.write(b"z" * 65536)
+        os.utime(grown, (1_600_000_000 + 7 * 60,) * 2) # Old mtime, new size
+        result = Toolkit.free_space(plan, workers=4)
+        self.assertEqual(sorted(result["skipped"]), sorted([rewritten, grown]))
+        self.assertEqual(sorted(os.listdir(self.tree)), sorted(os.path.basename(p) for p in (rewritten, grown)))
+        self.assertEqual(len(result["deleted"]), len(self.paths) - 2)
+        self.assertEqual(result["errors"], [])
+
+    def test_stops_at_the_target(self):
+        plan = self.plan_all()
+        size = plan["files"][0]["size"]
+        base = 10 ** 9
+        plan.update(target_free=base + 3 * size, needed=3 * size, free_before=base)
+
+        def disk_usage(path):
+            freed = (len(self.paths) - len(os.listdir(self.tree))) * size
+            return Usage(2 * base, base - freed, base + freed)
+
+        with mock.patch.object(Toolkit.shutil, "disk_usage", disk_usage):
+            result = Toolkit.free_space(plan, workers=2)
+        self.assertTrue(result["target_reached"])
+        self.assertEqual(sorted(result["deleted"]), self.paths[:3])
+
+
+class ReviewListTests(unittest.TestCase):
+    """The files to delete are listed before the confirmation whatever the output mode."""
+
+    def setUp(self):
+        self.tree = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tree, True)
+        self.old = os.path.join(self.tree, "old.log")
+        open(self.old, 'w').close()
+        os.utime(self.old, (1_600_000_000,) * 2)
+
+    def run_menu(self, mode):
+        answers = iter([self.tree, "1", "15", "no", ""]) # Declined at the confirmation
+        stdout = io.StringIO()
+        with mock.patch.object(Toolkit, "OUTPUT", Toolkit.OutputSink(mode)), \
+                mock.patch("builtins.input", lambda prompt="": next(answers)), \
+                mock.patch.object(sys, "stdout", stdout):
+            Toolkit.start_curf_remover()
+        return stdout.getvalue()
+
+    def test_listed_in_every_mode(self):
+        for mode in Toolkit.OutputSink.MODES:
+            with self.subTest(mode=mode):
+                output = self.run_menu(mode)
+                self.assertIn(self.old, output)
+                self.assertIn("This action is permanent", output)
+                self.assertTrue(os.path.exists(self.old))
+
+    def test_jsonl_records(self):
+        records = [json.loads(line) for line in self.run_menu("jsonl").splitlines()]
+        listed = [r for r in records if r.get("path") == self.old]
+        self.assertEqual([(r["level"], r["type"]) for r in listed], [("review", "file")])
+
+
+if __name__ == "__main__":
+    unittest.main()
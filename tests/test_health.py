@@ -0,0 +1,69 @@
+"""
+System Health disk figures and volume labels, with a stand-in for psutil's disk calls.
+"""
+
+import os
+import sys
+import unittest
+from collections import namedtuple
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+Partition = namedtuple("Partition", "device mountpoint fstype opts")
+Usage = namedtuple("Usage", "total used free percent")
+
+
+class FakeDisks:
+    """The disk calls DiskProber makes; ext4 reserves blocks, so used + free < total."""
+
+    def __init__(self):
+        self.usage = {"/": Usage(1000, 700, 250, 73.7)}
+
+    def disk_partitions(self):
+        return [Partition("/dev/sda1", "/", "ext4", "rw")]
+
+    def disk_usage(self, mountpoint):
+        return self.usage[mountpoint]
+
+
+class DiskFiguresTests(unittest.TestCase):
+    def test_used_is_psutil_used(self):
+        rows = Toolkit.DiskProber(FakeDisks()).probe()
+        self.assertEqual([(r["total"], r["used"], r["free"]) for r in rows], [(1000, 700, 250)])
+
+    def test_exported_used_bytes(self):
+        text = Toolkit.collect_health_metrics(FakeDisks(), Toolkit.DiskProber(FakeDisks()))
+        used = [line for line in text.splitlines() if line.startswith("toolkit_disk_used_bytes{")]
+        self.assertEqual(len(used), 1)
+        self.assertEqual(float(used[0].rsplit(" ", 1)[1]), 700)
+
+
+class VolumeLabelTests(unittest.TestCase):
+    def test_udev_escapes_and_utf8(self):
+        self.assertEqual(Toolkit._udev_label(r"My\x20Disk"), "My Disk")
+        self.assertEqual(Toolkit._udev_label("Données"), "Données")
+        self.assertEqual(Toolkit._udev_label(os.fsdecode(b"Caf\xe9")), "Caf�")
+
+    def test_one_bad_entry_keeps_the_others(self):
+        Entry = namedtuple("Entry", "name path")
+        entries = [Entry("Données", "/dev/disk/by-label/a"), Entry("bad", "/dev/disk/by-label/b"),
+                   Entry("Backup", "/dev/disk/by-label/c")]
+        targets = {"/dev/disk/by-label/a": "/dev/sda1", "/dev/disk/by-label/c": "/dev/sdb1"}
+
+        def realpath(path):
+            if path == "/dev/disk/by-label/b":
+                raise ValueError("embedded null byte")
+            return targets.get(path, path)
+
+        with mock.patch.dict(Toolkit._VOLUME_LABELS, clear=True), \
+                mock.patch.object(Toolkit.os.path, "isdir", lambda path: True), \
+                mock.patch.object(Toolkit.os, "scandir", lambda path: iter(entries)), \
+                mock.patch.object(Toolkit.os.path, "realpath", realpath):
+            self.assertEqual(Toolkit.volume_label("/dev/sdb1", "/mnt/backup"), "Backup")
+            self.assertEqual(Toolkit.volume_label("/dev/sda1", "/"), "Données")
+
+
+if __name__ == "__main__":
+    unittest.main()
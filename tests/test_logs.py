@@ -0,0 +1,196 @@
+"""
+Log File Analyzer on generated logs: time-range queries (binary search and sparse
+index) against a full scan, including logs whose stamps carry UTC offsets; follow
+mode across rotation; and signature clustering of one log split into byte ranges.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+ISO_Z = "%Y-%m-%dT%H:%M:%S%z"
+
+
+class TimeRange(unittest.TestCase):
+    def setUp(self):
+        self.work = tempfile.mkdtemp()
+        self.index_dir = Toolkit.INDEX_DIR
+        Toolkit.INDEX_DIR = os.path.join(self.work, "index")
+
+    def tearDown(self):
+        Toolkit.INDEX_DIR = self.index_dir
+        shutil.rmtree(self.work)
+
+    def write_log(self, name, stamps):
+        path = os.path.join(self.work, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            for n, stamp in enumerate(stamps):
+                f.write(f"{stamp} INFO [worker] request {n} handled with some padding text\n")
+        return path
+
+    def query(self, path, start, end, formats=None, use_index=False):
+        return list(Toolkit.time_range_lines(path, start, end, formats=formats, use_index=use_index))
+
+    def test_naive_log_matches_full_scan(self):
+        first = datetime(2026, 10, 19)
+        stamps = [(first + timedelta(seconds=n)).strftime("%Y-%m-%d %H:%M:%S") for n in range(40000)]
+        path = self.write_log("naive.log", stamps)
+        start, end = first + timedelta(seconds=12345), first + timedelta(seconds=12400)
+        expected = [f"{s} INFO" for s in stamps[12345:12401]]
+        for use_index in (False, True):
+            lines = self.query(path, start, end, use_index=use_index)
+            self.assertEqual([line[:24] for line in lines], expected)
+
+    def test_offset_stamps_across_a_dst_change(self):
+        # UTC keeps increasing while the local offset drops from +0200 to +0100
+        first = datetime(2026, 10, 25, 0, 0, tzinfo=timezone.utc)
+        stamps = []
+        for n in range(40000):
+            moment = first + timedelta(seconds=n)
+            offset = timezone(timedelta(hours=2 if n < 20000 else 1))
+            stamps.append(moment.astimezone(offset).strftime(ISO_Z))
+        path = self.write_log("zoned.log", stamps)
+        formats = [(Toolkit.strptime_regex(ISO_Z), ISO_Z)]
+        reference = Toolkit.last_log_timestamp(path, formats)
+        start = Toolkit.parse_time_bound("2026-10-25 06:33:00", reference) # +0100, i.e. 05:33 UTC
+        end = Toolkit.parse_time_bound("2026-10-25 06:34:00", reference)
+        expected = stamps[19980:20041]
+        for use_index in (False, True):
+            lines = self.query(path, start, end, formats, use_index)
+            self.assertEqual([line.split(" ")[0] for line in lines], expected)
+
+    def test_naive_bounds_on_an_offset_log(self):
+        stamps = [f"2026-10-19T10:{m:02d}:00+0200" for m in range(60)]
+        path = self.write_log("short.log", stamps)
+        formats = [(Toolkit.strptime_regex(ISO_Z), ISO_Z)]
+        lines = self.query(path, datetime(2026, 10, 19, 10, 30), datetime(2026, 10, 19, 10, 32), formats)
+        self.assertEqual(len(lines), 3)
+
+
+class Follow(unittest.TestCase):
+    def setUp(self):
+        self.work = tempfile.mkdtemp()
+        self.path = os.path.join(self.work, "app.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.work)
+
+    def test_rotation_keeps_the_unread_tail(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"before\n")
+        followed = Toolkit.FollowedFile(self.path, from_end=True)
+        burst = [b"burst %07d" % n + b"x" * 100 for n in range(30000)] # ~3 MB, several read limits
+        with open(self.path, 'ab') as f:
+            f.write(b"\n".join(burst) + b"\n" + b"unterminated")
+        os.rename(self.path, self.path + ".1")
+        with open(self.path, 'wb') as f:
+            f.write(b"after\n")
+        try:
+            lines, events = followed.read_lines()
+        finally:
+            followed.close()
+        self.assertEqual(events, ["rotated"])
+        self.assertEqual(lines, burst + [b"unterminated", b"after"])
+
+    def test_a_burst_is_never_dropped(self):
+        burst = [f"line {n}" for n in range(50000)] # Far more than one wake-up reads
+        with open(self.path, 'w') as f:
+            f.write("\n".join(burst) + "\n")
+        got, notes = [], []
+
+        def emit(path, line, note=None):
+            if note:
+                notes.append(note)
+            else:
+                got.append(line)
+
+        deadline = time.monotonic() + 10
+        Toolkit.follow_logs([self.path], emit, from_end=False, use_inotify=False,
+                            stop=lambda: len(got) >= len(burst) or time.monotonic() > deadline)
+        self.assertEqual(got, burst)
+        self.assertEqual(notes, [])
+
+    def test_truncation_restarts_at_the_beginning(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"one\ntwo\n")
+        followed = Toolkit.FollowedFile(self.path, from_end=True)
+        with open(self.path, 'wb') as f:
+            f.write(b"new\n")
+        try:
+            lines, events = followed.read_lines()
+        finally:
+            followed.close()
+        self.assertEqual((lines, events), ([b"new"], ["truncated"]))
+
+
+class Cluster(unittest.TestCase):
+    def setUp(self):
+        self.work = tempfile.mkdtemp()
+        self.path = os.path.join(self.work, "app.log")
+        start = datetime(2026, 10, 19, 8)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for n in range(3000):
+                stamp = (start + timedelta(seconds=n)).strftime("%Y-%m-%d %H:%M:%S")
+                if n % 3 == 0:
+                    f.write(f"{stamp} ERROR db timeout after {n % 97} ms on shard {n % 5}\n")
+                elif n % 7 == 0:
+                    f.write(f"{stamp} ERROR cache miss for key user:{n}" + " pad" * (n % 11) + "\n")
+                else:
+                    f.write(f"{stamp} INFO request {n} ok\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.work)
+
+    def cluster(self, range_bytes, workers):
+        with mock.patch.object(Toolkit, "LOG_CLUSTER_RANGE", range_bytes):
+            return Toolkit.cluster_error_signatures([self.path], workers=workers)
+
+    def test_ranges_match_a_single_pass(self):
+        whole_rows, whole_stats = self.cluster(1 << 30, 1)
+        self.assertEqual((whole_stats["lines"], whole_stats["matched"]), (3000, 1286))
+        for range_bytes, workers in ((997, 1), (4096, 1), (4096, 3)):
+            with self.subTest(range_bytes=range_bytes, workers=workers):
+                rows, stats = self.cluster(range_bytes, workers)
+                self.assertEqual(stats, whole_stats)
+                self.assertEqual(rows, whole_rows)
+
+    def test_pending_tasks_are_bounded(self):
+        import concurrent.futures
+        counts = {"submitted": 0, "merged": 0, "most_pending": 0}
+        merge = Toolkit.HeavyHitters.merge
+
+        class CountingPool(concurrent.futures.ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                counts["submitted"] += 1
+                counts["most_pending"] = max(counts["most_pending"], counts["submitted"] - counts["merged"])
+                return super().submit(fn, *args)
+
+        def counting_merge(hitters, other):
+            counts["merged"] += 1
+            merge(hitters, other)
+
+        whole = self.cluster(1 << 30, 1)
+        with mock.patch.object(concurrent.futures, "ProcessPoolExecutor", CountingPool), \
+                mock.patch.object(Toolkit.HeavyHitters, "merge", counting_merge):
+            self.assertEqual(self.cluster(997, 2), whole)
+        self.assertGreater(counts["submitted"], 40)
+        self.assertLessEqual(counts["most_pending"], 4) # Two per worker, not every range at once
+
+    def test_large_files_are_split(self):
+        size = os.path.getsize(self.path)
+        with mock.patch.object(Toolkit, "LOG_CLUSTER_RANGE", 4096):
+            ranges = Toolkit._cluster_ranges(self.path)
+        self.assertEqual(len(ranges), -(-size // 4096))
+        self.assertEqual((ranges[0][0], ranges[-1][1]), (0, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Network Diagnostic Tool checks against loopback stand-ins: a local TCP listener for the
+gateway and internet hosts, a UDP echo server, and a stalled resolver for the deadline.
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+
+class LoopbackServers(unittest.TestCase):
+    def setUp(self):
+        self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp.bind(("127.0.0.1", 0))
+        self.tcp.listen(16)
+        self.tcp_port = self.tcp.getsockname()[1]
+
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind(("127.0.0.1", 0))
+        self.udp.settimeout(0.2)
+        self.udp_port = self.udp.getsockname()[1]
+        self.stop = threading.Event()
+        self.echo = threading.Thread(target=self._echo, daemon=True)
+        self.echo.start()
+
+    def tearDown(self):
+        self.stop.set()
+        self.echo.join()
+        self.udp.close()
+        self.tcp.close()
+
+    def _echo(self):
+        while not self.stop.is_set():
+            try:
+                data, addr = self.udp.recvfrom(512)
+            except OSError:
+                continue
+            self.udp.sendto(data, addr)
+
+    def test_tcp_checks_pass_with_latency(self):
+        results = Toolkit.run_network_diagnostics("localhost", "tcp", 3.0, gateway="127.0.0.1",
+                                                  public_host="127.0.0.1", port=self.tcp_port)
+        self.assertEqual([r["check"] for r in results], ["Gateway", "Internet", "DNS"])
+        for result in results:
+            self.assertTrue(result["passed"], result)
+            self.assertGreaterEqual(result["latency_ms"], 0)
+
+    def test_tcp_refused_port_counts_as_reachable(self):
+        self.tcp.close()
+        latency = asyncio.run(Toolkit.probe_host("127.0.0.1", "tcp", self.tcp_port, 1.0))
+        self.assertGreaterEqual(latency, 0)
+
+    def test_udp_probe_gets_echo(self):
+        latency = asyncio.run(Toolkit.probe_host("127.0.0.1", "udp", self.udp_port, 1.0))
+        self.assertGreaterEqual(latency, 0)
+
+    def test_hostname_targets_are_resolved(self):
+        latency = asyncio.run(Toolkit.probe_host("localhost", "tcp", self.tcp_port, 1.0))
+        self.assertGreaterEqual(latency, 0)
+
+
+class Sweep(unittest.TestCase):
+    def test_cidr_expansion_is_capped(self):
+        self.assertEqual(len(Toolkit.parse_sweep_targets("10.0.0.0/30")), 4)
+        with self.assertRaises(ValueError):
+            Toolkit.parse_sweep_targets("10.0.0.0/8")
+
+    def test_unencodable_name_counts_as_error(self):
+        [row] = Toolkit.run_reachability_sweep([("a" * 70 + ".com", 80)], count=2, timeout=1.0)
+        self.assertEqual((row["error"], row["open"], row["address"]), (2, 0, None))
+        self.assertTrue(row["resolve_error"])
+
+    def test_each_name_is_resolved_once(self):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(16)
+            port = server.getsockname()[1]
+            lookup = mock.AsyncMock(return_value=("localhost", ["127.0.0.1"]))
+            with mock.patch.object(Toolkit, "resolve_host", lookup):
+                rows = Toolkit.run_reachability_sweep([("localhost", port), ("localhost", 9)], count=3, timeout=1.0)
+        self.assertEqual(lookup.await_count, 1)
+        self.assertEqual([(r["address"], r["open"] + r["closed"]) for r in rows], [("127.0.0.1", 3)] * 2)
+
+
+class DNS(unittest.TestCase):
+    def test_repeated_diagnostics_use_the_cache(self):
+        cache = Toolkit.DNSCache()
+        with mock.patch.object(Toolkit, "resolve_host", mock.AsyncMock(return_value=("localhost", ["127.0.0.1"]))) as resolve:
+            for _ in range(3):
+                results = Toolkit.run_network_diagnostics("localhost", "tcp", 2.0, gateway="127.0.0.1",
+                                                          public_host="127.0.0.1", port=9, cache=cache)
+                self.assertTrue(results[2]["passed"])
+        self.assertEqual(resolve.await_count, 1)
+        self.assertIn("cached", results[2]["detail"])
+
+    def test_rotating_answers_are_not_inconsistent(self):
+        answers = iter([["10.0.0.1"], ["10.0.0.2"], ["10.0.0.1"]])
+
+        async def rotating(name, timeout):
+            return 1.0, next(answers), 60
+
+        cache = Toolkit.DNSCache()
+        with mock.patch.object(Toolkit, "_system_query", rotating):
+            [result] = Toolkit.run_dns_benchmark(["cdn.example"], 3, cache=cache)
+        self.assertIn("ROTATING", result["flags"])
+        self.assertNotIn("INCONSISTENT", result["flags"])
+        self.assertEqual(cache.get("cdn.example")[0], ["10.0.0.1", "10.0.0.2"])
+
+    def test_partial_failures_are_inconsistent(self):
+        answers = iter([["10.0.0.1"], OSError("refused"), ["10.0.0.1"]])
+
+        async def flaky(name, timeout):
+            answer = next(answers)
+            if isinstance(answer, Exception):
+                raise answer
+            return 1.0, answer, 60
+
+        with mock.patch.object(Toolkit, "_system_query", flaky):
+            [result] = Toolkit.run_dns_benchmark(["flaky.example"], 3, cache=None)
+        self.assertIn("INCONSISTENT", result["flags"])
+
+
+class Deadline(unittest.TestCase):
+    def test_stalled_resolver_does_not_outlast_deadline(self):
+        real = socket.getaddrinfo
+
+        def stalled(*args, **kwargs):
+            time.sleep(5)
+            return real(*args, **kwargs)
+
+        with mock.patch("socket.getaddrinfo", stalled):
+            start = time.monotonic()
+            results = Toolkit.run_network_diagnostics("example.invalid", "tcp", 1.0,
+                                                      gateway="127.0.0.1", public_host="127.0.0.1", port=9)
+            elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 2.5)
+        dns = results[2]
+        self.assertFalse(dns["passed"])
+        self.assertIn(dns["detail"], ("timed out", "exceeded 1.0s deadline"))
+
+
+class Gateway(unittest.TestCase):
+    def test_reads_default_route(self):
+        with tempfile.NamedTemporaryFile('w', suffix=".route", delete=False) as f:
+            f.write("Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\n"
+                    "eth0\t0010A8C0\t00000000\t0001\t0\t0\t0\t00FFFFFF\n"
+                    "eth0\t00000000\t0110A8C0\t0003\t0\t0\t0\t00000000\n")
+        try:
+            self.assertEqual(Toolkit.read_linux_gateway(f.name), "192.168.16.1")
+        finally:
+            os.remove(f.name)
+
+    def test_missing_route_file(self):
+        self.assertIsNone(Toolkit.read_linux_gateway(os.path.join(tempfile.gettempdir(), "no-such-route")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Folder Organizer watch mode on a temporary inbox, with inotify and with polling.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+
+class WatchFolderTests:
+    use_inotify = True
+
+    def setUp(self):
+        self.work = tempfile.mkdtemp()
+        self.src = os.path.join(self.work, "inbox")
+        self.dest = os.path.join(self.work, "sorted")
+        os.makedirs(self.src)
+        self.events = []
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.watch, daemon=True)
+
+    def watch(self):
+        self.counts = Toolkit.watch_folder(self.src, self.dest, lambda *event: self.events.append(event),
+                                           stop=self.done.is_set, use_inotify=self.use_inotify)
+
+    def stop(self):
+        self.done.set()
+        if self.thread.is_alive():
+            open(os.path.join(self.src, "wake"), 'w').close() # An event, so an idle watch notices at once
+            self.thread.join(Toolkit.WATCH_POLL_MAX + 5)
+
+    def tearDown(self):
+        self.stop()
+        shutil.rmtree(self.work)
+
+    def start(self):
+        self.thread.start()
+        time.sleep(0.3) # Let the watch be set up
+
+    def wait_for(self, path, timeout=8.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if os.path.exists(path):
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_existing_and_dropped_files_are_sorted(self):
+        with open(os.path.join(self.src, "old.txt"), 'w') as f:
+            f.write("x")
+        with open(os.path.join(self.src, "notes.xyz"), 'w') as f:
+            f.write("x")
+        self.start()
+        self.assertTrue(self.wait_for(os.path.join(self.dest, "documents", "old.txt")))
+        with open(os.path.join(self.src, "photo.part"), 'wb') as f:
+            f.write(b"\xff" * 1000)
+        os.rename(os.path.join(self.src, "photo.part"), os.path.join(self.src, "photo.jpg"))
+        self.assertTrue(self.wait_for(os.path.join(self.dest, "images", "photo.jpg")))
+        time.sleep(Toolkit.WATCH_SETTLE * 3)
+        self.stop()
+        with open(os.path.join(self.dest, "specialFiles.list")) as f:
+            self.assertEqual(f.read().split(), ["notes.xyz"]) # Logged once, never the .part file
+        self.assertTrue(os.path.exists(os.path.join(self.src, "notes.xyz")))
+        self.assertEqual(self.counts["errors"], 0)
+
+
+class WatchFolderInotify(WatchFolderTests, unittest.TestCase):
+    def setUp(self):
+        if not sys.platform.startswith('linux'):
+            self.skipTest("inotify is Linux-only")
+        super().setUp()
+
+    def test_slow_writer_is_left_until_closed(self):
+        self.start()
+        path = os.path.join(self.src, "report.pdf")
+        with open(path, 'wb') as f:
+            for _ in range(3):
+                f.write(b"%" * 100)
+                f.flush()
+                time.sleep(Toolkit.WATCH_SETTLE * 2) # A pause longer than the settle window
+                self.assertTrue(os.path.exists(path), "moved while still open")
+        self.assertTrue(self.wait_for(os.path.join(self.dest, "documents", "report.pdf"), 2.0))
+        self.assertEqual(os.path.getsize(os.path.join(self.dest, "documents", "report.pdf")), 300)
+
+
+class WatchFolderPolling(WatchFolderTests, unittest.TestCase):
+    use_inotify = False
+
+if __name__ == "__main__":
+    unittest.main()
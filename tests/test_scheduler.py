@@ -0,0 +1,127 @@
+"""
+Scheduler daemon on an AcceleratedClock: schedules, overlaps, I/O-class limits, run
+records and per-job output, with a day of clock time passing in about a second.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+SPEED = 36000      # One clock hour per 0.1 s
+START = 1767225600 # An hour boundary (2026-01-01 00:00 UTC)
+
+
+def job(name, every="1h", **kwargs):
+    return Toolkit.ScheduledJob(name, ["password"], Toolkit.parse_duration(every), **kwargs)
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.work = tempfile.mkdtemp()
+        self.record = os.path.join(self.work, "runs.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.work)
+
+    def records(self):
+        with open(self.record, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def run_for(self, jobs, hours, runner, **kwargs):
+        scheduler = Toolkit.Scheduler(jobs, clock=Toolkit.AcceleratedClock(SPEED, START),
+                                      record_path=self.record, runner=runner, **kwargs)
+        return scheduler.run(START + hours * 3600)
+
+    def test_runs_on_the_interval(self):
+        [stats] = self.run_for([job("hourly")], 10, lambda job, stream: 0)
+        self.assertIn(stats["runs"], (9, 10))
+        self.assertEqual((stats["overlaps"], stats["skipped"], stats["failures"]), (0, 0, 0))
+        dues = [record["due"] for record in self.records()]
+        self.assertEqual(dues, sorted(set(dues)))
+
+    def test_slow_runs_overlap_and_are_skipped(self):
+        def slow(job, stream):
+            time.sleep(0.25) # 2.5 clock hours
+            return 0
+
+        [stats] = self.run_for([job("slow")], 10, slow)
+        self.assertGreater(stats["skipped"], 0)
+        self.assertGreaterEqual(stats["overlaps"], stats["skipped"])
+        self.assertTrue(any(record.get("skipped") for record in self.records()))
+
+    def test_io_class_limit_serialises_jobs(self):
+        lock = threading.Lock()
+        running = peak = 0
+
+        def runner(job, stream):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return 0
+
+        jobs = [job(name, io_class="disk") for name in ("a", "b", "c")]
+        self.run_for(jobs, 4, runner, workers=3, io_limits={"disk": 1})
+        self.assertEqual(peak, 1)
+        self.assertTrue(any(record["queued_s"] > 0 for record in self.records()))
+
+    def test_record_times_are_clock_seconds(self):
+        def runner(job, stream):
+            time.sleep(0.01)
+            return 0
+
+        self.run_for([job("timed")], 3, runner)
+        for record in self.records():
+            self.assertGreaterEqual(record["wall_s"], 0.01)
+            self.assertAlmostEqual(record["duration_s"], record["wall_s"] * SPEED, delta=0.5 * SPEED * record["wall_s"])
+
+    def test_concurrent_jobs_keep_their_own_output(self):
+        closed_port = "127.0.0.1:9"
+        jobs = [Toolkit.ScheduledJob(name, ["net", "sweep", closed_port, "--count", "1", "--timeout", "0.5"], 3600,
+                                     output=os.path.join(self.work, f"{name}.out"))
+                for name in ("one", "two")]
+        stdout = sys.stdout
+        self.run_for(jobs, 2, Toolkit.run_job_command, workers=2)
+        self.assertIs(sys.stdout, stdout)
+        runs = [record["job"] for record in self.records()]
+        for name in ("one", "two"):
+            with open(os.path.join(self.work, f"{name}.out"), 'r', encoding='utf-8') as f:
+                text = f.read()
+            self.assertEqual(text.count("ok/sent"), runs.count(name)) # One table per run of its own
+
+
+class JobFileTests(unittest.TestCase):
+    def load(self, spec):
+        with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+            json.dump(spec, f)
+        try:
+            return Toolkit.load_job_file(f.name)
+        finally:
+            os.remove(f.name)
+
+    def test_valid_file(self):
+        jobs, settings = self.load({"workers": 2, "io_limits": {"disk": "1"},
+                                    "jobs": [{"name": "pw", "every": "15m", "command": ["password"]}]})
+        self.assertEqual((jobs[0].every, settings["workers"], settings["io_limits"]), (900, 2, {"disk": 1}))
+
+    def test_bad_limits_are_toolkit_errors(self):
+        for spec in ({"workers": "many"}, {"io_limits": {"disk": "x"}}, {"io_limits": {"disk": 0}},
+                     {"io_limits": ["disk"]}):
+            spec["jobs"] = [{"every": "1h", "command": ["password"]}]
+            with self.assertRaises(Toolkit.ToolkitError):
+                self.load(spec)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Term/Phase Fetcher trigram index, read in small chunks so terms span chunk boundaries.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Toolkit  # noqa: E402
+
+
+class TrigramIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.work = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work, True)
+        self.root = os.path.join(self.work, "docs")
+        os.makedirs(self.root)
+        self.write("a.txt", "x" * 5 + "NeedleInHaystack" + "y" * 40)
+        self.write("b.txt", "nothing to see here\n" * 20)
+        chunk = mock.patch.object(Toolkit, "INDEX_READ_CHUNK", 7)
+        chunk.start()
+        self.addCleanup(chunk.stop)
+
+    def write(self, name, text):
+        with open(os.path.join(self.root, name), 'w') as f:
+            f.write(text)
+
+    def index(self):
+        return Toolkit.TrigramIndex(self.root, os.path.join(self.work, "docs.tri"))
+
+    def test_terms_across_chunks(self):
+        index = self.index()
+        stats = index.update()
+        self.assertEqual(stats["added"], 2)
+        self.assertEqual(stats["bytes_read"], sum(os.path.getsize(os.path.join(self.root, n)) for n in ("a.txt", "b.txt")))
+        self.assertEqual(index.candidates("needleinhaystack"), [os.path.join(self.root, "a.txt")])
+        self.assertEqual(index.candidates("to see"), [os.path.join(self.root, "b.txt")])
+        self.assertEqual(index.candidates("absent"), [])
+
+    def test_reload_and_update_changed_file(self):
+        index = self.index()
+        index.update()
+        self.write("b.txt", "now with a needle in it")
+        reloaded = self.index()
+        self.assertTrue(reloaded.load())
+        stats = reloaded.update()
+        self.assertEqual((stats["added"], stats["unchanged"]), (1, 1))
+        self.assertEqual(sorted(reloaded.candidates("needle")),
+                         [os.path.join(self.root, "a.txt"), os.path.join(self.root, "b.txt")])
+
+
+if __name__ == "__main__":
+    unittest.main()
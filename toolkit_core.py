@@ -0,0 +1,5962 @@
+#!/usr/bin/env python3
+
+"""
+SYNOPSIS
+    Author: ABHISHEK KISHOR SINGH
+    Created_Date: 25 October, 2025
+    
+    DESCRIPTION
+        A menu-driven Python toolkit for automating common manual tasks on Windows.
+        This is a conversion of the PowerShell 'Toolkit.ps1'.
+    
+    USAGE
+        Run this script (python Toolkit.py) to access all 13 tools from one 
+        convenient, menu-driven interface.
+"""
+
+import os
+import sys
+import shutil
+import string
+import time
+import re
+import importlib
+import argparse
+import contextlib
+import json
+import struct
+import hashlib
+import bisect
+import math
+import threading
+import heapq
+import mmap
+import selectors
+import collections
+import glob
+import gzip
+import zlib
+import operator
+from array import array
+from datetime import datetime, timedelta, timezone
+
+class LazyModule:
+    """
+    Stands in for a module that only some tools use. The first attribute looked up
+    imports the real module, so it costs nothing at startup.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, name)
+
+# Only the network tools (Tools 11 and 12) run an event loop
+asyncio = LazyModule("asyncio")
+
+# --- Third-Party Imports ---
+# These must be installed via pip:
+# pip install colorama requests beautifulsoup4 psutil
+# Like the other tool dependencies, colorama is only imported when it is first needed:
+# the first time a color is printed.
+class DummyColor:
+    """Stands in for colorama's Fore/Style when it is not installed, so the script doesn't crash."""
+    def __getattr__(self, name):
+        return ""
+
+class LazyColor:
+    """
+    Stands in for colorama's Fore or Style. The first color looked up imports and
+    initialises colorama; every color is then cached on this object.
+    """
+    _palettes = None
+
+    def __init__(self, palette):
+        self._palette = palette
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if LazyColor._palettes is None:
+            try:
+                from colorama import Fore, Style, init
+                init(autoreset=True)
+                LazyColor._palettes = {"Fore": Fore, "Style": Style}
+            except ImportError:
+                print("Error: 'colorama' library not found. Please run: pip install colorama", file=sys.stderr)
+                LazyColor._palettes = {"Fore": DummyColor(), "Style": DummyColor()}
+        value = getattr(LazyColor._palettes[self._palette], name)
+        setattr(self, name, value)
+        return value
+
+Fore = LazyColor("Fore")
+Style = LazyColor("Style")
+
+# =============================================================================
+# SCRIPT CONFIGURATION (EDIT THESE)
+# =============================================================================
+
+# --- Config for Tool 1: Folder Organizer (watch mode) ---
+# With inotify, a file is moved as soon as its writer closes it (or it is renamed into
+# the folder); a file found by a scan instead is moved once its size and mtime have not
+# changed for WATCH_SETTLE seconds, and one held open without being closed after
+# WATCH_RESYNC seconds. At most WATCH_BATCH files are moved per pass, and bursts of events
+# are coalesced for WATCH_COALESCE seconds. The folder is rescanned every WATCH_RESYNC
+# seconds in case an event was missed. Without inotify, it is polled every
+# WATCH_POLL_MIN..WATCH_POLL_MAX seconds (backing off while idle); an idle poll costs one
+# stat of the folder, which is only listed again when its mtime changes.
+WATCH_SETTLE = 0.5
+WATCH_BATCH = 50
+WATCH_COALESCE = 0.1
+WATCH_RESYNC = 30.0
+WATCH_POLL_MIN = 0.25
+WATCH_POLL_MAX = 5.0
+
+# --- Config for Tool 3: Curf Remover (free-space target mode) ---
+# Selected files are deleted by SPACE_DELETE_WORKERS threads. Free space is re-checked
+# with shutil.disk_usage after every batch of deletions, and only the files still needed
+# for the target are queued, so deletion stops as soon as it is reached.
+SPACE_DELETE_WORKERS = 8
+
+# --- Config for Tool 9: TarBall Mailer ---
+# This tool requires a valid SMTP server to send emails.
+# Gmail/Google Workspace: smtp.gmail.com, port 587
+# Outlook/Hotmail: smtp.office365.com, port 587
+SMTP_SERVER = "smtp.your-email-provider.com"
+SMTP_PORT = 587 
+FROM_EMAIL = "your-script-email@gmail.com"
+# The command-line 'backup' command reads the SMTP password from this environment variable.
+SMTP_PASSWORD_ENV = "TOOLKIT_SMTP_PASSWORD"
+
+# --- Config for Tool 10: Term/Phase Fetcher ---
+# Where the optional trigram search indexes are stored (one file per searched folder).
+# Files larger than INDEX_MAX_FILE_MB are never indexed and are always searched directly.
+# Indexed files are read INDEX_READ_CHUNK bytes at a time.
+INDEX_DIR = os.path.join(os.path.expanduser('~'), ".toolkit_index")
+INDEX_MAX_FILE_MB = 64
+INDEX_READ_CHUNK = 1024 * 1024
+
+# --- Config for Tool 11: Network Diagnostic Tool ---
+# All checks run concurrently; the whole diagnostic never takes longer than NET_DIAG_DEADLINE.
+NET_DIAG_DEADLINE = 5.0   # seconds, for all checks together
+NET_PROBE_TIMEOUT = 3.0   # seconds, for any single probe
+NET_PUBLIC_HOST = "8.8.8.8"
+# Sweep mode: how many TCP-connect probes may be in flight at once, and per-probe timeout.
+SWEEP_CONCURRENCY = 1000
+SWEEP_TIMEOUT = 1.0       # seconds
+SWEEP_MAX_TARGETS = 65536 # host:port pairs per sweep (a /8 would be ~33M)
+# DNS mode: parallel lookups, per-query timeout, and the "slow answer" threshold.
+# DNS_DEFAULT_TTL is used for answers from the OS resolver, which does not expose TTLs.
+DNS_CONCURRENCY = 50
+DNS_TIMEOUT = 2.0         # seconds
+DNS_SLOW_MS = 200
+DNS_DEFAULT_TTL = 60      # seconds
+
+# --- Config for Tool 12: System Health Dashboard ---
+# Live monitor: samples kept per metric (constant memory), sparkline width, and the
+# CPU budget for the monitor itself (percent of one core).
+MONITOR_HISTORY = 3600
+MONITOR_SPARK_WIDTH = 40
+MONITOR_MAX_OVERHEAD = 1.0
+# Headless Prometheus exporter (python Toolkit.py health exporter --port N). Keep it on localhost
+# unless the port is firewalled; metrics are collected in the background every interval.
+EXPORTER_HOST = "127.0.0.1"
+EXPORTER_PORT = 9877
+EXPORTER_INTERVAL = 15.0  # seconds
+# Each mount's disk_usage() probe gets this long before it is reported as stale (hung).
+DISK_PROBE_TIMEOUT = 2.0  # seconds
+
+# --- Config for Tool 13: Log File Analyzer ---
+# Text logs are read backwards in blocks of this size, so only the tail is touched.
+LOG_BLOCK_SIZE = 64 * 1024
+# Follow mode: bytes read per file per wake-up, the idle polling back-off (when
+# inotify is unavailable), and the inotify safety re-check.
+LOG_FOLLOW_CHUNK = 1024 * 1024
+LOG_POLL_MIN = 0.25       # seconds
+LOG_POLL_MAX = 2.0        # seconds
+LOG_FOLLOW_RESYNC = 5.0   # seconds
+# Signature clustering: memory per worker is fixed by the sketch (width x depth counters)
+# and the number of heavy-hitter candidates, however large the input.
+LOG_SKETCH_WIDTH = 1 << 16
+LOG_SKETCH_DEPTH = 4
+LOG_HEAVY_HITTERS = 2000
+LOG_SIGNATURE_MAX = 240   # characters kept per signature
+LOG_NEW_WINDOW_HOURS = 1
+# Uncompressed logs larger than this are split into ranges of this size (on line
+# boundaries) so several workers share one large file.
+LOG_CLUSTER_RANGE = 32 * 1024 * 1024
+# Time-range queries: one sparse-index entry per this many bytes of log.
+LOG_TIME_INDEX_STEP = 256 * 1024
+# Timestamp formats recognised at the start of a log line: (regex, strptime format).
+# Formats without a year (syslog) are assumed to be in the current year.
+LOG_TIMESTAMP_FORMATS = [
+    (r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}", "%Y-%m-%d %H:%M:%S"),
+    (r"\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}", "%Y/%m/%d %H:%M:%S"),
+    (r"\d{2}/[A-Z][a-z]{2}/\d{4}:\d{2}:\d{2}:\d{2}", "%d/%b/%Y:%H:%M:%S"),
+    (r"[A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2}", "%b %d %H:%M:%S"),
+]
+
+# --- Config for console output ---
+# OUTPUT_MODE: "normal", "summary" (no per-item lines or progress), "quiet" (errors only)
+# or "jsonl" (every message as one JSON object per line); --output-mode overrides it.
+# Lists shown for review before a destructive confirmation are kept in every mode.
+# In long loops, messages are written in batches of up to OUTPUT_BATCH_BYTES and at
+# least every OUTPUT_FLUSH_INTERVAL; progress messages at most every OUTPUT_PROGRESS_INTERVAL.
+OUTPUT_MODE = "normal"
+OUTPUT_BATCH_BYTES = 64 * 1024
+OUTPUT_FLUSH_INTERVAL = 0.1      # seconds
+OUTPUT_PROGRESS_INTERVAL = 0.5   # seconds
+
+# --- Config for the scheduler daemon (python Toolkit.py daemon jobs.json) ---
+# Worker threads shared by all jobs, and how many jobs of one I/O class may run at once
+# unless the job file's "io_limits" says otherwise.
+DAEMON_WORKERS = 4
+DAEMON_IO_LIMIT = 1
+
+# --- Config for run records (--profile / --trace / --record) ---
+# Latencies kept per network request kind (constant memory), functions listed from the
+# profile, allocation sites listed from the peak memory snapshot, and how often --trace
+# checks whether memory use reached a new peak worth a snapshot.
+RUN_LATENCY_SAMPLES = 1000
+PROFILE_TOP = 20
+TRACE_TOP = 10
+TRACE_SAMPLE_INTERVAL = 0.5  # seconds
+
+# =============================================================================
+# UTILITY FUNCTIONS CENTER (The Toolkit)
+# =============================================================================
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+class OutputSink:
+    """
+    Writes the toolkit's messages to sys.stdout (looked up on every message, so
+    redirects apply). Each message has a level: header, separator, info, success,
+    error, item (one result line), review (a line the user must see before confirming)
+    or progress. The mode decides which levels are shown and how; colors are kept only
+    on a terminal, otherwise ANSI codes are removed.
+
+    Outside batch() every message is written at once, in order with print() and
+    input(). Inside batch() messages are buffered and written in large chunks, so a
+    slow terminal does not hold up the loop producing them.
+    """
+
+    MODES = ("normal", "summary", "quiet", "jsonl")
+    _SHOWN = {"summary": {"header", "separator", "info", "success", "error", "review"},
+              "quiet": {"error", "review"}}
+
+    def __init__(self, mode=OUTPUT_MODE):
+        self.mode = mode
+        self.suppressed = 0 # Messages the mode left out
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_bytes = 0
+        self._pending_stream = None
+        self._batching = 0
+        self._last_flush = 0.0
+        self._last_progress = 0.0
+        self._tty_stream = None
+        self._tty = False
+        self._stop = None
+
+    def emit(self, level, text, **fields):
+        """
+        Writes one message. `text` may hold color codes; for jsonl the record's message
+        is fields['message'] if given, else the text without them.
+        """
+        shown = self._SHOWN.get(self.mode)
+        if shown is not None and level not in shown:
+            self.suppressed += 1
+            return
+        stream = sys.stdout
+        if self.mode == "jsonl":
+            if level == "separator":
+                return
+            fields.setdefault("message", _ANSI_ESCAPE.sub("", text))
+            text = json.dumps({"time": datetime.now().isoformat(timespec="milliseconds"),
+                               "level": level, **fields}, default=str)
+        else:
+            if stream is not self._tty_stream:
+                self._tty_stream = stream
+                try:
+                    self._tty = stream.isatty()
+                except (AttributeError, ValueError):
+                    self._tty = False
+            if not self._tty:
+                text = _ANSI_ESCAPE.sub("", text)
+            elif "\x1b" in text:
+                text += Style.RESET_ALL # Batched lines must not inherit each other's color
+        self._write(stream, text + "\n")
+
+    def progress(self, text, **fields):
+        """Emits a progress message, unless one was shown less than OUTPUT_PROGRESS_INTERVAL ago."""
+        now = time.monotonic()
+        if now - self._last_progress < OUTPUT_PROGRESS_INTERVAL:
+            self.suppressed += 1
+            return
+        self._last_progress = now
+        self.emit("progress", text, **fields)
+
+    def _write(self, stream, text):
+        with self._lock:
+            if self._pending and stream is not self._pending_stream:
+                self._flush_locked()
+            if not self._batching:
+                stream.write(text)
+                return
+            self._pending.append(text)
+            self._pending_bytes += len(text)
+            self._pending_stream = stream
+            if (self._pending_bytes >= OUTPUT_BATCH_BYTES
+                    or time.monotonic() - self._last_flush >= OUTPUT_FLUSH_INTERVAL):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        stream, text = self._pending_stream, "".join(self._pending)
+        self._pending, self._pending_bytes, self._pending_stream = [], 0, None
+        try:
+            stream.write(text)
+            stream.flush()
+        except ValueError:
+            pass # The stream was closed (e.g. a finished redirect)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_stale(self, stop):
+        # Writes out messages that would otherwise wait for the next one or the batch end
+        while not stop.wait(OUTPUT_FLUSH_INTERVAL):
+            with self._lock:
+                if self._pending and time.monotonic() - self._last_flush >= OUTPUT_FLUSH_INTERVAL:
+                    self._flush_locked()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Buffers messages for the duration of the block; everything is written by its end."""
+        with self._lock:
+            self._batching += 1
+            if self._batching == 1:
+                self._last_flush = time.monotonic()
+                self._stop = threading.Event()
+                threading.Thread(target=self._flush_stale, args=(self._stop,), daemon=True).start()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batching -= 1
+                if not self._batching:
+                    self._stop.set()
+                self._flush_locked()
+
+# Every out_* helper writes through this sink
+OUTPUT = OutputSink()
+
+def out_separator():
+    """Prints a blue separator line."""
+    OUTPUT.emit("separator", Fore.BLUE + "--------------------------------------------------")
+
+def out_header(title):
+    """Prints a formatted cyan header."""
+    out_separator()
+    OUTPUT.emit("header", Fore.CYAN + title, message=title)
+    out_separator()
+
+def out_error(message):
+    """Prints a red error message."""
+    OUTPUT.emit("error", Fore.RED + f"[ERROR] {message}", message=message)
+
+def out_success(message):
+    """Prints a green success message."""
+    OUTPUT.emit("success", Fore.GREEN + f"[SUCCESS] {message}", message=message)
+
+def out_info(message):
+    """Prints a yellow info message."""
+    OUTPUT.emit("info", Fore.YELLOW + f"[INFO] {message}", message=message)
+
+def out_item(text, **fields):
+    """Prints one result line (or block of lines); fields are its jsonl record."""
+    OUTPUT.emit("item", text, **fields)
+
+def out_review(text, **fields):
+    """Prints a line the user must see before confirming, in every output mode."""
+    OUTPUT.emit("review", text, **fields)
+
+def out_progress(message):
+    """Prints a yellow progress message, rate-limited to one per OUTPUT_PROGRESS_INTERVAL."""
+    OUTPUT.progress(Fore.YELLOW + f"[INFO] {message}", message=message)
+
+def check_pip_dependency(package_name):
+    """Checks if a required Python package is installed."""
+    try:
+        importlib.import_module(package_name)
+        return True
+    except ImportError:
+        out_error(f"Python dependency missing: '{package_name}'")
+        out_info(f"Please install it using: pip install {package_name}")
+        return False
+
+def is_admin():
+    """Checks if the script is running with Administrator privileges on Windows."""
+    import ctypes
+    try:
+        return ctypes.windll.shell32.IsUserAnAdmin()
+    except Exception:
+        return False
+
+# Process exit codes of the command-line interface
+EXIT_OK = 0           # Success (for searches: something matched)
+EXIT_FAILURE = 1      # The tool ran but failed, found nothing, or some items failed
+EXIT_USAGE = 2        # Invalid arguments or input
+EXIT_UNAVAILABLE = 3  # Missing dependency, privileges or platform support
+
+class ToolkitError(Exception):
+    """An error a tool reports to the user instead of a traceback, with its exit code."""
+    def __init__(self, message, exit_code=EXIT_USAGE):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+class RunCounters:
+    """
+    Always-on counters for the current tool run, reported in its run record.
+    Engines add to them once per file, block or request (never per line), so
+    they cost next to nothing when no record is written.
+    """
+    __slots__ = ("files_scanned", "bytes_read", "syscalls_avoided", "net_requests", "requests")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.files_scanned = 0     # Files looked at by a directory walk
+        self.bytes_read = 0        # File content read from disk
+        self.syscalls_avoided = 0  # File opens/reads and lookups skipped thanks to an index, cache or early stop
+        self.net_requests = 0
+        self.requests = {}         # kind -> [count, failed, RingBuffer of latencies in ms]
+
+    def net_request(self, kind, latency_ms=None):
+        """Counts one network request of `kind`; latency_ms is None if it failed."""
+        self.net_requests += 1
+        entry = self.requests.get(kind)
+        if entry is None:
+            entry = self.requests[kind] = [0, 0, RingBuffer(RUN_LATENCY_SAMPLES)]
+        entry[0] += 1
+        if latency_ms is None:
+            entry[1] += 1
+        else:
+            entry[2].append(latency_ms)
+
+    def snapshot(self):
+        """Returns the counters as a dict, with latency percentiles per request kind."""
+        network = {}
+        for kind, (count, failed, samples) in self.requests.items():
+            summary = summarize_latencies(list(samples.values()))
+            del summary["histogram"]
+            network[kind] = {"requests": count, "failed": failed, **summary}
+        return {"files_scanned": self.files_scanned, "bytes_read": self.bytes_read,
+                "syscalls_avoided": self.syscalls_avoided, "net_requests": self.net_requests,
+                "network": network}
+
+COUNTERS = RunCounters()
+
+def suspend_script(message="Press [Enter] to return to the main menu..."):
+    """Pauses the script and waits for user input."""
+    input(message)
+
+def wait_script(seconds=2):
+    """Pauses the script for a set number of seconds."""
+    time.sleep(seconds)
+
+def clear_screen():
+    """Clears the terminal screen."""
+    os.system('cls' if os.name == 'nt' else 'clear')
+
+def sparkline(values, floor=None):
+    """
+    Returns a one-line block-character chart of a sequence of numbers.
+    Scales between the smallest and largest value, or from `floor` if given
+    (values at or below the floor are drawn as blanks).
+    """
+    values = list(values)
+    if not values:
+        return ""
+    low = min(values) if floor is None else floor
+    span = (max(values) - low) or 1
+    blocks = "▁▂▃▄▅▆▇█"
+    return "".join(" " if floor is not None and v <= floor
+                   else blocks[min(7, int((v - low) / span * 7))] for v in values)
+
+# =============================================================================
+# FEATURE FUNCTIONS CENTER (The Tools)
+# =============================================================================
+
+# --- 1. Folder Organizer ---
+
+# Destination sub-folder for each file extension
+EXT_MAP = {
+    ".jpg": "images", ".jpeg": "images", ".png": "images",
+    ".doc": "documents", ".docx": "documents", ".txt": "documents", ".pdf": "documents",
+    ".xls": "spreadsheets", ".xlsx": "spreadsheets", ".csv": "spreadsheets",
+    ".sh": "scripts", ".py": "scripts", ".ps1": "scripts",
+    ".zip": "archives", ".tar": "archives", ".gz": "archives", ".bz2": "archives",
+    ".ppt": "presentations", ".pptx": "presentations",
+    ".mp3": "audio",
+    ".mp4": "video",
+}
+
+def organize_folder(src_path, dest_path):
+    """
+    Moves every file directly inside src_path into the dest_path sub-folder EXT_MAP
+    picks for its extension. Uncategorized files stay where they are and are listed
+    in dest_path/specialFiles.list. Returns a dict of moved, uncategorized and failed files.
+    """
+    if not os.path.isdir(src_path):
+        raise ToolkitError(f"Source path '{src_path}' is not a valid directory.")
+    os.makedirs(dest_path, exist_ok=True)
+
+    special_files_log = os.path.join(dest_path, "specialFiles.list")
+    result = {"source": src_path, "destination": dest_path, "log": special_files_log,
+              "moved": [], "uncategorized": [], "errors": []}
+    try:
+        log_file = open(special_files_log, 'w', encoding='utf-8')
+    except OSError as e:
+        raise ToolkitError(f"Could not write to log file: {e}")
+
+    with log_file:
+        log_file.write("--- Log of Uncategorized Files ---\n")
+        for filename in os.listdir(src_path):
+            src_file = os.path.join(src_path, filename)
+            if not os.path.isfile(src_file):
+                continue
+            COUNTERS.files_scanned += 1
+            try:
+                subdir = move_to_category(src_file, dest_path)
+            except (OSError, shutil.Error) as e:
+                result["errors"].append({"file": filename, "error": str(e)})
+                continue
+            if subdir:
+                result["moved"].append({"file": filename, "category": subdir})
+            else:
+                log_file.write(f"{filename}\n")
+                result["uncategorized"].append(filename)
+    return result
+
+def move_to_category(src_file, dest_path):
+    """
+    Moves one file into the dest_path sub-folder EXT_MAP picks for its extension and
+    returns that sub-folder's name, or returns None (leaving the file) if it has none.
+    Raises OSError or shutil.Error when the move fails.
+    """
+    subdir = EXT_MAP.get(os.path.splitext(src_file)[1].lower())
+    if not subdir:
+        return None
+    target_dir = os.path.join(dest_path, subdir)
+    os.makedirs(target_dir, exist_ok=True)
+    shutil.move(src_file, target_dir)
+    return subdir
+
+def watch_folder(src_path, dest_path, emit, stop=None, use_inotify=True):
+    """
+    Organizes src_path continuously: files already there and every file created in or
+    moved into it later. A file is moved once it is complete: on inotify when its
+    writer closes it or it is renamed in, otherwise when its size and mtime have not
+    changed for WATCH_SETTLE seconds. At most WATCH_BATCH files are moved per pass, and
+    emit(filename, category, error) is called for each (category None: uncategorized,
+    appended to dest_path/specialFiles.list). Files left in place are retried only
+    after they change. Waits on inotify when available, otherwise polls. Runs until
+    stop() returns True or Ctrl+C; returns counts of moved, uncategorized and failed files.
+    """
+    import stat
+    if not os.path.isdir(src_path):
+        raise ToolkitError(f"Source path '{src_path}' is not a valid directory.")
+    os.makedirs(dest_path, exist_ok=True)
+    special_files_log = os.path.join(dest_path, "specialFiles.list")
+    counts = {"moved": 0, "uncategorized": 0, "errors": 0}
+
+    selector = notifier = None
+    if use_inotify and sys.platform.startswith('linux'):
+        try:
+            notifier = _Inotify()
+            notifier.watch(src_path, notifier.IN_CLOSE_WRITE | notifier.IN_MOVED_TO | notifier.IN_CREATE
+                           | notifier.IN_MODIFY | notifier.IN_MOVED_FROM | notifier.IN_DELETE)
+            selector = selectors.DefaultSelector()
+            selector.register(notifier.fd, selectors.EVENT_READ)
+        except (OSError, AttributeError):
+            if notifier is not None:
+                notifier.close()
+            notifier = selector = None
+
+    # How long a file's (size, mtime) must stay unchanged before it is moved, by what is
+    # known about its writer: closed it (or renamed it in), unknown (found by a scan),
+    # or still has it open
+    quiet = {True: 0.0, None: WATCH_SETTLE, False: WATCH_RESYNC}
+    pending = {}  # filename -> ((size, mtime_ns), monotonic time that state was first seen, closed)
+    left = {}     # filename -> (size, mtime_ns) of files left in place (uncategorized or failed)
+    changed = {}  # filename -> closed, for names to stat on this pass
+    rescan = True
+    last_scan = 0.0
+    folder_mtime = None
+    interval = WATCH_POLL_MIN
+    try:
+        while not (stop and stop()):
+            now = time.monotonic()
+            if selector is None:
+                # Polling: list the folder only when its mtime shows entries came or went
+                try:
+                    mtime = os.stat(src_path).st_mtime_ns
+                except OSError as e:
+                    raise ToolkitError(f"Cannot read '{src_path}': {e}")
+                rescan = rescan or mtime != folder_mtime
+                folder_mtime = mtime
+                for name, (_, _, closed) in pending.items():
+                    changed.setdefault(name, closed)
+            if rescan or now - last_scan >= WATCH_RESYNC:
+                try:
+                    with os.scandir(src_path) as entries:
+                        present = {entry.name for entry in entries if entry.is_file()}
+                except OSError as e:
+                    raise ToolkitError(f"Cannot read '{src_path}': {e}")
+                for name in (pending.keys() | left.keys()) - present:
+                    pending.pop(name, None)
+                    left.pop(name, None)
+                for name in present:
+                    changed.setdefault(name, pending[name][2] if name in pending else None)
+                rescan = False
+                last_scan = now
+
+            activity = False
+            for name, closed in changed.items():
+                try:
+                    st = os.stat(os.path.join(src_path, name))
+                except OSError:
+                    st = None
+                if st is None or not stat.S_ISREG(st.st_mode):
+                    pending.pop(name, None)
+                    left.pop(name, None)
+                    continue
+                COUNTERS.files_scanned += 1
+                state = (st.st_size, st.st_mtime_ns)
+                if left.get(name) == state:
+                    continue
+                left.pop(name, None)
+                if name not in pending or pending[name][0] != state:
+                    pending[name] = (state, now, closed)
+                    activity = True
+                elif pending[name][2] != closed:
+                    pending[name] = (state, pending[name][1], closed)
+            changed.clear()
+
+            ready = sorted((name for name, (_, seen, closed) in pending.items() if now - seen >= quiet[closed]),
+                           key=lambda name: pending[name][1])
+            uncategorized = []
+            for name in ready[:WATCH_BATCH]:
+                state, _, closed = pending.pop(name)
+                src_file = os.path.join(src_path, name)
+                try:
+                    st = os.stat(src_file)
+                except OSError:
+                    continue
+                if (st.st_size, st.st_mtime_ns) != state: # Written to since it was seen; wait again
+                    pending[name] = ((st.st_size, st.st_mtime_ns), now, None if closed else closed)
+                    continue
+                try:
+                    subdir = move_to_category(src_file, dest_path)
+                except (OSError, shutil.Error) as e:
+                    left[name] = state
+                    counts["errors"] += 1
+                    emit(name, None, str(e))
+                    continue
+                if subdir:
+                    counts["moved"] += 1
+                    emit(name, subdir, None)
+                else:
+                    left[name] = state
+                    uncategorized.append(name)
+            if uncategorized:
+                try:
+                    with open(special_files_log, 'a', encoding='utf-8') as log_file:
+                        log_file.writelines(f"{name}\n" for name in uncategorized)
+                except OSError as e:
+                    raise ToolkitError(f"Could not write to log file: {e}")
+                for name in uncategorized:
+                    counts["uncategorized"] += 1
+                    emit(name, None, None)
+            if len(ready) > WATCH_BATCH:
+                continue # More files are ready: next batch without waiting
+
+            # Sleep until the next pending file can be ready, or until something changes
+            settle = None
+            if pending:
+                settle = max(0.0, min(seen + quiet[closed] for _, seen, closed in pending.values())
+                             - time.monotonic())
+            if selector is not None:
+                if selector.select(timeout=WATCH_RESYNC if settle is None else min(settle, WATCH_RESYNC)):
+                    time.sleep(WATCH_COALESCE) # Let a burst of writes arrive as one wake-up
+                    for name, mask in notifier.read_events():
+                        if name is None:
+                            rescan = True
+                        elif mask & (notifier.IN_CLOSE_WRITE | notifier.IN_MOVED_TO):
+                            changed[name] = True
+                        elif mask & (notifier.IN_CREATE | notifier.IN_MODIFY):
+                            changed[name] = False
+                        else:
+                            changed[name] = None # Moved out or deleted: dropped by the stat
+            else:
+                interval = WATCH_POLL_MIN if activity or pending else min(WATCH_POLL_MAX, interval * 2)
+                time.sleep(interval if settle is None else min(interval, settle))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if selector is not None:
+            selector.close()
+            notifier.close()
+    return counts
+
+def start_folder_organizer():
+    out_header("Folder Organizer Utility")
+    
+    src_path = input("Enter the absolute path of the folder to organize: ")
+    dest_path = input(r"Enter the destination path (default: ~\MyShebangs): ")
+    
+    # 2. Validate input
+    if not dest_path:
+        dest_path = os.path.join(os.path.expanduser('~'), "MyShebangs")
+        out_info(f"Using default destination: {dest_path}")
+
+    watch = input("Keep watching the folder and organize new files as they arrive? (y/n): ")
+    if watch.lower() == 'y':
+        def emit(filename, category, error):
+            if error:
+                out_error(f"Failed to move {filename}: {error}")
+            elif category:
+                out_success(f"Moved {filename} -> {category}")
+            else:
+                out_info(f"Logged '{filename}' to specialFiles.list")
+
+        out_info(f"Watching '{src_path}' for new files. Press Ctrl+C to stop.")
+        out_separator()
+        try:
+            counts = watch_folder(src_path, dest_path, emit)
+        except ToolkitError as e:
+            out_error(f"{e} Aborting.")
+            wait_script(2)
+            return
+        out_separator()
+        out_success(f"Stopped watching. Moved {counts['moved']} file(s) to '{dest_path}', "
+                    f"logged {counts['uncategorized']}, {counts['errors']} failed.")
+        suspend_script()
+        return
+
+    out_info(f"Scanning '{src_path}'...")
+    try:
+        result = organize_folder(src_path, dest_path)
+    except ToolkitError as e:
+        out_error(f"{e} Aborting.")
+        wait_script(2)
+        return
+
+    for item in result["moved"]:
+        out_success(f"Moved {item['file']} -> {item['category']}")
+    for filename in result["uncategorized"]:
+        out_info(f"Logged '{filename}' to specialFiles.list")
+    for item in result["errors"]:
+        out_error(f"Failed to move {item['file']}: {item['error']}")
+
+    out_separator()
+    if not (result["moved"] or result["uncategorized"] or result["errors"]):
+        out_info(f"No files were found to move in '{src_path}'.")
+    else:
+        out_success(f"Organization complete. All files moved to '{dest_path}'.")
+        out_info(f"Uncategorized files are logged in '{result['log']}'")
+    
+    suspend_script()
+
+# --- 2. Password Generator ---
+PASSWORD_CHARS = string.ascii_letters + string.digits + '!@#$%^&*'
+
+def generate_password(length=16):
+    """Returns a random password of `length` characters drawn from PASSWORD_CHARS."""
+    import random
+    if length <= 0:
+        raise ToolkitError("Invalid input. Length must be a positive number.")
+    if length > 1024:
+        raise ToolkitError("Length too large. Please choose a length under 1024.")
+    return "".join(random.choices(PASSWORD_CHARS, k=length))
+
+def start_password_generator():
+    out_header("Password Generator Utility")
+    
+    pass_len_input = input("Enter password length (default: 16): ")
+
+    try:
+        if not pass_len_input:
+            pass_len = 16
+            out_info("Using default length: 16 characters.")
+        else:
+            pass_len = int(pass_len_input)
+        password = generate_password(pass_len)
+    except ValueError:
+        out_error("Invalid input. Length must be a positive number.")
+        wait_script(2)
+        return
+    except ToolkitError as e:
+        out_error(str(e))
+        wait_script(2)
+        return
+    
+    out_info("Generating secure password...")
+    # 4. Display Password
+    out_separator()
+    print("Your new password is:")
+    print(Fore.YELLOW + password)
+    out_separator()
+    out_info("Copy this password to a safe place. It is not saved.")
+    suspend_script()
+
+# --- 3. Curf Remover (Safe File Cleaner) ---
+def find_old_items(clean_path, days):
+    """
+    Returns (files, empty_dirs) under clean_path last modified more than `days` days
+    ago. Non-empty folders are never returned; entries we can't access are skipped.
+    """
+    if days < 0:
+        raise ToolkitError("Invalid input. Days must be a non-negative number.")
+    if not os.path.isdir(clean_path):
+        raise ToolkitError(f"Path '{clean_path}' is not a valid directory.")
+    cutoff_time = (datetime.now() - timedelta(days=days)).timestamp()
+    
+    files_to_delete = []
+    dirs_to_delete = []
+
+    # Walk bottom-up to find empty dirs correctly
+    for root, dirs, files in os.walk(clean_path, topdown=False):
+        COUNTERS.files_scanned += len(files)
+        for file in files:
+            file_path = os.path.join(root, file)
+            try:
+                if os.path.getmtime(file_path) < cutoff_time:
+                    files_to_delete.append(file_path)
+            except OSError:
+                pass # Ignore files we can't access
+        
+        # Find *empty* directories
+        for d in dirs:
+            dir_path = os.path.join(root, d)
+            try:
+                if not os.listdir(dir_path) and os.path.getmtime(dir_path) < cutoff_time:
+                    dirs_to_delete.append(dir_path)
+            except OSError:
+                pass # Ignore dirs we can't access
+    return files_to_delete, dirs_to_delete
+
+def remove_item(path, is_file=True):
+    """Deletes one file, or one empty folder. Raises OSError on failure."""
+    if is_file:
+        os.remove(path)
+    else:
+        os.rmdir(path)
+
+def parse_size(text):
+    """Parses '500M', '200GB' or '1.5TiB' (binary units; bare numbers are bytes) into bytes. Raises ValueError."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?", str(text).strip().lower())
+    if not match:
+        raise ValueError(f"unrecognised size '{text}' (use e.g. 500MB, 200GB, 1.5TB)")
+    unit = match.group(2)
+    size = int(float(match.group(1)) * 1024 ** (" kmgt".index(unit) if unit else 0))
+    if size <= 0:
+        raise ValueError(f"size must be positive: '{text}'")
+    return size
+
+def _iter_volume_files(root):
+    """
+    Yields (path, stat) for every regular file under root that lives on root's drive.
+    Symlinks are not followed; folders we can't access are skipped.
+    """
+    root_dev = os.stat(root).st_dev
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dev = entry.stat(follow_symlinks=False).st_dev
+                            if not dev or dev == root_dev: # st_dev is 0 from scandir on Windows
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        pass # Ignore entries we can't access
+        except OSError:
+            pass
+
+def plan_free_space(clean_path, target_free):
+    """
+    Picks the files under clean_path to delete so that its drive has target_free bytes
+    free (per shutil.disk_usage): the smallest set of the oldest files whose sizes add
+    up to the shortfall. The scan streams into a heap of the selection so far, newest
+    on top; whenever the older files already cover the shortfall the newest is evicted,
+    so memory holds the selection, never the whole tree, and nothing is sorted but the
+    result. Hard-linked files are skipped, since deleting one link frees nothing.
+    Returns the projection with the selected files, oldest first (with the mtime_ns
+    free_space() checks before deleting each one).
+    """
+    if target_free <= 0:
+        raise ToolkitError("Invalid input. The free-space target must be positive.")
+    if not os.path.isdir(clean_path):
+        raise ToolkitError(f"Path '{clean_path}' is not a valid directory.")
+    usage = shutil.disk_usage(clean_path)
+    if target_free > usage.total:
+        raise ToolkitError(f"The target ({human_bytes(target_free)}) is more than the size of "
+                           f"the drive ({human_bytes(usage.total)}).")
+    needed = max(0, target_free - usage.free)
+    plan = {"path": clean_path, "target_free": target_free, "free_before": usage.free,
+            "needed": needed, "selected_bytes": 0, "reachable": True, "files": []}
+    if not needed:
+        return plan
+
+    heap = [] # (-mtime_ns, size, path)
+    selected = 0
+    for path, st in _iter_volume_files(clean_path):
+        COUNTERS.files_scanned += 1
+        if st.st_nlink > 1:
+            continue
+        size = _allocated_size(st)
+        if not size or (selected >= needed and -st.st_mtime_ns <= heap[0][0]):
+            continue # Frees nothing, or newer than every file the target needs so far
+        heapq.heappush(heap, (-st.st_mtime_ns, size, path))
+        selected += size
+        while selected - heap[0][1] >= needed:
+            selected -= heapq.heappop(heap)[1]
+
+    plan["selected_bytes"] = selected
+    plan["reachable"] = selected >= needed
+    plan["files"] = [{"path": path, "size": size, "mtime_ns": -neg_mtime,
+                      "mtime": datetime.fromtimestamp(-neg_mtime / 1e9).isoformat(timespec='seconds')}
+                     for neg_mtime, size, path in sorted(heap, reverse=True)]
+    return plan
+
+def _allocated_size(st):
+    """Bytes a file occupies: its allocated blocks where the platform reports them (sparse files)."""
+    return st.st_blocks * 512 if hasattr(st, 'st_blocks') else st.st_size
+
+def _remove_if_unchanged(item):
+    """
+    Deletes a planned file unless it changed since the plan was made (it is no longer
+    the old file that was shown). Returns False if it was left alone.
+    """
+    st = os.lstat(item["path"])
+    if st.st_mtime_ns != item["mtime_ns"] or _allocated_size(st) != item["size"]:
+        return False
+    remove_item(item["path"])
+    return True
+
+def free_space(plan, progress=None, workers=SPACE_DELETE_WORKERS):
+    """
+    Deletes the files of a plan_free_space() plan, oldest first, with `workers` threads
+    and stops once the drive has the target free space (checked after each batch of
+    deletions, which is also when progress(freed, needed) is called). Files modified
+    since the plan was made are skipped. Returns the deleted, skipped and failed files,
+    bytes freed and the free space before and after.
+    """
+    import concurrent.futures
+    target = plan["target_free"]
+    result = {"deleted": [], "skipped": [], "errors": [], "freed": 0,
+              "free_before": shutil.disk_usage(plan["path"]).free}
+    files = iter(plan["files"])
+    in_flight = {}
+    short = target - result["free_before"]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="toolkit-clean") as pool:
+        while True:
+            # Only as many deletions are queued as the last check says are still
+            # needed, so none run past the target unless a file frees less than planned
+            while (len(in_flight) < workers * 2
+                   and sum(item["size"] for item in in_flight.values()) < short):
+                item = next(files, None)
+                if item is None:
+                    break
+                in_flight[pool.submit(_remove_if_unchanged, item)] = item
+            if not in_flight:
+                break
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                try:
+                    removed = future.result()
+                except OSError as e:
+                    result["errors"].append({"path": item["path"], "error": str(e)})
+                    continue
+                if not removed:
+                    result["skipped"].append(item["path"])
+                    continue
+                result["deleted"].append(item["path"])
+                result["freed"] += item["size"]
+            short = target - shutil.disk_usage(plan["path"]).free
+            if progress:
+                progress(result["freed"], plan["needed"])
+    result["free_after"] = shutil.disk_usage(plan["path"]).free
+    result["target_reached"] = result["free_after"] >= target
+    return result
+
+def start_curf_remover():
+    out_header("Curf Remover (Old File Cleaner)")
+
+    out_info("This utility will find and delete files older than a specified number of days.")
+    out_error("WARNING: This is a destructive operation. Files are permanently deleted.")
+    out_info("We will *only* target FILES and EMPTY FOLDERS. Non-empty folders are safe.")
+    out_separator()
+
+    clean_path = input("Enter the absolute path of the folder to clean: ")
+    mode = input("Select files by (1) age in days or (2) a free-space target, oldest first? (default: 1): ")
+    if mode == '2':
+        free_space_target(clean_path)
+        return
+    days_input = input("Delete files OLDER than how many days? (default: 15): ")
+
+    try:
+        days = int(days_input) if days_input else 15
+        out_info(f"Searching for files in '{clean_path}' older than {days} days...")
+        files_to_delete, dirs_to_delete = find_old_items(clean_path, days)
+    except ValueError:
+        out_error("Invalid input. Days must be a non-negative number. Aborting.")
+        wait_script(2)
+        return
+    except ToolkitError as e:
+        out_error(f"{e} Aborting.")
+        wait_script(2)
+        return
+    
+    total_count = len(files_to_delete) + len(dirs_to_delete)
+    if total_count == 0:
+        out_success(f"No files or empty folders found older than {days} days.")
+        wait_script(2)
+        return
+        
+    out_separator()
+    out_info(f"Found {len(files_to_delete)} files and {len(dirs_to_delete)} empty folders to delete.")
+    out_review("You can review the list below:")
+    
+    with OUTPUT.batch():
+        for f in files_to_delete: out_review(f, path=f, type="file")
+        for d in dirs_to_delete: out_review(d, path=d, type="dir")
+    
+    out_separator()
+    out_error("This action is permanent. Are you sure?")
+    confirm = input("Type 'interactive' to confirm one-by-one, or 'ALL' to delete all: ")
+    
+    def delete_item(path, is_file=True):
+        try:
+            remove_item(path, is_file)
+            out_item(f"Deleted file: {path}" if is_file else f"Deleted empty dir: {path}",
+                     deleted=path, type="file" if is_file else "dir")
+        except OSError as e:
+            out_error(f"Failed to delete {path}: {e}")
+
+    if confirm == 'interactive':
+        out_info("Starting interactive deletion...")
+        for f in files_to_delete:
+            if input(f"Delete file '{f}'? (y/n): ").lower() == 'y':
+                delete_item(f, is_file=True)
+        for d in dirs_to_delete:
+            if input(f"Delete empty dir '{d}'? (y/n): ").lower() == 'y':
+                delete_item(d, is_file=False)
+        out_success("Interactive cleanup complete.")
+    
+    elif confirm == 'ALL':
+        out_info("Starting bulk deletion...")
+        with OUTPUT.batch():
+            for f in files_to_delete:
+                delete_item(f, is_file=True)
+            for d in dirs_to_delete:
+                delete_item(d, is_file=False)
+        out_success("Bulk cleanup complete.")
+        
+    else:
+        out_info("Invalid confirmation. Aborting. No files were deleted.")
+    
+    suspend_script()
+
+def free_space_target(clean_path):
+    """Menu flow for the free-space target mode of the Curf Remover."""
+    target_input = input("How much free space should the drive have? (e.g. 200GB): ")
+    try:
+        target_free = parse_size(target_input)
+        out_info(f"Scanning '{clean_path}' for the oldest files to delete...")
+        plan = plan_free_space(clean_path, target_free)
+    except ValueError as e:
+        out_error(f"Invalid input: {e}. Aborting.")
+        wait_script(2)
+        return
+    except ToolkitError as e:
+        out_error(f"{e} Aborting.")
+        wait_script(2)
+        return
+
+    free_before = human_bytes(plan["free_before"])
+    if not plan["needed"]:
+        out_success(f"The drive already has {free_before} free. Nothing to delete.")
+        wait_script(2)
+        return
+
+    out_separator()
+    out_review("Dry run, nothing deleted yet:")
+    with OUTPUT.batch():
+        for item in plan["files"]:
+            out_review(f"{item['mtime']}  {human_bytes(item['size']):>10}  {item['path']}", **item)
+    out_separator()
+    out_info(f"Free now: {free_before}. Target: {human_bytes(target_free)}. "
+             f"Needed: {human_bytes(plan['needed'])}.")
+    if not plan["files"]:
+        out_error("No files under this folder can be deleted to free space. Aborting.")
+        wait_script(2)
+        return
+    out_info(f"Deleting the {len(plan['files'])} oldest files ({plan['files'][0]['mtime']} to "
+             f"{plan['files'][-1]['mtime']}) frees {human_bytes(plan['selected_bytes'])}.")
+    if not plan["reachable"]:
+        out_error(f"Even deleting all of them leaves the drive {human_bytes(plan['needed'] - plan['selected_bytes'])} "
+                  "short of the target.")
+
+    out_separator()
+    out_error("This action is permanent. Are you sure?")
+    if input("Type 'ALL' to delete these files: ") != 'ALL':
+        out_info("Invalid confirmation. Aborting. No files were deleted.")
+        suspend_script()
+        return
+
+    def progress(freed, needed):
+        out_progress(f"Freed {human_bytes(freed)} of {human_bytes(needed)} ({min(100, freed * 100 // needed)}%)")
+
+    out_info("Starting parallel deletion, oldest first...")
+    result = free_space(plan, progress)
+    for path in result["skipped"]:
+        out_info(f"Kept {path}: it changed after the dry run.")
+    for item in result["errors"]:
+        out_error(f"Failed to delete {item['path']}: {item['error']}")
+    out_separator()
+    summary = (f"Deleted {len(result['deleted'])} files, freed {human_bytes(result['freed'])}. "
+               f"Free now: {human_bytes(result['free_after'])}.")
+    if result["target_reached"]:
+        out_success(f"Target reached. {summary}")
+    else:
+        out_error(f"Target not reached. {summary}")
+    suspend_script()
+
+# --- 4. User Creator ---
+def check_new_username(username):
+    """Raises ToolkitError unless `username` is a valid name that does not exist yet."""
+    import subprocess
+    if not username:
+        raise ToolkitError("Username cannot be empty.")
+    if ' ' in username:
+        raise ToolkitError("Invalid username. Spaces are not allowed.")
+    # Check if user already exists using 'net user'
+    check_proc = subprocess.run(['net', 'user', username], capture_output=True, text=True, shell=True)
+    if check_proc.returncode == 0:
+        raise ToolkitError(f"User '{username}' already exists.")
+
+def create_user(username, password):
+    """Creates a local user with 'net user' and adds it to the 'Users' group."""
+    import subprocess
+    add_proc = subprocess.run(
+        ['net', 'user', username, password, '/add', '/comment:"User created by toolkit"'],
+        capture_output=True, text=True, shell=True
+    )
+    if add_proc.returncode != 0:
+        raise ToolkitError(add_proc.stderr or add_proc.stdout, EXIT_FAILURE)
+
+    group_proc = subprocess.run(
+        ['net', 'localgroup', 'Users', username, '/add'],
+        capture_output=True, text=True, shell=True
+    )
+    if group_proc.returncode != 0:
+        raise ToolkitError(group_proc.stderr or group_proc.stdout, EXIT_FAILURE)
+
+def start_user_creator():
+    import getpass
+    out_header("User Creator Utility")
+    
+    if not is_admin():
+        out_error("This action requires Administrator privileges.")
+        out_info("Please run the script again as an Administrator.")
+        wait_script(4)
+        return
+        
+    out_info("Running with Administrator privileges. Ready to create user.")
+    username = input("Enter the new username: ")
+    
+    try:
+        check_new_username(username)
+    except ToolkitError as e:
+        out_error(f"{e} Aborting.")
+        wait_script(2)
+        return
+        
+    out_info(f"You are about to create a new user named: {username}")
+    confirm = input("Are you sure you want to proceed? (y/n): ").lower()
+    
+    if confirm != 'y':
+        out_info("Aborting. No user was created.")
+        wait_script(2)
+        return
+        
+    try:
+        out_info(f"Please enter the password for '{username}' now.")
+        password = getpass.getpass("Enter new password: ")
+        create_user(username, password)
+        out_success(f"User '{username}' is ready.")
+        
+    except ToolkitError as e:
+        out_error(f"Failed to create user: {e}")
+        wait_script(2)
+        return
+        
+    suspend_script()
+
+# --- 5. Indexer (Batch File Renamer) ---
+def rename_files(target_dir, prefix="file-"):
+    """
+    Renames every file in target_dir to '{prefix}{number:03d}{extension}', keeping
+    the original extension. Returns a dict of renamed and failed files.
+    """
+    if not os.path.isdir(target_dir):
+        raise ToolkitError(f"Directory '{target_dir}' does not exist.")
+
+    result = {"directory": target_dir, "renamed": [], "errors": []}
+    i = 1
+    for filename in os.listdir(target_dir):
+        src_path = os.path.join(target_dir, filename)
+        if not os.path.isfile(src_path):
+            continue
+        COUNTERS.files_scanned += 1
+        # Build new name with 3-digit padding, keeping the extension (e.g., ".jpg")
+        new_name = f"{prefix}{i:03d}{os.path.splitext(filename)[1]}"
+        try:
+            os.rename(src_path, os.path.join(target_dir, new_name))
+            result["renamed"].append({"from": filename, "to": new_name})
+        except OSError as e:
+            result["errors"].append({"file": filename, "error": str(e)})
+        i += 1
+    return result
+
+def start_indexer():
+    out_header("Indexer (Batch File Renamer)")
+    
+    target_dir = input("Enter the path to the directory with files to rename: ")
+    prefix = input("Enter a new prefix for the files (e.g., 'report-'): ")
+    
+    if not os.path.isdir(target_dir):
+        out_error(f"Directory '{target_dir}' does not exist. Aborting.")
+        wait_script(2)
+        return
+        
+    if not prefix:
+        out_info("No prefix entered. Using 'file-' as default.")
+        prefix = "file-"
+        
+    out_info(f"This will rename all files in '{target_dir}' to '{prefix}[number].[original_extension]'.")
+    out_error("WARNING: This action is permanent.")
+    confirm = input("Are you sure you want to proceed? (y/n): ").lower()
+    
+    if confirm != 'y':
+        out_info("Aborting. No files were renamed.")
+        wait_script(2)
+        return
+
+    try:
+        result = rename_files(target_dir, prefix)
+    except (ToolkitError, OSError) as e:
+        out_error(f"An error occurred: {e}")
+        result = {"renamed": [], "errors": []}
+    
+    for item in result["renamed"]:
+        print(f"Renamed: {item['from']} -> {item['to']}")
+    for item in result["errors"]:
+        out_error(f"Failed to rename '{item['file']}': {item['error']}")
+
+    out_separator()
+    out_success(f"Renaming complete. {len(result['renamed'])} files were indexed.")
+    suspend_script()
+
+# --- 6. CSV Calculator ---
+def iter_csv_totals(csv_file, has_header=False):
+    """
+    Yields {'name', 'id', 'total', 'average'} for each row of a Name,ID,Val1,Val2 CSV
+    file, or None for a malformed row. With has_header the columns are looked up
+    by those header names, otherwise by position.
+    """
+    import csv
+    columns = ('Name', 'ID', 'Val1', 'Val2') if has_header else (0, 1, 2, 3)
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f) if has_header else csv.reader(f):
+            try:
+                name, row_id, val1, val2 = (row[column] for column in columns)
+                val1, val2 = float(val1), float(val2)
+            except (KeyError, IndexError, ValueError, TypeError):
+                yield None
+                continue
+            total = val1 + val2
+            yield {"name": name, "id": row_id, "total": total, "average": total / 2}
+        COUNTERS.bytes_read += f.buffer.tell()
+
+def start_csv_calculator():
+    out_header("CSV Calculator")
+    
+    csv_file = input("Enter the path to your CSV file: ")
+    has_header = input("Does this file have a header row? (y/n): ").lower()
+    
+    if not os.path.isfile(csv_file):
+        out_error(f"File not found: '{csv_file}'. Aborting.")
+        wait_script(2)
+        return
+        
+    out_info(f"Parsing '{csv_file}'...")
+    out_separator()
+    line_count = 0
+    skipped = 0
+    
+    try:
+        if has_header == 'y':
+            # Assumes headers 'Name', 'ID', 'Val1', 'Val2' as per original script
+            out_info("Assuming headers are 'Name', 'ID', 'Val1', 'Val2'")
+        with OUTPUT.batch():
+            for row in iter_csv_totals(csv_file, has_header == 'y'):
+                if row is None:
+                    skipped += 1
+                    continue
+                out_item(f"Name: {row['name']}\nID: {row['id']}\n{Fore.GREEN}Total: {row['total']}\n"
+                         f"{Fore.YELLOW}Average: {row['average']}{Fore.RESET}\n", **row)
+                line_count += 1
+
+    except Exception as e:
+        out_error(f"Failed to read file: {e}")
+        
+    out_separator()
+    if skipped:
+        out_info(f"Skipped {skipped} malformed lines.")
+    out_success(f"Calculation complete. Processed {line_count} valid lines.")
+    suspend_script()
+
+# --- 7. Service Manager ---
+def service_status(service_name):
+    """Returns the state 'sc query' reports for a service (e.g. RUNNING, STOPPED)."""
+    import subprocess
+    if not service_name:
+        raise ToolkitError("No service name entered.")
+    proc = subprocess.run(['sc', 'query', service_name], capture_output=True, text=True, shell=True)
+    if proc.returncode != 0:
+        if "1060" in proc.stderr or "1060" in proc.stdout:
+            raise ToolkitError(f"Could not find service '{service_name}'.", EXIT_FAILURE)
+        raise ToolkitError(f"An error occurred: {proc.stderr or proc.stdout}", EXIT_FAILURE)
+
+    state_match = re.search(r"STATE\s+:\s+\d+\s+([A-Z_]+)", proc.stdout)
+    if not state_match:
+        raise ToolkitError("Could not parse service state.", EXIT_FAILURE)
+    return state_match.group(1)
+
+def control_service(service_name, action):
+    """
+    Starts, stops or restarts a service with 'net start'/'net stop'. Both commands
+    wait for the service to change state; a restart tolerates a failed stop.
+    """
+    import subprocess
+    try:
+        if action in ("stop", "restart"):
+            subprocess.run(['net', 'stop', service_name], check=(action == "stop"), shell=True)
+        if action in ("start", "restart"):
+            subprocess.run(['net', 'start', service_name], check=True, shell=True)
+    except subprocess.CalledProcessError as e:
+        raise ToolkitError(f"Could not {action} service '{service_name}': {e}", EXIT_FAILURE)
+
+def start_service_manager():
+    out_header("Service Manager")
+    
+    if not is_admin():
+        out_error("This action requires Administrator privileges.")
+        out_info("Please run the script again as an Administrator.")
+        wait_script(4)
+        return
+        
+    service_name = input("Enter the name of the service (e.g., 'WinRM', 'Spooler'): ")
+    
+    if not service_name:
+        out_error("No service name entered. Aborting.")
+        wait_script(2)
+        return
+
+    try:
+        status = service_status(service_name)
+        out_separator()
+        
+        if status == "RUNNING":
+            out_success(f"Service '{service_name}' is ACTIVE and RUNNING.")
+            out_separator()
+            action = input("Do you want to (s)top or (r)estart this service? (any other key to exit): ").lower()
+            
+            if action == 's':
+                out_info(f"Attempting to STOP '{service_name}'...")
+                control_service(service_name, "stop")
+                out_success("Service stopped.")
+            elif action == 'r':
+                out_info(f"Attempting to RESTART '{service_name}'...")
+                control_service(service_name, "restart")
+                out_success("Service restarted.")
+            else:
+                out_info("No action taken.")
+                
+        elif status == "STOPPED":
+            out_info(f"Service '{service_name}' is INACTIVE (stopped).")
+            out_separator()
+            action = input("Do you want to (s)tart this service? (y/n): ").lower()
+            
+            if action == 'y':
+                out_info(f"Attempting to START '{service_name}'...")
+                control_service(service_name, "start")
+                out_success("Service started.")
+            else:
+                out_info("No action taken.")
+                
+        else:
+            out_error(f"Service '{service_name}' is in a '{status}' state.")
+            out_separator()
+            out_info("Check Event Viewer (System log) for details.")
+            action = input("Do you want to attempt a (r)estart? (y/n): ").lower()
+            
+            if action == 'y':
+                out_info(f"Attempting to RESTART '{service_name}'...")
+                control_service(service_name, "restart")
+                out_success("Restart attempted.")
+            else:
+                out_info("No action taken.")
+                
+    except ToolkitError as e:
+        out_error(str(e))
+        wait_script(2)
+    
+    suspend_script()
+
+# --- 8. Online Image Extractor ---
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+def find_image_links(html):
+    """Returns the unique image URLs (as written in the page) from <a href> and <img src>."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find all links (<a> tags) matching image extensions, as per original script,
+    # and all <img> tags (a logical improvement)
+    image_links = []
+    for tag, attr in (('a', 'href'), ('img', 'src')):
+        for element in soup.find_all(tag):
+            url = element.get(attr)
+            if url and url.lower().endswith(IMAGE_EXTENSIONS):
+                image_links.append(url)
+    return list(dict.fromkeys(image_links))
+
+def _http_get(requests, url, headers):
+    """requests.get() that counts the request and its latency in COUNTERS."""
+    start = time.perf_counter()
+    try:
+        response = requests.get(url, headers=headers)
+    except requests.exceptions.RequestException:
+        COUNTERS.net_request("http")
+        raise
+    COUNTERS.net_request("http", (time.perf_counter() - start) * 1000)
+    return response
+
+def extract_images(target_url, save_dir, progress=None):
+    """
+    Downloads every image linked from target_url into save_dir, calling
+    progress(file_name, url) before each download. Removes save_dir again if it
+    is left empty. Returns a dict of downloaded and failed images.
+    """
+    import requests
+    from urllib.parse import urljoin
+
+    if not target_url:
+        raise ToolkitError("No URL provided.")
+    try:
+        os.makedirs(save_dir, exist_ok=True)
+    except OSError as e:
+        raise ToolkitError(f"Could not create save directory: {save_dir}. {e}", EXIT_FAILURE)
+
+    result = {"url": target_url, "directory": save_dir, "downloaded": [], "errors": []}
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'}
+    try:
+        page = _http_get(requests, target_url, headers)
+        page.raise_for_status() # Raise error for bad responses (4xx, 5xx)
+        image_links = find_image_links(page.text)
+    except requests.exceptions.RequestException as e:
+        image_links = []
+        result["errors"].append({"url": target_url, "error": str(e)})
+
+    for img_url in image_links:
+        # Handle relative URLs
+        full_url = urljoin(target_url, img_url)
+        try:
+            # Get just the filename (split on '?' to remove query params)
+            file_name = os.path.basename(full_url.split('?')[0])
+            if not file_name:
+                file_name = f"image_{len(result['downloaded'])}.jpg" # Fallback
+            if progress:
+                progress(file_name, full_url)
+            img_data = _http_get(requests, full_url, headers)
+            img_data.raise_for_status()
+            with open(os.path.join(save_dir, file_name), 'wb') as f:
+                f.write(img_data.content)
+            result["downloaded"].append({"file": file_name, "url": full_url})
+        except (requests.exceptions.RequestException, OSError) as e:
+            result["errors"].append({"url": full_url, "error": str(e)})
+
+    if not result["downloaded"]:
+        try:
+            os.rmdir(save_dir) # Clean up empty dir
+        except OSError:
+            pass
+    return result
+
+def start_image_extractor():
+    out_header("Online Image Extractor")
+    
+    # Dependency check
+    if not (check_pip_dependency("requests") and check_pip_dependency("bs4")):
+        suspend_script()
+        return
+    
+    target_url = input("Enter the full website URL to scan (e.g., https://example.com): ")
+    save_dir = input(r"Enter directory to save images (default: ~\Downloads\ExtractedImages): ")
+    
+    if not target_url:
+        out_error("No URL provided. Aborting.")
+        wait_script(2)
+        return
+        
+    if not save_dir:
+        save_dir = os.path.join(os.path.expanduser('~'), "Downloads", "ExtractedImages")
+        
+    out_info(f"Save directory set: {save_dir}")
+    out_info(f"Starting download from '{target_url}'...")
+    out_info("This may take some time...")
+
+    try:
+        result = extract_images(target_url, save_dir,
+                                lambda name, url: out_progress(f"Downloading {name} from {url}..."))
+    except ToolkitError as e:
+        out_error(str(e))
+        out_info("Please check permissions. Aborting.")
+        wait_script(3)
+        return
+        
+    for item in result["errors"]:
+        out_error(f"Failed to download {item['url']}: {item['error']}")
+    
+    out_separator()
+    if result["downloaded"]:
+        out_success(f"Download complete. Saved {len(result['downloaded'])} images to '{save_dir}'.")
+    else:
+        out_info("Scan complete. No images matching (jpg, jpeg, png, gif) were found.")
+            
+    suspend_script()
+
+# --- 9. TarBall Mailer (Backup & Notify) ---
+def is_valid_email(address):
+    return re.match(r"^[^@]+@[^@]+\.[^@]+$", address or "") is not None
+
+def create_backup_archive(src_dir, dest_dir):
+    """Zips src_dir into dest_dir/<folder>_<timestamp>.zip and returns the archive path."""
+    if not os.path.isdir(src_dir):
+        raise ToolkitError(f"Source directory '{src_dir}' does not exist.")
+    try:
+        os.makedirs(dest_dir, exist_ok=True)
+    except OSError as e:
+        raise ToolkitError(f"Could not create destination directory '{dest_dir}': {e}", EXIT_FAILURE)
+
+    src_folder_name = os.path.basename(os.path.normpath(src_dir))
+    date_str = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    full_backup_path_base = os.path.join(dest_dir, f"{src_folder_name}_{date_str}") # shutil adds .zip
+    try:
+        return shutil.make_archive(base_name=full_backup_path_base, format='zip', root_dir=src_dir)
+    except (OSError, shutil.Error) as e:
+        # Clean up partial archive
+        if os.path.exists(f"{full_backup_path_base}.zip"):
+            os.remove(f"{full_backup_path_base}.zip")
+        raise ToolkitError(f"Operation FAILED: {e}", EXIT_FAILURE)
+
+def send_backup_notification(archive_path, src_dir, email_addr, email_pass):
+    """Emails a backup-success notice for archive_path through the configured SMTP server."""
+    from email.message import EmailMessage
+    import smtplib
+    import socket
+    src_folder_name = os.path.basename(os.path.normpath(src_dir))
+    subject = f"[Backup SUCCESS] {src_folder_name}"
+    body = f"""Backup of '{src_dir}' was successfully created.
+
+File: {archive_path}
+Host: {socket.gethostname()}
+Date: {datetime.now()}"""
+
+    msg = EmailMessage()
+    msg.set_content(body)
+    msg['Subject'] = subject
+    msg['From'] = FROM_EMAIL
+    msg['To'] = email_addr
+
+    start = time.perf_counter()
+    try:
+        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as s:
+            s.starttls()
+            s.login(FROM_EMAIL, email_pass)
+            s.send_message(msg)
+    except Exception:
+        COUNTERS.net_request("smtp")
+        raise
+    COUNTERS.net_request("smtp", (time.perf_counter() - start) * 1000)
+
+def start_tarball_mailer():
+    import getpass
+    out_header("TarBall Mailer (Backup & Notify)")
+    
+    out_info("This tool uses 'shutil.make_archive' (to .zip) and 'smtplib' (for email).")
+    out_info(f"Email will be sent via: {SMTP_SERVER} from {FROM_EMAIL}")
+    out_error("You must edit the SCRIPT CONFIGURATION at the top of this .py file.")
+    
+    src_dir = input("Enter the full path of the SOURCE directory to backup: ")
+    dest_dir = input("Enter the full path of the DESTINATION directory for the backup: ")
+    email_addr = input("Enter the email address for notification: ")
+
+    if not os.path.isdir(src_dir):
+        out_error(f"Source directory '{src_dir}' does not exist. Aborting.")
+        wait_script(2)
+        return
+        
+    if not is_valid_email(email_addr):
+        out_error("Invalid email address format. Aborting.")
+        wait_script(2)
+        return
+        
+    out_info(f"Preparing to archive '{src_dir}'...")
+    try:
+        archive_path = create_backup_archive(src_dir, dest_dir)
+    except ToolkitError as e:
+        out_error(str(e))
+        out_info("No email notification will be sent.")
+        wait_script(2)
+        return
+    out_info(f"Target file: {archive_path}")
+    
+    try:
+        out_success("Backup archive created successfully!")
+        out_separator()
+        out_info(f"Sending email notification to {email_addr}...")
+        
+        # Get password (modern SMTP requires auth)
+        out_info(f"Please enter the password for {FROM_EMAIL} to send the email:")
+        email_pass = getpass.getpass()
+        send_backup_notification(archive_path, src_dir, email_addr, email_pass)
+        out_success("Email notification sent.")
+        
+    except Exception as e:
+        out_error(f"Operation FAILED: {e}")
+        out_info("No email notification will be sent.")
+        # Clean up the archive, as the backup was not confirmed by email
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        wait_script(2)
+        return
+        
+    suspend_script()
+
+# --- 10. Term/Phase Fetcher ---
+
+def iter_files(root):
+    """Yields (path, stat_result) for every regular file under root, using os.scandir."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            COUNTERS.files_scanned += 1
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        pass # Ignore entries we can't access
+        except OSError:
+            pass # Ignore dirs we can't access
+
+def _encode_varint(value, out):
+    """Appends an unsigned LEB128 varint to a bytearray."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _decode_postings(buf, count):
+    """Decodes `count` delta-encoded varints from buf into a list of absolute file ids."""
+    ids = []
+    value = shift = last = 0
+    for byte in buf:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        last += value
+        ids.append(last)
+        value = shift = 0
+        if len(ids) == count:
+            break
+    return ids
+
+def _file_trigrams(f):
+    """
+    Returns the set of lower-cased 3-byte windows in a binary file and the number of
+    bytes read. The file is read in chunks; the last 2 bytes of each chunk are carried
+    over so windows spanning a chunk boundary are kept.
+    """
+    trigrams = set()
+    carry = b""
+    total = 0
+    while True:
+        chunk = f.read(INDEX_READ_CHUNK)
+        if not chunk:
+            return trigrams, total
+        total += len(chunk)
+        data = carry + chunk.lower()
+        trigrams.update(data[i:i + 3] for i in range(len(data) - 2))
+        carry = data[-2:]
+
+class TrigramIndex:
+    """
+    A persistent trigram inverted index for one search folder.
+
+    Every file gets an integer id. Each trigram maps to the sorted list of file ids
+    containing it, stored on disk as delta-encoded varints. Files are keyed by
+    (path, size, mtime), so update() only re-reads files that changed. New ids are
+    always the largest, so their deltas are appended to the encoded postings without
+    decoding them. A changed or deleted file just has its old id retired; the postings
+    are compacted once retired ids outnumber live ones.
+
+    On-disk layout:
+        MAGIC | <III> file-table length, trigram count, postings length
+        | file table (JSON) | trigram table (<3sIII> trigram, offset, count, last id)
+        | postings
+    """
+
+    MAGIC = b"TKTRIGR2"
+    _HEADER = struct.Struct('<III')
+    _ENTRY = struct.Struct('<3sIII')
+
+    def __init__(self, root, index_path=None):
+        self.root = os.path.abspath(root)
+        if index_path is None:
+            digest = hashlib.sha1(self.root.encode('utf-8')).hexdigest()[:16]
+            index_path = os.path.join(INDEX_DIR, f"{digest}.tri")
+        self.index_path = index_path
+        self.max_file_bytes = INDEX_MAX_FILE_MB * 1024 * 1024
+        # files[id] = [relpath, size, mtime_ns, indexed] or None for retired ids
+        self.files = []
+        self._by_path = {}
+        self._table = {}    # trigram -> (offset, length, count, last id) into self._blob
+        self._blob = b""
+        self._pending = {}  # trigram -> ids added since the last save
+
+    # --- Persistence ---
+
+    def load(self):
+        """Loads the index from disk. Returns False if there is no usable index file."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return False
+        if not raw.startswith(self.MAGIC):
+            return False
+        pos = len(self.MAGIC)
+        try:
+            meta_len, n_trigrams, blob_len = self._HEADER.unpack_from(raw, pos)
+            pos += self._HEADER.size
+            meta = json.loads(raw[pos:pos + meta_len].decode('utf-8'))
+            pos += meta_len
+            if meta.get("root") != self.root:
+                return False
+            entries_len = n_trigrams * self._ENTRY.size
+            entries = raw[pos:pos + entries_len]
+            pos += entries_len
+            self._blob = raw[pos:pos + blob_len]
+        except (struct.error, ValueError, UnicodeDecodeError):
+            return False
+        self._table = self._parse_entries(entries, len(self._blob))
+        self.files = meta["files"]
+        self._by_path = {entry[0]: i for i, entry in enumerate(self.files) if entry}
+        self._pending = {}
+        return True
+
+    def _parse_entries(self, entries, blob_len):
+        """Builds the trigram table. Postings are stored back to back in entry order."""
+        rows = list(self._ENTRY.iter_unpack(entries))
+        table = {}
+        for n, (tri, offset, count, last) in enumerate(rows):
+            end = rows[n + 1][1] if n + 1 < len(rows) else blob_len
+            table[tri] = (offset, end - offset, count, last)
+        return table
+
+    def save(self, postings=None):
+        """
+        Writes the index to disk atomically. Existing postings are copied as raw bytes
+        with pending ids appended; `postings` (fully decoded lists) forces a re-encode.
+        """
+        blob = bytearray()
+        entries = bytearray()
+        keys = postings.keys() if postings is not None else self._table.keys() | self._pending.keys()
+        for tri in sorted(keys):
+            offset = len(blob)
+            if postings is not None:
+                ids, count, last = postings[tri], 0, 0
+            else:
+                old_off, old_len, count, last = self._table.get(tri, (0, 0, 0, 0))
+                blob += self._blob[old_off:old_off + old_len]
+                ids = self._pending.get(tri, ())
+            for file_id in ids:
+                _encode_varint(file_id - last, blob)
+                last = file_id
+            count += len(ids)
+            if count:
+                entries += self._ENTRY.pack(tri, offset, count, last)
+        meta = json.dumps({"root": self.root, "files": self.files},
+                          separators=(',', ':')).encode('utf-8')
+
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(self._HEADER.pack(len(meta), len(entries) // self._ENTRY.size, len(blob)))
+            f.write(meta)
+            f.write(entries)
+            f.write(blob)
+        os.replace(tmp_path, self.index_path)
+        self._blob = bytes(blob)
+        self._table = self._parse_entries(bytes(entries), len(blob))
+        self._pending = {}
+
+    def _posting(self, trigram):
+        """Returns the decoded, sorted id list for one trigram."""
+        ids = []
+        slot = self._table.get(trigram)
+        if slot is not None:
+            offset, length, count, _ = slot
+            ids = _decode_postings(self._blob[offset:offset + length], count)
+        return ids + self._pending.get(trigram, [])
+
+    # --- Updates ---
+
+    def update(self):
+        """
+        Brings the index in sync with the folder, re-reading only new or changed files.
+        Returns a dict with 'added', 'removed', 'unchanged' and 'bytes_read' counts.
+        """
+        stats = {"added": 0, "removed": 0, "unchanged": 0, "bytes_read": 0}
+        seen = set()
+        index_file = os.path.abspath(self.index_path)
+
+        for path, st in iter_files(self.root):
+            if os.path.abspath(path) in (index_file, index_file + ".tmp"):
+                continue
+            rel = os.path.relpath(path, self.root)
+            seen.add(rel)
+            old_id = self._by_path.get(rel)
+            if old_id is not None:
+                entry = self.files[old_id]
+                if entry[1] == st.st_size and entry[2] == st.st_mtime_ns:
+                    stats["unchanged"] += 1
+                    COUNTERS.syscalls_avoided += 1 # Not re-read
+                    continue
+                self.files[old_id] = None # Retire the stale id
+
+            new_id = len(self.files)
+            indexed = 0
+            if st.st_size <= self.max_file_bytes:
+                try:
+                    with open(path, 'rb') as f:
+                        trigrams, size = _file_trigrams(f)
+                except OSError:
+                    self._by_path.pop(rel, None)
+                    continue
+                stats["bytes_read"] += size
+                COUNTERS.bytes_read += size
+                for tri in trigrams:
+                    self._pending.setdefault(tri, []).append(new_id)
+                indexed = 1
+            self.files.append([rel, st.st_size, st.st_mtime_ns, indexed])
+            self._by_path[rel] = new_id
+            stats["added"] += 1
+
+        for rel in list(self._by_path):
+            if rel not in seen:
+                self.files[self._by_path.pop(rel)] = None
+                stats["removed"] += 1
+
+        if stats["added"] or stats["removed"]:
+            live = len(self._by_path)
+            if len(self.files) - live > live:
+                self.save(self._compacted_postings())
+            else:
+                self.save()
+        return stats
+
+    def _compacted_postings(self):
+        """Drops retired ids, renumbers files and returns the fully decoded postings."""
+        remap = {}
+        new_files = []
+        for old_id, entry in enumerate(self.files):
+            if entry:
+                remap[old_id] = len(new_files)
+                new_files.append(entry)
+        postings = {}
+        for tri in self._table.keys() | self._pending.keys():
+            kept = [remap[i] for i in self._posting(tri) if i in remap]
+            if kept:
+                postings[tri] = kept
+        self.files = new_files
+        self._by_path = {entry[0]: i for i, entry in enumerate(self.files)}
+        return postings
+
+    # --- Queries ---
+
+    def _matching_ids(self, term):
+        """Returns the ids of indexed files containing every usable trigram of `term`, or None."""
+        needle = term.encode('utf-8').lower()
+        # Only pure-ASCII trigrams are safe: non-ASCII case folding differs between
+        # bytes.lower() (used when indexing) and str.lower() (used when confirming).
+        trigrams = {needle[i:i + 3] for i in range(len(needle) - 2)}
+        trigrams = [tri for tri in trigrams if max(tri) < 0x80]
+        if not trigrams:
+            return None
+        lists = sorted((self._posting(tri) for tri in trigrams), key=len)
+        matched = set(lists[0])
+        for ids in lists[1:]:
+            if not matched:
+                break
+            matched.intersection_update(ids)
+        return matched
+
+    def candidates(self, terms):
+        """
+        Returns the absolute paths of files that may contain `terms` (a string, or a list
+        meaning "any of these"). The result is a case-insensitive superset; terms without
+        a usable trigram cannot be narrowed and match every file.
+        """
+        if isinstance(terms, str):
+            terms = [terms]
+        live = [i for i, entry in enumerate(self.files) if entry]
+        matched = set()
+        for term in terms:
+            ids = self._matching_ids(term)
+            if ids is None:
+                matched = None
+                break
+            matched |= ids
+        if matched is not None:
+            total = len(live)
+            live = [i for i in live if i in matched or not self.files[i][3]]
+            COUNTERS.syscalls_avoided += total - len(live) # Files the search never opens
+        return [os.path.join(self.root, self.files[i][0]) for i in live]
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton: finds every occurrence of many literal patterns in a
+    single left-to-right pass over the text, independent of the pattern count.
+    """
+
+    def __init__(self, patterns, case_insensitive=False):
+        self.patterns = list(patterns)
+        self.case_insensitive = case_insensitive
+        goto = [{}]
+        outputs = [()]
+        for idx, pattern in enumerate(self.patterns):
+            key = pattern.lower() if case_insensitive else pattern
+            if not key:
+                continue
+            node = 0
+            for ch in key:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    outputs.append(())
+                node = nxt
+            outputs[node] += (idx,)
+
+        # Breadth-first pass to build failure links and merge outputs along them
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                outputs[child] += outputs[fail[child]]
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def search(self, text, first_only=False):
+        """Returns the sorted indexes of the patterns found in text (just one if first_only)."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        if self.case_insensitive:
+            text = text.lower()
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                if first_only:
+                    return [outputs[state][0]]
+                found.update(outputs[state])
+        return sorted(found)
+
+def load_patterns(pattern_file):
+    """Reads one pattern per line from a file, skipping blank lines and duplicates."""
+    patterns = []
+    seen = set()
+    with open(pattern_file, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            pattern = line.rstrip('\r\n')
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                patterns.append(pattern)
+    return patterns
+
+def build_line_matcher(patterns, mode="literal", case_insensitive=False, first_only=False):
+    """
+    Compiles patterns once and returns a function(line) -> list of patterns matched.
+    mode is 'literal' (one substring), 'regex' (one regular expression) or 'multi'
+    (any number of literal substrings matched in one Aho-Corasick pass).
+    Raises re.error for an invalid regular expression.
+    """
+    if mode == "regex":
+        regex = re.compile(patterns[0], re.IGNORECASE if case_insensitive else 0)
+        tag = [patterns[0]]
+        return lambda line: tag if regex.search(line) else []
+
+    if mode == "multi":
+        automaton = AhoCorasick(patterns, case_insensitive)
+        return lambda line: [automaton.patterns[i] for i in automaton.search(line, first_only)]
+
+    needle = patterns[0].lower() if case_insensitive else patterns[0]
+    tag = [patterns[0]]
+    if case_insensitive:
+        return lambda line: tag if needle in line.lower() else []
+    return lambda line: tag if needle in line else []
+
+def term_fetch(search_dir, term, case_insensitive=False, index=None, mode="literal",
+               max_count=0, files_only=False):
+    """
+    Yields (path, line_number, line, matched_patterns) for every matching line.
+    `term` is a single string for 'literal'/'regex' mode, or a list of patterns for 'multi'.
+    max_count stops reading a file after that many matching lines; files_only stops
+    after the first. When a TrigramIndex is given, only its candidate files are opened
+    (regex searches cannot be narrowed and still read every indexed file).
+    """
+    patterns = [term] if isinstance(term, str) else list(term)
+    matcher = build_line_matcher(patterns, mode, case_insensitive, first_only=files_only)
+    if files_only:
+        max_count = 1
+
+    if index is not None:
+        paths = index.candidates([""] if mode == "regex" else patterns)
+    else:
+        paths = (path for path, _ in iter_files(search_dir))
+
+    for file_path in paths:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                hits = 0
+                for i, line in enumerate(f):
+                    matched = matcher(line)
+                    if matched:
+                        yield file_path, i + 1, line, matched
+                        hits += 1
+                        if hits == max_count:
+                            break
+                COUNTERS.bytes_read += f.buffer.tell()
+        except Exception as e:
+            out_error(f"Could not read {file_path}: {e}")
+
+def start_term_fetcher():
+    out_header("Term/Phase Fetcher (grep)")
+    
+    mode_input = input("Search mode: (l)iteral text, (r)egex, or (m)ulti-pattern file? (default: l): ").lower()
+    mode = {"r": "regex", "m": "multi"}.get(mode_input, "literal")
+    if mode == "regex":
+        search_term = input("Enter the regular expression to search for: ")
+    elif mode == "multi":
+        search_term = input("Enter the path to the pattern file (one pattern per line): ")
+    else:
+        search_term = input("Enter the word or phrase to search for: ")
+    search_dir = input("Enter directory to search in (default: current directory): ")
+    case_insensitive = input("Make search case-insensitive? (y/n): ").lower()
+    files_only = input("Only list the files that contain a match? (y/n): ").lower()
+    max_count_input = input("Stop after how many matches per file? (default: no limit): ")
+    use_index = input("Use the persistent search index for faster repeat searches? (y/n): ").lower()
+    
+    if not search_term:
+        out_error("No search term provided. Aborting.")
+        wait_script(2)
+        return
+        
+    if not search_dir:
+        search_dir = "."
+        out_info("Using current directory for search.")
+        
+    if not os.path.isdir(search_dir):
+        out_error(f"Directory '{search_dir}' does not exist. Aborting.")
+        wait_script(2)
+        return
+
+    try:
+        max_count = int(max_count_input) if max_count_input else 0
+        if max_count < 0:
+            raise ValueError
+    except ValueError:
+        out_error("Invalid input. Match count must be a non-negative number. Aborting.")
+        wait_script(2)
+        return
+
+    patterns = search_term
+    if mode == "multi":
+        try:
+            patterns = load_patterns(search_term)
+        except OSError as e:
+            out_error(f"Could not read pattern file '{search_term}': {e}")
+            wait_script(2)
+            return
+        if not patterns:
+            out_error(f"Pattern file '{search_term}' contains no patterns. Aborting.")
+            wait_script(2)
+            return
+        out_info(f"Loaded {len(patterns)} patterns from '{search_term}'.")
+    elif mode == "regex":
+        try:
+            re.compile(search_term)
+        except re.error as e:
+            out_error(f"Invalid regular expression: {e}")
+            wait_script(2)
+            return
+        
+    if case_insensitive == 'y':
+        out_info("Running case-insensitive search...")
+    else:
+        out_info("Running case-sensitive search...")
+
+    index = None
+    if use_index == 'y':
+        index = TrigramIndex(search_dir)
+        if not index.load():
+            out_info("No index found for this folder. Building it now (first run only)...")
+        try:
+            stats = index.update()
+            out_info(f"Index up to date: {stats['added']} files (re)indexed, "
+                     f"{stats['removed']} removed, {stats['unchanged']} unchanged.")
+        except OSError as e:
+            out_error(f"Could not update the search index: {e}. Searching without it.")
+            index = None
+        
+    out_info(f"Searching for '{search_term}' in '{search_dir}'...")
+    out_separator()
+    
+    matches_found = 0
+    results = term_fetch(search_dir, patterns, case_insensitive == 'y', index, mode,
+                         max_count, files_only == 'y')
+    
+    with OUTPUT.batch():
+        for file_path, line_no, line, matched in results:
+            matches_found += 1
+            if files_only == 'y':
+                out_item(f"{Fore.GREEN}{file_path}", path=file_path)
+                continue
+            pattern_line = f"{Fore.MAGENTA}Pattern: {', '.join(matched)}\n" if mode == "multi" else ""
+            out_item(f"{Fore.CYAN}--- Match Found ---\n{Fore.GREEN}Path: {file_path}\n{pattern_line}"
+                     f"{Fore.YELLOW}Line {line_no}:{Fore.RESET} {line.strip()}\n",
+                     path=file_path, line=line_no, content=line.rstrip("\r\n"), patterns=matched)
+                
+    out_separator()
+    if matches_found > 0:
+        if files_only == 'y':
+            out_success(f"Search complete. Found matches in {matches_found} files.")
+        else:
+            out_success(f"Search complete. Found {matches_found} matches.")
+    else:
+        out_info(f"Search complete. No matches found for '{search_term}'.")
+        
+    suspend_script()
+
+# --- 11. Network Diagnostic Tool ---
+
+def read_linux_gateway(route_file="/proc/net/route"):
+    """Returns the IPv4 default gateway from the kernel routing table, or None."""
+    import socket
+    try:
+        with open(route_file, 'r', encoding='ascii') as f:
+            next(f, None) # Skip the column header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 4 or fields[1] != "00000000":
+                    continue
+                if int(fields[3], 16) & 0x2: # RTF_GATEWAY
+                    return socket.inet_ntoa(struct.pack('<I', int(fields[2], 16)))
+    except (OSError, ValueError):
+        pass
+    return None
+
+async def _run_command(*cmd):
+    """Runs a command without a shell and returns (returncode, stdout). Kills it if cancelled."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    try:
+        stdout, _ = await proc.communicate()
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+        raise
+    return proc.returncode, stdout.decode(errors='ignore')
+
+async def discover_gateway():
+    """Finds the default gateway natively on Linux, or via the route command elsewhere."""
+    if sys.platform.startswith('linux'):
+        return read_linux_gateway()
+    if os.name == 'nt':
+        _, output = await _run_command('route', 'print', '0.0.0.0')
+        match = re.search(r'0\.0\.0\.0\s+0\.0\.0\.0\s+([\d\.]+)\s+', output)
+    else:
+        _, output = await _run_command('route', '-n', 'get', 'default')
+        match = re.search(r'gateway:\s*([\d\.]+)', output)
+    return match.group(1) if match else None
+
+async def probe_ping(host, timeout):
+    """Sends one ICMP echo using the system ping command. Returns latency in ms."""
+    start = time.perf_counter()
+    if os.name == 'nt':
+        cmd = ('ping', '-n', '1', '-w', str(int(timeout * 1000)), host)
+    else:
+        cmd = ('ping', '-c', '1', '-W', str(max(1, int(timeout))), host)
+    returncode, _ = await _run_command(*cmd)
+    if returncode != 0:
+        raise ConnectionError("no echo reply")
+    return (time.perf_counter() - start) * 1000
+
+async def probe_tcp(host, port, timeout):
+    """
+    Opens (and closes) a TCP connection. Returns latency in ms.
+    A refused connection still proves the host answered, so it counts as reachable.
+    """
+
+    async def connect():
+        return await asyncio.open_connection(await connect_address(host, timeout), port)
+
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(connect(), timeout)
+    except ConnectionRefusedError:
+        return (time.perf_counter() - start) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return (time.perf_counter() - start) * 1000
+
+async def probe_udp(host, port, timeout, payload=b"\x00"):
+    """
+    Sends one datagram and waits for any reply or ICMP port-unreachable.
+    Returns latency in ms. Needs no privileges, unlike ICMP echo.
+    """
+    class UDPProbeProtocol(asyncio.DatagramProtocol):
+        def datagram_received(self, data, addr):
+            if not done.done():
+                done.set_result(True)
+
+        def error_received(self, exc):
+            # ICMP port-unreachable surfaces as ConnectionRefusedError: the host answered.
+            if not done.done():
+                if isinstance(exc, ConnectionRefusedError):
+                    done.set_result(True)
+                else:
+                    done.set_exception(exc)
+
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    start = time.perf_counter()
+    address = await asyncio.wait_for(connect_address(host, timeout), timeout)
+    transport, _ = await loop.create_datagram_endpoint(
+        UDPProbeProtocol, remote_addr=(address, port))
+    try:
+        transport.sendto(payload)
+        await asyncio.wait_for(done, timeout)
+    finally:
+        transport.close()
+    return (time.perf_counter() - start) * 1000
+
+async def probe_host(host, method="ping", port=53, timeout=NET_PROBE_TIMEOUT):
+    """Probes a host with 'ping', 'tcp' or 'udp'. Returns latency in ms or raises."""
+    try:
+        if method == "tcp":
+            latency = await probe_tcp(host, port, timeout)
+        elif method == "udp":
+            # A minimal DNS query, so DNS servers on the target reply instead of ignoring it
+            query = b"\x12\x34\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01"
+            latency = await probe_udp(host, port, timeout, query)
+        else:
+            latency = await asyncio.wait_for(probe_ping(host, timeout), timeout + 1)
+    except Exception:
+        COUNTERS.net_request(method)
+        raise
+    COUNTERS.net_request(method, latency)
+    return latency
+
+async def resolve_host(domain, timeout=NET_PROBE_TIMEOUT):
+    """
+    Resolves a name without blocking the event loop. Returns (canonical_name, [ips]).
+    getaddrinfo() runs on its own daemon thread rather than the loop's default executor:
+    asyncio.run() joins that executor on exit, so a hung resolver would hold the caller
+    past any deadline, while an abandoned daemon thread holds nothing.
+    """
+    import socket
+    loop = asyncio.get_running_loop()
+    answer = loop.create_future()
+
+    def deliver(result, error):
+        if not answer.done():
+            if error is not None:
+                answer.set_exception(error)
+            else:
+                answer.set_result(result)
+
+    def lookup():
+        try:
+            result, error = socket.getaddrinfo(domain, None, type=socket.SOCK_STREAM,
+                                               flags=socket.AI_CANONNAME), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(deliver, result, error)
+        except RuntimeError:
+            pass # The loop is already closed; nobody is waiting any more
+
+    start = time.perf_counter()
+    threading.Thread(target=lookup, name="toolkit-resolve", daemon=True).start()
+    try:
+        infos = await asyncio.wait_for(answer, timeout)
+    except Exception:
+        COUNTERS.net_request("dns")
+        raise
+    COUNTERS.net_request("dns", (time.perf_counter() - start) * 1000)
+    name = next((info[3] for info in infos if info[3]), domain)
+    ips = list(dict.fromkeys(info[4][0] for info in infos))
+    return name, ips
+
+async def connect_address(host, timeout=NET_PROBE_TIMEOUT):
+    """Returns host if it is an IP address, else its first address from resolve_host()."""
+    import ipaddress
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    _, ips = await resolve_host(host, timeout)
+    if not ips:
+        raise LookupError(f"no address for '{host}'")
+    return ips[0]
+
+async def _timed_check(name, target, coro):
+    """Awaits one check and turns its outcome into a result dict."""
+    result = {"check": name, "target": target, "passed": False, "latency_ms": None, "detail": ""}
+    try:
+        result.update(await coro)
+        result["passed"] = True
+    except asyncio.TimeoutError:
+        result["detail"] = "timed out"
+    except Exception as e:
+        result["detail"] = str(e) or e.__class__.__name__
+    return result
+
+async def _probe_check(host, method, port, timeout):
+    return {"latency_ms": await probe_host(host, method, port, timeout)}
+
+async def _gateway_check(gateway, method, port, timeout):
+    gateway = gateway or await discover_gateway()
+    if not gateway:
+        raise LookupError("could not determine gateway IP")
+    return {"target": gateway, "latency_ms": await probe_host(gateway, method, port, timeout)}
+
+async def _dns_check(domain, timeout, cache=None):
+    start = time.perf_counter()
+    hit = cache.get(domain) if cache is not None else None
+    if hit is not None:
+        COUNTERS.syscalls_avoided += 1 # Answered without a lookup
+        return {"latency_ms": (time.perf_counter() - start) * 1000,
+                "detail": f"{domain} -> {hit[0]} (cached, {int(hit[1])}s left)"}
+    name, ips = await resolve_host(domain, timeout)
+    if cache is not None and ips:
+        cache.put(domain, sorted(ips), DNS_DEFAULT_TTL)
+    return {"latency_ms": (time.perf_counter() - start) * 1000, "detail": f"{name} -> {ips}"}
+
+async def network_checks(domain, method="ping", deadline=NET_DIAG_DEADLINE, gateway=None,
+                         public_host=NET_PUBLIC_HOST, port=53, cache=None):
+    """
+    Runs the gateway, internet and DNS checks concurrently under one overall deadline.
+    The DNS check is answered from `cache` (DNS_CACHE when None; pass False for
+    none) while its entry is live, so repeated diagnostics don't query the resolver.
+    Returns a list of result dicts (check, target, passed, latency_ms, detail).
+    """
+    timeout = min(NET_PROBE_TIMEOUT, deadline)
+    checks = [
+        ("Gateway", gateway or "auto", _gateway_check(gateway, method, port, timeout)),
+        ("Internet", public_host, _probe_check(public_host, method, port, timeout)),
+        ("DNS", domain, _dns_check(domain, timeout, DNS_CACHE if cache is None else cache or None)),
+    ]
+    tasks = [asyncio.ensure_future(_timed_check(*check)) for check in checks]
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    results = []
+    for (name, target, _), task in zip(checks, tasks):
+        if task in done:
+            results.append(task.result())
+        else:
+            results.append({"check": name, "target": target, "passed": False,
+                            "latency_ms": None, "detail": f"exceeded {deadline}s deadline"})
+    return results
+
+def run_network_diagnostics(domain, method="ping", deadline=NET_DIAG_DEADLINE, **kwargs):
+    """Synchronous wrapper around network_checks()."""
+    return asyncio.run(network_checks(domain, method, deadline, **kwargs))
+
+# --- Fleet reachability sweep ---
+
+SWEEP_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+def parse_sweep_targets(spec, default_ports=(80, 443)):
+    """
+    Expands a target spec into a list of (host, port) pairs. Items are separated by
+    commas or whitespace and may be 'host', 'host:port', '[v6addr]:port', or a CIDR
+    range like '10.0.0.0/24' or '10.0.0.0/24:22'. '@path' reads items from a file.
+    Raises ValueError for an invalid item, or when the spec expands to more than
+    SWEEP_MAX_TARGETS pairs (checked before any range is expanded).
+    """
+    import ipaddress
+    items = []
+    for item in re.split(r'[,\s]+', spec.strip()):
+        if item.startswith('@'):
+            with open(item[1:], 'r', encoding='utf-8') as f:
+                items.extend(line.split('#')[0].strip() for line in f)
+        elif item:
+            items.append(item)
+
+    targets = []
+    for item in filter(None, items):
+        host, ports = item, list(default_ports)
+        match = re.fullmatch(r'\[([^\]]+)\](?::(\d+))?', item) or re.fullmatch(r'([^:]+):(\d+)', item)
+        if match:
+            host = match.group(1)
+            if match.group(2):
+                ports = [int(match.group(2))]
+        for port in ports:
+            if not 0 < port < 65536:
+                raise ValueError(f"invalid port in '{item}'")
+        network = ipaddress.ip_network(host, strict=False) if '/' in host else None
+        if len(targets) + (network.num_addresses if network else 1) * len(ports) > SWEEP_MAX_TARGETS:
+            raise ValueError(f"more than {SWEEP_MAX_TARGETS} targets at '{item}'; sweep smaller ranges")
+        if network:
+            hosts = list(network.hosts()) or [network.network_address]
+            targets.extend((str(addr), port) for addr in hosts for port in ports)
+        else:
+            targets.extend((host, port) for port in ports)
+    return list(dict.fromkeys(targets))
+
+async def tcp_connect(address, port, timeout):
+    """
+    Returns (status, latency_ms): status is 'open', 'closed' (refused), 'timeout' or
+    'error'. `address` should be an IP address (see resolve_targets()), so only the
+    connection itself is timed.
+    """
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout)
+    except ConnectionRefusedError:
+        latency = (time.perf_counter() - start) * 1000
+        COUNTERS.net_request("tcp", latency)
+        return "closed", latency
+    except asyncio.TimeoutError:
+        COUNTERS.net_request("tcp")
+        return "timeout", None
+    except OSError:
+        COUNTERS.net_request("tcp")
+        return "error", None
+    latency = (time.perf_counter() - start) * 1000
+    COUNTERS.net_request("tcp", latency)
+    writer.close()
+    return "open", latency
+
+async def resolve_targets(hosts, concurrency=SWEEP_CONCURRENCY, timeout=SWEEP_TIMEOUT):
+    """
+    Resolves each distinct host once, at most `concurrency` at a time. Returns
+    {host: (address, None)} on success and {host: (None, error)} on failure; IP
+    addresses map to themselves without a lookup.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def resolve(host):
+        async with sem:
+            try:
+                return host, (await asyncio.wait_for(connect_address(host, timeout), timeout), None)
+            except asyncio.TimeoutError:
+                return host, (None, "name lookup timed out")
+            except (OSError, LookupError, ValueError) as e: # ValueError: names IDNA can't encode
+                return host, (None, str(e) or e.__class__.__name__)
+
+    return dict(await asyncio.gather(*(resolve(host) for host in dict.fromkeys(hosts))))
+
+def summarize_latencies(samples):
+    """Returns min/p50/p95/p99/max (nearest-rank, in ms) and a bucket histogram for samples."""
+    summary = {"min_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    histogram = [0] * (len(SWEEP_BUCKETS_MS) + 1)
+    for value in samples:
+        histogram[bisect.bisect_left(SWEEP_BUCKETS_MS, value)] += 1
+    if samples:
+        ordered = sorted(samples)
+        for key, pct in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+            rank = max(1, math.ceil(pct / 100 * len(ordered)))
+            summary[key] = round(ordered[rank - 1], 3)
+        summary["min_ms"] = round(ordered[0], 3)
+        summary["max_ms"] = round(ordered[-1], 3)
+    summary["histogram"] = histogram
+    return summary
+
+async def sweep_reachability(targets, count=3, concurrency=SWEEP_CONCURRENCY, timeout=SWEEP_TIMEOUT):
+    """
+    Sends `count` TCP-connect probes to every (host, port) target, with at most
+    `concurrency` connections in flight. Host names are resolved once, before any
+    probe, so lookups are neither repeated nor timed as connect latency; a target
+    whose name doesn't resolve counts every probe as an error and gets its reason in
+    'resolve_error'. Returns one summary dict per target.
+    """
+    resolved = await resolve_targets([host for host, _ in targets], concurrency, timeout)
+    sem = asyncio.Semaphore(concurrency)
+    states = {target: {"open": 0, "closed": 0, "timeout": 0, "error": 0, "samples": []}
+              for target in targets}
+    running = set()
+
+    async def probe(target):
+        status, latency = await tcp_connect(resolved[target[0]][0], target[1], timeout)
+        state = states[target]
+        state[status] += 1
+        if latency is not None:
+            state["samples"].append(latency)
+
+    def finished(task):
+        running.discard(task)
+        sem.release()
+
+    # Acquire before creating each task so only `concurrency` probes exist at a time
+    for _ in range(count):
+        for target in targets:
+            if resolved[target[0]][0] is None:
+                states[target]["error"] += 1
+                continue
+            await sem.acquire()
+            task = asyncio.ensure_future(probe(target))
+            running.add(task)
+            task.add_done_callback(finished)
+    if running:
+        await asyncio.wait(set(running))
+
+    results = []
+    for (host, port), state in states.items():
+        address, resolve_error = resolved[host]
+        row = {"host": host, "address": address, "port": port, "sent": count}
+        row.update({key: state[key] for key in ("open", "closed", "timeout", "error")})
+        row["resolve_error"] = resolve_error
+        row.update(summarize_latencies(state.pop("samples")))
+        results.append(row)
+    return results
+
+def run_reachability_sweep(targets, count=3, concurrency=SWEEP_CONCURRENCY, timeout=SWEEP_TIMEOUT):
+    """Synchronous wrapper around sweep_reachability(). Keeps concurrency under the fd limit."""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != resource.RLIM_INFINITY:
+            concurrency = max(1, min(concurrency, soft - 64))
+    except (ImportError, ValueError, OSError):
+        pass
+    return asyncio.run(sweep_reachability(targets, count, concurrency, timeout))
+
+def export_sweep_results(results, path):
+    """Writes sweep results as JSON or CSV, chosen by the file extension."""
+    import csv
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            labels = [f"lt_{b}ms" for b in SWEEP_BUCKETS_MS] + [f"ge_{SWEEP_BUCKETS_MS[-1]}ms"]
+            fields = [k for k in results[0] if k != "histogram"] if results else []
+            writer = csv.writer(f)
+            writer.writerow(fields + labels)
+            for row in results:
+                writer.writerow([row[k] for k in fields] + row["histogram"])
+        else:
+            json.dump({"buckets_ms": SWEEP_BUCKETS_MS, "results": results}, f, indent=2)
+
+def show_sweep_results(results, stream=None):
+    """
+    Prints reachable targets with percentiles and a histogram sparkline to `stream`
+    (default: sys.stdout), plus totals and names that did not resolve as messages.
+    """
+    def ms(value):
+        return f"{value:.1f}" if value is not None else "-"
+
+    print(f"{'Target':<28} {'ok/sent':>7} {'p50':>7} {'p95':>7} {'p99':>7}  Histogram (<1ms .. >=1s)", file=stream)
+    print("-" * 80, file=stream)
+    unreachable = 0
+    for row in results:
+        answered = row["open"] + row["closed"]
+        if not answered:
+            unreachable += 1
+            continue
+        state = "" if row["open"] else " closed"
+        target = f"{row['host']}:{row['port']}{state}"
+        print(f"{target:<28} {row['open']:>3}/{row['sent']:<3} {ms(row['p50_ms']):>7} "
+              f"{ms(row['p95_ms']):>7} {ms(row['p99_ms']):>7}  {sparkline(row['histogram'], floor=0)}", file=stream)
+    out_separator()
+    unresolved = {row["host"]: row["resolve_error"] for row in results if row["resolve_error"]}
+    for host, error in unresolved.items():
+        out_error(f"Could not resolve {host}: {error}")
+    out_info(f"{len(results) - unreachable} of {len(results)} targets answered; "
+             f"{unreachable} timed out or errored.")
+
+# --- DNS resolver benchmark ---
+
+class DNSCache:
+    """An in-process name -> answer cache that honours each answer's TTL."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._entries = {}
+
+    def get(self, name):
+        """Returns (ips, seconds_left) for a live entry, or None."""
+        entry = self._entries.get(name.lower())
+        if entry is None:
+            return None
+        expires, ips = entry
+        left = expires - self._clock()
+        if left <= 0:
+            del self._entries[name.lower()]
+            return None
+        return ips, left
+
+    def put(self, name, ips, ttl):
+        if ttl > 0:
+            self._entries[name.lower()] = (self._clock() + ttl, ips)
+
+    def clear(self):
+        self._entries.clear()
+
+# Shared by every diagnostic run in this session
+DNS_CACHE = DNSCache()
+
+def system_nameservers(resolv_conf="/etc/resolv.conf"):
+    """Returns the nameserver addresses from resolv.conf (empty where there is none)."""
+    servers = []
+    try:
+        with open(resolv_conf, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == "nameserver":
+                    servers.append(fields[1])
+    except OSError:
+        pass
+    return servers
+
+def build_dns_query(name, qtype=1, query_id=None):
+    """Builds a recursive DNS query packet (qtype 1 = A, 28 = AAAA). Returns (id, packet)."""
+    if query_id is None:
+        import random
+        query_id = random.getrandbits(16)
+    packet = bytearray(struct.pack('>HHHHHH', query_id, 0x0100, 1, 0, 0, 0))
+    for label in name.rstrip('.').split('.'):
+        encoded = label.encode('idna')
+        if not 0 < len(encoded) < 64:
+            raise ValueError(f"invalid DNS name '{name}'")
+        packet.append(len(encoded))
+        packet += encoded
+    packet += b"\x00" + struct.pack('>HH', qtype, 1)
+    return query_id, bytes(packet)
+
+def _skip_dns_name(data, pos):
+    """Returns the offset just past a (possibly compressed) name in a DNS message."""
+    while True:
+        length = data[pos]
+        if length == 0:
+            return pos + 1
+        if length & 0xC0 == 0xC0:
+            return pos + 2
+        pos += 1 + length
+
+def parse_dns_response(data, query_id):
+    """
+    Parses a DNS response. Returns (rcode, [ips], min_ttl).
+    Raises ValueError for a malformed or mismatched packet.
+    """
+    import socket
+    try:
+        resp_id, flags, qdcount, ancount = struct.unpack_from('>HHHH', data, 0)
+        if resp_id != query_id or not flags & 0x8000:
+            raise ValueError("response does not match the query")
+        pos = 12
+        for _ in range(qdcount):
+            pos = _skip_dns_name(data, pos) + 4
+        ips, ttls = [], []
+        for _ in range(ancount):
+            pos = _skip_dns_name(data, pos)
+            rtype, _, ttl, rdlen = struct.unpack_from('>HHIH', data, pos)
+            pos += 10
+            rdata = data[pos:pos + rdlen]
+            pos += rdlen
+            ttls.append(ttl)
+            if rtype == 1 and rdlen == 4:
+                ips.append(socket.inet_ntop(socket.AF_INET, rdata))
+            elif rtype == 28 and rdlen == 16:
+                ips.append(socket.inet_ntop(socket.AF_INET6, rdata))
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"malformed DNS response: {e}")
+    return flags & 0x000F, ips, min(ttls) if ttls else 0
+
+async def dns_query(name, server, port=53, timeout=DNS_TIMEOUT, qtype=1):
+    """Sends one DNS query over UDP. Returns (latency_ms, [ips], ttl); raises on failure."""
+    class DNSQueryProtocol(asyncio.DatagramProtocol):
+        def datagram_received(self, data, addr):
+            if not done.done() and data[:2] == struct.pack('>H', query_id):
+                done.set_result(data)
+
+        def error_received(self, exc):
+            if not done.done():
+                done.set_exception(exc)
+
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    query_id, packet = build_dns_query(name, qtype)
+    start = time.perf_counter()
+    address = await asyncio.wait_for(connect_address(server, timeout), timeout)
+    transport, _ = await loop.create_datagram_endpoint(
+        DNSQueryProtocol, remote_addr=(address, port))
+    try:
+        transport.sendto(packet)
+        data = await asyncio.wait_for(done, timeout)
+    except Exception:
+        COUNTERS.net_request("dns")
+        raise
+    finally:
+        transport.close()
+    latency = (time.perf_counter() - start) * 1000
+    COUNTERS.net_request("dns", latency)
+    rcode, ips, ttl = parse_dns_response(data, query_id)
+    if rcode == 3:
+        raise LookupError("NXDOMAIN")
+    if rcode != 0:
+        raise LookupError(f"server returned rcode {rcode}")
+    return latency, sorted(ips), ttl
+
+async def _system_query(name, timeout):
+    """Resolves through the OS resolver (no TTL available, so DNS_DEFAULT_TTL is used)."""
+    start = time.perf_counter()
+    _, ips = await resolve_host(name, timeout)
+    return (time.perf_counter() - start) * 1000, sorted(ips), DNS_DEFAULT_TTL
+
+async def benchmark_names(names, repeats=5, server=None, port=53, cache=DNS_CACHE,
+                          concurrency=DNS_CONCURRENCY, timeout=DNS_TIMEOUT):
+    """
+    Resolves every name `repeats` times; names run in parallel, repeats in sequence.
+    The first lookup is the cold sample, the rest are warm samples. Names with a
+    live cache entry are answered from `cache` without touching the resolver.
+    Returns one result dict per name.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(name):
+        result = {"name": name, "server": server or "system", "cached": False, "cold_ms": None,
+                  "warm": {}, "answers": [], "ttl": None, "errors": [], "flags": []}
+        hit = cache.get(name) if cache is not None else None
+        if hit is not None:
+            COUNTERS.syscalls_avoided += 1 # Answered without a lookup
+            result.update(cached=True, answers=hit[0], ttl=int(hit[1]))
+            return result
+
+        answer_sets, warm = [], []
+        async with sem:
+            for attempt in range(repeats):
+                try:
+                    if server:
+                        latency, ips, ttl = await dns_query(name, server, port, timeout)
+                    else:
+                        latency, ips, ttl = await _system_query(name, timeout)
+                except (asyncio.TimeoutError, OSError, LookupError, ValueError) as e:
+                    result["errors"].append(str(e) or e.__class__.__name__)
+                    answer_sets.append(None)
+                    continue
+                if attempt == 0:
+                    result["cold_ms"] = round(latency, 3)
+                else:
+                    warm.append(latency)
+                answer_sets.append(tuple(ips))
+                result["answers"], result["ttl"] = ips, ttl
+
+        result["warm"] = {k: v for k, v in summarize_latencies(warm).items() if k != "histogram"}
+        answered = set(filter(None, answer_sets))
+        if len(answered) < len(set(answer_sets)) and answered:
+            result["flags"].append("INCONSISTENT") # Answered some attempts, failed or came back empty on others
+        elif len(answered) > 1:
+            # Round-robin or CDN answers: every address seen is valid, so keep them all
+            result["flags"].append("ROTATING")
+            result["answers"] = sorted(set().union(*answered))
+        slowest = result["warm"]["p50_ms"] or result["cold_ms"] or 0
+        if (result["cold_ms"] or 0) > DNS_SLOW_MS * 5 or slowest > DNS_SLOW_MS:
+            result["flags"].append("SLOW")
+        if result["errors"]:
+            result["flags"].append("ERRORS")
+        if cache is not None and result["answers"]:
+            cache.put(name, result["answers"], result["ttl"])
+        return result
+
+    return await asyncio.gather(*(one(name) for name in names))
+
+def run_dns_benchmark(names, repeats=5, server=None, **kwargs):
+    """Synchronous wrapper around benchmark_names()."""
+    return asyncio.run(benchmark_names(names, repeats, server, **kwargs))
+
+def show_dns_results(results, stream=None):
+    """
+    Prints one line per name with cold/warm latency, TTL, answers and flags to `stream`
+    (default: sys.stdout); names with problem flags are reported as errors.
+    """
+    def ms(value):
+        return f"{value:.1f}" if value is not None else "-"
+
+    print(f"{'Name':<30} {'cold':>7} {'warm50':>7} {'warm95':>7} {'TTL':>6}  Answers / Flags", file=stream)
+    print("-" * 80, file=stream)
+    for row in results:
+        if row["cached"]:
+            print(f"{row['name']:<30} {'cached':>7} {'':>7} {'':>7} {row['ttl']:>6}  {', '.join(row['answers'])}", file=stream)
+            continue
+        ttl = row["ttl"] if row["ttl"] is not None else "-"
+        answers = ", ".join(row["answers"]) or "; ".join(dict.fromkeys(row["errors"]))
+        line = (f"{row['name']:<30} {ms(row['cold_ms']):>7} {ms(row['warm']['p50_ms']):>7} "
+                f"{ms(row['warm']['p95_ms']):>7} {ttl:>6}  {answers}")
+        if set(row["flags"]) - {"ROTATING"}:
+            out_error(f"{line}  [{' '.join(row['flags'])}]")
+        elif row["flags"]:
+            print(f"{line}  [ROTATING]", file=stream)
+        else:
+            print(line, file=stream)
+
+def parse_name_list(spec):
+    """
+    Expands a comma/space-separated list of names, where '@file' reads one name per
+    line ('#' starts a comment), into a list without duplicates.
+    """
+    names = []
+    for item in re.split(r'[,\s]+', spec.strip()):
+        if item.startswith('@'):
+            with open(item[1:], 'r', encoding='utf-8') as f:
+                names.extend(line.split('#')[0].strip() for line in f)
+        elif item:
+            names.append(item)
+    return list(dict.fromkeys(filter(None, names)))
+
+def start_reachability_sweep():
+    out_info("Sweep mode: concurrent TCP-connect probes against many hosts/ports.")
+    spec = input("Enter targets (host, host:port or CIDR like 10.0.0.0/24; comma-separated, or @file): ")
+    ports_input = input("Ports for targets without one (default: 80,443): ")
+    count_input = input("Probes per target (default: 3): ")
+    export_path = input("Export results to a .json or .csv file (blank to skip): ")
+
+    try:
+        ports = [int(p) for p in re.split(r'[,\s]+', ports_input.strip()) if p] or [80, 443]
+        count = int(count_input) if count_input else 3
+        if count <= 0:
+            raise ValueError("probes per target must be a positive number")
+        targets = parse_sweep_targets(spec, ports)
+    except (ValueError, OSError) as e:
+        out_error(f"Invalid sweep input: {e}. Aborting.")
+        wait_script(2)
+        return
+
+    if not targets:
+        out_error("No targets given. Aborting.")
+        wait_script(2)
+        return
+
+    out_info(f"Probing {len(targets)} targets x {count} "
+             f"(up to {SWEEP_CONCURRENCY} at once, {SWEEP_TIMEOUT}s timeout each)...")
+    out_separator()
+    start = time.perf_counter()
+    results = run_reachability_sweep(targets, count)
+    elapsed = time.perf_counter() - start
+
+    show_sweep_results(results)
+    out_info(f"Sweep finished in {elapsed:.2f}s.")
+    if export_path:
+        try:
+            export_sweep_results(results, export_path)
+            out_success(f"Results exported to '{export_path}'.")
+        except OSError as e:
+            out_error(f"Could not export results: {e}")
+
+    suspend_script()
+
+def start_dns_benchmark():
+    out_info("DNS mode: parallel lookups with cold/warm latency and a TTL-aware cache.")
+    spec = input("Enter names to resolve (comma-separated, or @file): ")
+    repeats_input = input("Lookups per name (default: 5): ")
+    servers = system_nameservers()
+    default_server = servers[0] if servers else "system resolver"
+    server = input(f"DNS server to query (default: {default_server}): ").strip() or (servers[0] if servers else None)
+    fresh = input("Ignore cached answers from earlier runs? (y/n): ").lower()
+
+    try:
+        names = parse_name_list(spec)
+        repeats = int(repeats_input) if repeats_input else 5
+        if repeats <= 0:
+            raise ValueError("lookups per name must be a positive number")
+    except (ValueError, OSError) as e:
+        out_error(f"Invalid input: {e}. Aborting.")
+        wait_script(2)
+        return
+
+    if not names:
+        out_error("No names given. Aborting.")
+        wait_script(2)
+        return
+
+    if fresh == 'y':
+        DNS_CACHE.clear()
+    out_info(f"Resolving {len(names)} names x {repeats} via {server or 'the system resolver'}...")
+    out_separator()
+    results = run_dns_benchmark(names, repeats, server)
+    show_dns_results(results)
+    out_separator()
+    flagged = sum(1 for row in results if row["flags"])
+    cached = sum(1 for row in results if row["cached"])
+    out_info(f"{len(results)} names: {cached} answered from cache, {flagged} flagged "
+             f"(slow = warm p50 over {DNS_SLOW_MS} ms).")
+    suspend_script()
+
+def start_network_diagnostics():
+    out_header("Network Diagnostic Tool")
+    
+    mode = input("Mode: (d)iagnose connectivity, (s)weep many hosts/ports, or (n)ame-resolution benchmark? (default: d): ").lower()
+    if mode == 's':
+        start_reachability_sweep()
+        return
+    if mode == 'n':
+        start_dns_benchmark()
+        return
+
+    domain = input("Enter a domain to test (default: google.com): ")
+    if not domain:
+        domain = "google.com"
+    method_input = input("Probe with (p)ing, (t)cp-connect or (u)dp? (default: p): ").lower()
+    method = {"t": "tcp", "u": "udp"}.get(method_input, "ping")
+        
+    out_info(f"Running 3 network checks concurrently ({method}, {NET_DIAG_DEADLINE}s deadline)...")
+    out_separator()
+    
+    results = run_network_diagnostics(domain, method)
+    
+    for step, result in enumerate(results, 1):
+        latency = f"{result['latency_ms']:.1f} ms" if result["latency_ms"] is not None else "-"
+        out_info(f"Step {step}/3: {result['check']} ({result['target']})")
+        if result["passed"]:
+            out_success(f"  [PASS] {result['check']} check passed in {latency}.")
+            if result["detail"]:
+                print(f"  {result['detail']}")
+        else:
+            out_error(f"  [FAIL] {result['check']} check failed: {result['detail']}")
+        
+    # --- Final Report ---
+    out_separator()
+    if all(result["passed"] for result in results):
+        out_success("All network checks passed. Connectivity is good! 🚀")
+    else:
+        out_error("One or more network checks failed. Please review.")
+        
+    suspend_script()
+
+# --- 12. System Health Dashboard ---
+
+def human_bytes(value):
+    """Formats a byte count as a short human-readable string (e.g. '12.3 MB')."""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(value) < 1024 or unit == "TB":
+            return f"{value:.1f} {unit}" if unit != "B" else f"{value:.0f} B"
+        value /= 1024
+
+class RingBuffer:
+    """A fixed-size time series of floats backed by array('d'); memory never grows."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def __len__(self):
+        return self._count
+
+    def values(self, last=None):
+        """Returns the stored values oldest-first (only the newest `last` if given)."""
+        if self._count < self.capacity:
+            values = self._data[:self._count]
+        else:
+            values = self._data[self._next:] + self._data[:self._next]
+        return values[-last:] if last else values
+
+    def stats(self):
+        """Returns (min, avg, max) of the stored values, or None when empty."""
+        if not self._count:
+            return None
+        values = self.values()
+        return min(values), sum(values) / len(values), max(values)
+
+class HealthMonitor:
+    """
+    Samples CPU, memory, disk and network counters into ring buffers.
+    CPU % comes from psutil's delta since the previous call, so sampling never blocks;
+    disk and network rates are deltas between consecutive counter readings.
+    """
+
+    SERIES = (
+        ("cpu", "CPU", "%"),
+        ("mem", "Memory", "%"),
+        ("disk_read", "Disk read", "B/s"),
+        ("disk_write", "Disk write", "B/s"),
+        ("net_recv", "Net recv", "B/s"),
+        ("net_sent", "Net sent", "B/s"),
+    )
+
+    def __init__(self, psutil, history=MONITOR_HISTORY):
+        self.psutil = psutil
+        self.series = {key: RingBuffer(history) for key, _, _ in self.SERIES}
+        self.samples = 0
+        self._last = None
+        psutil.cpu_percent(interval=None) # Prime the CPU delta baseline
+
+    def _counters(self):
+        disk = self.psutil.disk_io_counters()
+        net = self.psutil.net_io_counters()
+        return (time.monotonic(),
+                (disk.read_bytes, disk.write_bytes) if disk else (0, 0),
+                (net.bytes_recv, net.bytes_sent) if net else (0, 0))
+
+    def sample(self):
+        """Takes one non-blocking sample of every series."""
+        self.series["cpu"].append(self.psutil.cpu_percent(interval=None))
+        self.series["mem"].append(self.psutil.virtual_memory().percent)
+        now, disk, net = self._counters()
+        if self._last is not None:
+            elapsed = (now - self._last[0]) or 1e-9
+            for key, new, old in zip(("disk_read", "disk_write", "net_recv", "net_sent"),
+                                     disk + net, self._last[1] + self._last[2]):
+                self.series[key].append(max(0, new - old) / elapsed)
+        self._last = (now, disk, net)
+        self.samples += 1
+
+    def render(self, width=MONITOR_SPARK_WIDTH):
+        """Returns the dashboard as a list of text lines (latest, min/avg/max, sparkline)."""
+        lines = [f"{'Metric':<11} {'Now':>11} {'Min':>11} {'Avg':>11} {'Max':>11}  Last {width} samples"]
+        for key, label, unit in self.SERIES:
+            buf = self.series[key]
+            stats = buf.stats()
+            if stats is None:
+                lines.append(f"{label:<11} {'...':>11}")
+                continue
+            fmt = (lambda v: f"{v:.1f}%") if unit == "%" else (lambda v: human_bytes(v) + "/s")
+            latest = buf.values(last=1)[0]
+            lines.append(f"{label:<11} {fmt(latest):>11} {fmt(stats[0]):>11} {fmt(stats[1]):>11} "
+                         f"{fmt(stats[2]):>11}  {sparkline(buf.values(last=width))}")
+        return lines
+
+def run_health_monitor(psutil, interval=1.0, duration=None, stream=None, header=""):
+    """
+    Samples and redraws the dashboard in place every `interval` seconds until
+    Ctrl+C (or for `duration` seconds). Returns the monitor's own CPU overhead in
+    percent of one core. If the overhead exceeds MONITOR_MAX_OVERHEAD, the interval
+    is doubled (up to 60s) to stay under budget.
+    """
+    stream = stream or sys.stdout
+    monitor = HealthMonitor(psutil)
+    started_wall = time.monotonic()
+    started_cpu = time.process_time()
+    overhead = 0.0
+    next_tick = started_wall
+    stream.write("\x1b[2J") # Clear once; later frames overwrite in place
+    try:
+        while duration is None or time.monotonic() - started_wall < duration:
+            monitor.sample()
+            wall = time.monotonic() - started_wall
+            overhead = (time.process_time() - started_cpu) / wall * 100 if wall > 0 else 0.0
+            if monitor.samples > 5 and overhead > MONITOR_MAX_OVERHEAD and interval < 60:
+                interval = min(60, interval * 2)
+            lines = [header] if header else []
+            lines += monitor.render()
+            lines.append("")
+            lines.append(f"Interval {interval:g}s | {monitor.samples} samples | "
+                         f"monitor CPU overhead {overhead:.2f}% | Ctrl+C to stop")
+            stream.write("\x1b[H" + "".join(line + "\x1b[K\n" for line in lines) + "\x1b[J")
+            stream.flush()
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    return overhead
+
+# --- Top-N process view ---
+
+class ProcessSampler:
+    """
+    Collects per-process CPU %, RSS, I/O rates and open handle counts.
+    Uses one process_iter(attrs=...) pass per refresh, which reads each process's
+    attributes inside oneshot(). CPU % and I/O rates are deltas against the previous
+    refresh, keyed by (pid, create_time) so recycled pids are not confused.
+    """
+
+    SORT_KEYS = {"cpu": "cpu_percent", "mem": "rss", "io": "io_rate"}
+
+    def __init__(self, psutil):
+        self.psutil = psutil
+        handle_attr = "num_handles" if os.name == 'nt' else "num_fds"
+        self.attrs = ["pid", "name", "username", "create_time", "cpu_times", "memory_info",
+                      "io_counters", handle_attr]
+        self._handle_attr = handle_attr
+        self._prev = {}
+        self._prev_time = None
+        self.last_cost_ms = 0.0
+
+    def refresh(self):
+        """Returns a list of row dicts, one per live process."""
+        cpu_start = time.process_time()
+        now = time.monotonic()
+        elapsed = (now - self._prev_time) if self._prev_time else 0.0
+        current = {}
+        rows = []
+        for proc in self.psutil.process_iter(self.attrs, ad_value=None):
+            info = proc.info
+            key = (info["pid"], info["create_time"])
+            times = info["cpu_times"]
+            cpu_total = times.user + times.system if times else None
+            io = info["io_counters"]
+            io_total = io.read_bytes + io.write_bytes if io else None
+            current[key] = (cpu_total, io_total)
+
+            cpu_percent = io_rate = None
+            prev = self._prev.get(key)
+            if prev and elapsed > 0:
+                if cpu_total is not None and prev[0] is not None:
+                    cpu_percent = max(0.0, (cpu_total - prev[0]) / elapsed * 100)
+                if io_total is not None and prev[1] is not None:
+                    io_rate = max(0.0, (io_total - prev[1]) / elapsed)
+            mem = info["memory_info"]
+            rows.append({
+                "pid": info["pid"],
+                "name": info["name"] or "?",
+                "user": info["username"] or "",
+                "cpu_percent": cpu_percent,
+                "rss": mem.rss if mem else None,
+                "io_rate": io_rate,
+                "handles": info[self._handle_attr],
+            })
+        self._prev = current
+        self._prev_time = now
+        self.last_cost_ms = (time.process_time() - cpu_start) * 1000
+        return rows
+
+    @classmethod
+    def top(cls, rows, n=15, sort="cpu"):
+        """Returns the n largest rows by the sort key using a heap (no full sort)."""
+        field = cls.SORT_KEYS.get(sort, "cpu_percent")
+        return heapq.nlargest(n, rows, key=lambda row: row[field] or 0)
+
+def render_process_table(rows, total, sort, cost_ms):
+    """Returns the process table as a list of text lines."""
+    def fmt(value, func):
+        return func(value) if value is not None else "-"
+
+    lines = [f"{total} processes | sorted by {sort} | refresh cost {cost_ms:.1f} ms CPU | Ctrl+C to stop",
+             f"{'PID':>7} {'Name':<24} {'User':<12} {'CPU%':>6} {'RSS':>10} {'I/O':>11} {'Files':>6}"]
+    for row in rows:
+        lines.append(f"{row['pid']:>7} {row['name'][:24]:<24} {row['user'][-12:]:<12} "
+                     f"{fmt(row['cpu_percent'], lambda v: f'{v:.1f}'):>6} "
+                     f"{fmt(row['rss'], human_bytes):>10} "
+                     f"{fmt(row['io_rate'], lambda v: human_bytes(v) + '/s'):>11} "
+                     f"{fmt(row['handles'], str):>6}")
+    return lines
+
+def run_process_view(psutil, n=15, sort="cpu", interval=2.0, duration=None, stream=None):
+    """Redraws the top-N process table in place every `interval` seconds until Ctrl+C."""
+    stream = stream or sys.stdout
+    sampler = ProcessSampler(psutil)
+    sampler.refresh() # Baseline for the first CPU/I-O deltas
+    started = time.monotonic()
+    stream.write("\x1b[2J")
+    try:
+        while duration is None or time.monotonic() - started < duration:
+            time.sleep(interval)
+            rows = sampler.refresh()
+            lines = render_process_table(sampler.top(rows, n, sort), len(rows), sort, sampler.last_cost_ms)
+            stream.write("\x1b[H" + "".join(line + "\x1b[K\n" for line in lines) + "\x1b[J")
+            stream.flush()
+    except KeyboardInterrupt:
+        pass
+
+# --- Disk usage probes ---
+
+_VOLUME_LABELS = {}
+
+def _udev_label(name):
+    """Decodes a /dev/disk/by-label name: udev escapes ' ' and unsafe bytes as \\xNN, the rest is raw UTF-8."""
+    raw = re.sub(rb'\\x([0-9a-fA-F]{2})', lambda m: bytes([int(m.group(1), 16)]), os.fsencode(name))
+    return raw.decode('utf-8', 'replace')
+
+def volume_label(device, mountpoint):
+    """
+    Returns a volume label without spawning a process, cached per device.
+    Linux reads /dev/disk/by-label; Windows asks GetVolumeInformationW.
+    """
+    key = device or mountpoint
+    if key in _VOLUME_LABELS:
+        return _VOLUME_LABELS[key]
+    label = ""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            buf = ctypes.create_unicode_buffer(261)
+            if ctypes.windll.kernel32.GetVolumeInformationW(
+                    ctypes.c_wchar_p(mountpoint), buf, len(buf), None, None, None, None, 0):
+                label = buf.value
+        elif os.path.isdir("/dev/disk/by-label"):
+            # One directory scan fills the cache for every labelled device
+            for entry in os.scandir("/dev/disk/by-label"):
+                try:
+                    _VOLUME_LABELS.setdefault(os.path.realpath(entry.path), _udev_label(entry.name))
+                except (OSError, ValueError):
+                    continue # One odd entry must not hide the other labels
+            real = os.path.realpath(device) if device else ""
+            label = _VOLUME_LABELS.get(real, "")
+    except (OSError, AttributeError, ValueError, UnicodeError):
+        pass
+    _VOLUME_LABELS[key] = label
+    return label
+
+class DiskProber:
+    """
+    Runs disk_usage() for every mount in parallel daemon threads, each with its own
+    deadline. A mount that does not answer in time (e.g. a hung NFS/CIFS share) is
+    reported as stale with its last known figures, and is not probed again until its
+    previous probe returns, so hung mounts never pile up threads or block the caller.
+    """
+
+    def __init__(self, psutil, timeout=DISK_PROBE_TIMEOUT):
+        self.psutil = psutil
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._inflight = {}  # mountpoint -> Event set when the probe returns
+        self._results = {}   # mountpoint -> (usage or exception, monotonic time)
+
+    def _probe(self, mountpoint, done):
+        try:
+            result = self.psutil.disk_usage(mountpoint)
+        except Exception as e:
+            result = e
+        with self._lock:
+            self._results[mountpoint] = (result, time.monotonic())
+            self._inflight.pop(mountpoint, None)
+        done.set()
+
+    def probe(self, partitions=None):
+        """Returns one row dict per fixed partition; rows for hung mounts have stale=True."""
+        if partitions is None:
+            partitions = self.psutil.disk_partitions()
+        partitions = [p for p in partitions if 'cdrom' not in p.opts and p.fstype]
+        started = time.monotonic()
+
+        waits = []
+        with self._lock:
+            for part in partitions:
+                if part.mountpoint in self._inflight:
+                    continue # Still hung from an earlier call; don't wait on it again
+                done = self._inflight[part.mountpoint] = threading.Event()
+                threading.Thread(target=self._probe, args=(part.mountpoint, done),
+                                 name=f"disk-probe {part.mountpoint}", daemon=True).start()
+                waits.append(done)
+        for done in waits:
+            done.wait(max(0.0, self.timeout - (time.monotonic() - started)))
+
+        rows = []
+        with self._lock:
+            for part in partitions:
+                result, when = self._results.get(part.mountpoint, (None, None))
+                stale = part.mountpoint in self._inflight
+                if isinstance(result, Exception):
+                    continue # Inaccessible drive (e.g., empty card reader)
+                row = {"mountpoint": part.mountpoint, "device": part.device, "fstype": part.fstype,
+                       "label": volume_label(part.device, part.mountpoint), "stale": stale,
+                       "total": None, "used": None, "free": None, "age": None}
+                if result is not None:
+                    row.update(total=result.total, used=result.used, free=result.free,
+                               age=time.monotonic() - when)
+                rows.append(row)
+        return rows
+
+# --- Prometheus metrics exporter ---
+
+def _prom_escape(value):
+    """Escapes a Prometheus label value."""
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+def collect_health_metrics(psutil, disk_prober=None):
+    """
+    Collects one snapshot of host metrics and returns it in the Prometheus text
+    exposition format. Each collector is isolated, so one failing source (for example
+    an unreadable partition) only drops its own series. Disk series need a DiskProber,
+    which keeps a hung mount from stalling the collection.
+    """
+    families = []  # (name, type, help, [(labels, value)])
+
+    def family(name, kind, help_text, samples):
+        families.append((name, kind, help_text, samples))
+
+    try:
+        family("toolkit_cpu_percent", "gauge", "CPU utilisation since the previous sample.",
+               [({}, psutil.cpu_percent(interval=None))])
+    except Exception:
+        pass
+    try:
+        loads = psutil.getloadavg()
+        family("toolkit_load_average", "gauge", "System load average.",
+               [({"period": p}, v) for p, v in zip(("1m", "5m", "15m"), loads)])
+    except Exception:
+        pass
+    try:
+        mem = psutil.virtual_memory()
+        family("toolkit_memory_total_bytes", "gauge", "Total physical memory.", [({}, mem.total)])
+        family("toolkit_memory_available_bytes", "gauge", "Memory available without swapping.", [({}, mem.available)])
+        family("toolkit_memory_used_bytes", "gauge", "Memory in use.", [({}, mem.used)])
+    except Exception:
+        pass
+    try:
+        boot = psutil.boot_time()
+        family("toolkit_boot_time_seconds", "gauge", "Unix time the system booted.", [({}, boot)])
+        family("toolkit_uptime_seconds", "gauge", "Seconds since boot.", [({}, time.time() - boot)])
+    except Exception:
+        pass
+
+    disk_samples = {"total": [], "used": [], "free": [], "stale": []}
+    try:
+        rows = disk_prober.probe() if disk_prober is not None else []
+    except Exception:
+        rows = []
+    for row in rows:
+        labels = {"mountpoint": row["mountpoint"], "device": row["device"], "fstype": row["fstype"]}
+        disk_samples["stale"].append((labels, int(row["stale"])))
+        if row["total"] is not None:
+            disk_samples["total"].append((labels, row["total"]))
+            disk_samples["free"].append((labels, row["free"]))
+            disk_samples["used"].append((labels, row["used"]))
+    for key, samples in disk_samples.items():
+        if samples and key == "stale":
+            family("toolkit_disk_stale", "gauge", "1 if the mount did not answer in time (figures are the last known).", samples)
+        elif samples:
+            family(f"toolkit_disk_{key}_bytes", "gauge", f"Filesystem {key} space.", samples)
+
+    lines = []
+    for name, kind, help_text, samples in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{_prom_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {float(value)!r}" if label_text else f"{name} {float(value)!r}")
+    return "\n".join(lines) + "\n"
+
+class MetricsExporter:
+    """
+    Serves /metrics over HTTP. A background thread collects a snapshot every
+    `interval` seconds and stores the encoded payload; requests only read that
+    cached payload, so a scrape never waits on a slow psutil call.
+    """
+
+    def __init__(self, psutil, host=EXPORTER_HOST, port=EXPORTER_PORT, interval=EXPORTER_INTERVAL):
+        self.psutil = psutil
+        self.interval = interval
+        self.disk_prober = DiskProber(psutil)
+        self._payload = b""
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        exporter = self
+        import http.server
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != "/metrics":
+                    self.send_error(404, "Try /metrics")
+                    return
+                body = exporter._payload
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Keep the console quiet; Prometheus scrapes constantly
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._sampler = threading.Thread(target=self._sample_loop, name="metrics-sampler", daemon=True)
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            text = collect_health_metrics(self.psutil, self.disk_prober)
+            took = time.perf_counter() - start
+            text += ("# HELP toolkit_collect_duration_seconds Time taken by the last background collection.\n"
+                     "# TYPE toolkit_collect_duration_seconds gauge\n"
+                     f"toolkit_collect_duration_seconds {took!r}\n"
+                     "# HELP toolkit_last_collect_timestamp_seconds Unix time of the last background collection.\n"
+                     "# TYPE toolkit_last_collect_timestamp_seconds gauge\n"
+                     f"toolkit_last_collect_timestamp_seconds {time.time()!r}\n")
+            self._payload = text.encode('utf-8')
+            self._ready.set()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Starts the sampler and the HTTP server in background threads."""
+        self.psutil.cpu_percent(interval=None) # Prime the CPU delta baseline
+        self._sampler.start()
+        self._ready.wait(timeout=30)
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+def run_metrics_exporter(psutil, host=EXPORTER_HOST, port=EXPORTER_PORT, interval=EXPORTER_INTERVAL):
+    """Runs the exporter in the foreground until Ctrl+C."""
+    exporter = MetricsExporter(psutil, host, port, interval)
+    exporter.start()
+    out_success(f"Serving Prometheus metrics on http://{host}:{exporter.address[1]}/metrics "
+                f"(refreshed every {interval:g}s). Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.stop()
+
+def health_snapshot(psutil, cpu_interval=1.0, disk_prober=None):
+    """
+    Returns one reading of uptime, CPU load, memory and disk usage as a dict.
+    A section that could not be read is left out and its error is put under
+    'errors' (keyed 'uptime', 'memory' or 'disks') instead.
+    """
+    import socket
+    snapshot = {"host": socket.gethostname(), "disks": [], "errors": {}}
+    try:
+        snapshot["uptime_seconds"] = int(time.time() - psutil.boot_time())
+        snapshot["cpu_percent"] = psutil.cpu_percent(interval=cpu_interval)
+    except Exception as e:
+        snapshot["errors"]["uptime"] = str(e)
+    try:
+        mem = psutil.virtual_memory()
+        snapshot["memory"] = {"total": mem.total, "used": mem.used,
+                              "available": mem.available, "percent": mem.percent}
+    except Exception as e:
+        snapshot["errors"]["memory"] = str(e)
+    try:
+        snapshot["disks"] = (disk_prober or DiskProber(psutil)).probe()
+    except Exception as e:
+        snapshot["errors"]["disks"] = str(e)
+    return snapshot
+
+def start_system_health():
+    import socket
+    out_header("System Health Dashboard")
+    
+    if not check_pip_dependency("psutil"):
+        suspend_script()
+        return
+        
+    import psutil
+    
+    host_name = socket.gethostname()
+
+    mode = input("Show a (s)napshot, a (l)ive monitor, or the top (p)rocesses? (default: s): ").lower()
+    if mode == 'p':
+        sort_input = input("Sort by (c)PU, (m)emory or (i)/O? (default: c): ").lower()
+        sort = {"m": "mem", "i": "io"}.get(sort_input, "cpu")
+        count_input = input("How many processes to show? (default: 15): ")
+        interval_input = input("Refresh interval in seconds (default: 2): ")
+        try:
+            count = int(count_input) if count_input else 15
+            interval = float(interval_input) if interval_input else 2.0
+            if count <= 0 or interval <= 0:
+                raise ValueError
+        except ValueError:
+            out_error("Invalid input. Count and interval must be positive numbers.")
+            wait_script(2)
+            return
+        run_process_view(psutil, count, sort, interval)
+        out_separator()
+        suspend_script()
+        return
+    if mode == 'l':
+        interval_input = input("Sampling interval in seconds (default: 1): ")
+        try:
+            interval = float(interval_input) if interval_input else 1.0
+            if interval <= 0:
+                raise ValueError
+        except ValueError:
+            out_error("Invalid input. Interval must be a positive number.")
+            wait_script(2)
+            return
+        overhead = run_health_monitor(psutil, interval, header=f"Live System Health for: {host_name}")
+        out_separator()
+        out_info(f"Monitor stopped. Its own CPU overhead was {overhead:.2f}% of one core.")
+        suspend_script()
+        return
+    
+    clear_screen()
+    out_header(f"System Health Report for: {host_name}")
+    snapshot = health_snapshot(psutil)
+    errors = snapshot["errors"]
+
+    def to_gb(bytes_val):
+        return round(bytes_val / (1024**3), 2)
+    
+    # --- Uptime & Load ---
+    print(Fore.CYAN + "--- Uptime & Load ---")
+    if "uptime" in errors:
+        out_error(f"Could not get CPU/Uptime info: {errors['uptime']}")
+    else:
+        uptime = timedelta(seconds=snapshot["uptime_seconds"])
+        print(f"Uptime: {uptime.days} days, {uptime.seconds // 3600} hours, {(uptime.seconds // 60) % 60} minutes")
+        print(f"CPU Load: {snapshot['cpu_percent']}%")
+    print("")
+
+    # --- Memory Usage ---
+    print(Fore.CYAN + "--- Memory Usage ---")
+    if "memory" in errors:
+        out_error(f"Could not get Memory info: {errors['memory']}")
+    else:
+        mem = snapshot["memory"]
+        print(f"Total: {to_gb(mem['total'])} GB")
+        print(f"Used:  {to_gb(mem['used'])} GB")
+        print(f"Free:  {to_gb(mem['available'])} GB ({mem['percent']}% used)")
+    print("")
+    
+    # --- Filesystem Disk Usage ---
+    print(Fore.CYAN + "--- Filesystem Disk Usage ---")
+    print(f"{'Drive':<6} {'Label':<20} {'Type':<8} {'Size (GB)':>10} {'Free (GB)':>10} {'% Free':>8}")
+    print("-" * 64)
+    if "disks" in errors:
+        out_error(f"Could not get Disk info: {errors['disks']}")
+    for row in snapshot["disks"]:
+        if row["total"] is None:
+            print(f"{row['mountpoint']:<6} {row['label']:<20} {row['fstype']:<8} {'STALE (not responding)':>30}")
+            continue
+        total_gb = to_gb(row["total"])
+        free_gb = to_gb(row["free"])
+        percent_free = round((row["free"] / row["total"]) * 100, 2) if row["total"] else 0.0
+        stale = " (stale)" if row["stale"] else ""
+        print(f"{row['mountpoint']:<6} {row['label']:<20} {row['fstype']:<8} {total_gb:>10} {free_gb:>10} {percent_free:>8}{stale}")
+    print("")
+    
+    out_separator()
+    suspend_script()
+
+# --- 13. Log File Analyzer ---
+
+# Level names for plain-text logs, matched as whole words, case-insensitively
+LOG_LEVEL_PATTERNS = {
+    "critical": rb"\b(?:critical|crit|fatal|emerg|alert)\b",
+    "error": rb"\b(?:error|err)\b",
+    "warning": rb"\b(?:warning|warn)\b",
+    "information": rb"\b(?:information|info|notice)\b",
+    "debug": rb"\b(?:debug|trace)\b",
+}
+
+_LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+_TRAILING_BREAK = re.compile(rb"(?:\r\n|\r|\n)\Z")
+
+def compile_log_filter(level=None, pattern=None):
+    """
+    Returns a list of compiled bytes regexes that a line must all match (empty matches
+    everything). Raises KeyError for an unknown level and re.error for a bad pattern.
+    """
+    filters = []
+    if level:
+        filters.append(re.compile(LOG_LEVEL_PATTERNS[level.lower()], re.IGNORECASE))
+    if pattern:
+        filters.append(re.compile(pattern.encode('utf-8')))
+    return filters
+
+def iter_lines_reverse(path, block_size=LOG_BLOCK_SIZE, skip_block=None):
+    """
+    Yields the lines of a file (bytes, without line breaks) from last to first,
+    reading fixed-size blocks backwards (through mmap where available). Handles \\n,
+    \\r\\n and \\r endings, and lines split across block boundaries.
+    If skip_block(data) returns True for a block's complete lines, they are skipped
+    without being split, which lets a filter reject whole blocks cheaply.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        try:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            view = None
+
+        def read(start, end):
+            if view is not None:
+                return view[start:end]
+            f.seek(start)
+            return f.read(end - start)
+
+        try:
+            pos = size
+            trailing = _TRAILING_BREAK.search(read(max(0, size - 2), size))
+            if trailing:
+                pos -= len(trailing.group()) # The final line break ends the last line
+                if pos == 0:
+                    yield b"" # The file is a single empty line
+            carry = b""  # Start of a line whose beginning lies in an earlier block
+            while pos > 0:
+                start = max(0, pos - block_size)
+                chunk = read(start, pos)
+                COUNTERS.bytes_read += len(chunk)
+                # Keep a \r\n pair together rather than splitting it across blocks
+                if start > 0 and chunk[:1] == b"\n" and read(start - 1, start) == b"\r":
+                    start -= 1
+                    chunk = b"\r" + chunk
+                pos = start
+                data = chunk + carry
+
+                if start > 0:
+                    match = _LINE_BREAK.search(data)
+                    if match is None:
+                        carry = data # Whole block is the middle of one long line
+                        continue
+                    carry, data = data[:match.start()], data[match.end():]
+                else:
+                    carry = b""
+
+                if skip_block is not None and skip_block(data):
+                    continue
+                yield from reversed(_LINE_BREAK.split(data))
+            if carry:
+                yield carry
+        finally:
+            # Blocks left unread because the caller stopped early
+            COUNTERS.syscalls_avoided += -(-pos // block_size)
+            if view is not None:
+                view.close()
+
+def tail_matches(path, count=10, level=None, pattern=None, block_size=LOG_BLOCK_SIZE):
+    """
+    Returns up to `count` of the most recent lines matching level/pattern, newest first.
+    Reading stops as soon as `count` matches are found, so the cost depends on how far
+    back the matches are, not on the file size. Blocks where any filter has no match
+    at all are rejected with one regex search instead of line by line.
+    """
+    filters = compile_log_filter(level, pattern)
+    # Anchored patterns can't be tested against a whole block, only line by line
+    block_filters = [f for f in filters if not re.search(rb"[\^$]|\\[AZ]", f.pattern)]
+    skip = (lambda data: any(f.search(data) is None for f in block_filters)) if block_filters else None
+    matches = []
+    for line in iter_lines_reverse(path, block_size, skip):
+        if all(f.search(line) for f in filters):
+            matches.append(line.decode('utf-8', errors='replace'))
+            if len(matches) >= count:
+                break
+    return matches
+
+# --- Follow mode ---
+
+class FollowedFile:
+    """
+    One file being followed. Reads only bytes appended since the last read and keeps
+    an incomplete trailing line until its line break arrives. Detects rotation (the
+    path now names a different inode) and truncation (the file shrank).
+    """
+
+    def __init__(self, path, from_end=True):
+        self.path = path
+        self.fh = None
+        self.ident = None
+        self.offset = 0
+        self.partial = b""
+        self._open(seek_end=from_end)
+
+    def _open(self, seek_end=False):
+        try:
+            fh = open(self.path, 'rb')
+        except OSError:
+            self.fh = self.ident = None # Not there (yet); retried on the next check
+            return
+        st = os.fstat(fh.fileno())
+        self.fh, self.ident = fh, (st.st_dev, st.st_ino)
+        self.offset = st.st_size if seek_end else 0
+        fh.seek(self.offset)
+        self.partial = b""
+
+    def close(self):
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
+
+    def _read_available(self, limit):
+        data = self.fh.read(limit)
+        self.offset += len(data)
+        COUNTERS.bytes_read += len(data)
+        return data
+
+    def _split(self, data, final=False):
+        """Splits data into complete lines, keeping the unterminated tail in self.partial."""
+        hold = b""
+        if not final and data.endswith(b"\r"):
+            hold, data = b"\r", data[:-1] # May be the first half of a \r\n still being written
+        lines = _LINE_BREAK.split(data)
+        last = lines.pop()
+        if final:
+            if last:
+                lines.append(last)
+            last = b""
+        elif len(last) > LOG_FOLLOW_CHUNK:
+            lines.append(last) # Unterminated runaway line: emit it as is
+            last = b""
+        self.partial = last + hold
+        return lines
+
+    def read_lines(self, limit=LOG_FOLLOW_CHUNK):
+        """
+        Returns (lines, events): complete new lines (bytes) from at most `limit` new
+        bytes (plus the whole unread rest of a file that was rotated away), and notes
+        such as 'rotated' or 'truncated'.
+        """
+        events = []
+        lines = []
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            st = None
+        if self.fh is None:
+            if st is None:
+                return lines, events
+            self._open()
+            events.append("opened")
+        elif st is not None and (st.st_dev, st.st_ino) != self.ident:
+            # Finish the old file first (all of it: a burst written just before the
+            # rotation must not be lost), then start the new one from its beginning
+            chunks = [self.partial]
+            while True:
+                data = self._read_available(limit)
+                if not data:
+                    break
+                chunks.append(data)
+            lines = self._split(b"".join(chunks), final=True)
+            self.close()
+            self._open()
+            events.append("rotated")
+        elif st is not None and st.st_size < self.offset:
+            self.fh.seek(0)
+            self.offset = 0
+            self.partial = b""
+            events.append("truncated")
+
+        if self.fh is not None:
+            data = self._read_available(limit)
+            if data:
+                lines += self._split(self.partial + data)
+        return lines, events
+
+class _Inotify:
+    """Minimal ctypes binding to Linux inotify, watching directories for changes."""
+
+    IN_MODIFY, IN_ATTRIB, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x2, 0x4, 0x40, 0x80, 0x100, 0x200
+    IN_CLOSE_WRITE, IN_Q_OVERFLOW = 0x8, 0x4000
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self):
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def watch(self, directory, mask=None):
+        import ctypes
+        if mask is None:
+            mask = (self.IN_MODIFY | self.IN_ATTRIB | self.IN_MOVED_FROM | self.IN_MOVED_TO
+                    | self.IN_CREATE | self.IN_DELETE)
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch '{directory}'")
+
+    def drain(self):
+        """Reads and discards all queued events; returns how many there were."""
+        count = 0
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return count
+            pos = 0
+            while pos + self._EVENT.size <= len(buf):
+                _, _, _, name_len = self._EVENT.unpack_from(buf, pos)
+                pos += self._EVENT.size + name_len
+                count += 1
+
+    def read_events(self):
+        """
+        Reads all queued events; returns their (name, mask) pairs in order, with a name
+        of None if the kernel queue overflowed (events were lost).
+        """
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            pos = 0
+            while pos + self._EVENT.size <= len(buf):
+                _, mask, _, name_len = self._EVENT.unpack_from(buf, pos)
+                pos += self._EVENT.size
+                if mask & self.IN_Q_OVERFLOW:
+                    events.append((None, mask))
+                elif name_len:
+                    events.append((os.fsdecode(buf[pos:pos + name_len].rstrip(b'\0')), mask))
+                pos += name_len
+
+    def close(self):
+        os.close(self.fd)
+
+def follow_logs(paths, emit, level=None, pattern=None, from_end=True, stop=None, use_inotify=True):
+    """
+    Follows several files at once from one loop and calls emit(path, line) for every
+    new line matching level/pattern (emit(path, None, note) reports rotation etc.).
+    Waits on inotify when available, otherwise polls with an interval that backs off
+    from LOG_POLL_MIN to LOG_POLL_MAX while the files are idle. Each match is emitted
+    as soon as it is filtered, so a burst is never dropped; a slow emit just delays
+    the next read. Runs until stop() returns True or Ctrl+C.
+    """
+    filters = compile_log_filter(level, pattern)
+    files = [FollowedFile(path, from_end) for path in paths]
+    selector = notifier = None
+    if use_inotify and sys.platform.startswith('linux'):
+        try:
+            notifier = _Inotify()
+            for directory in {os.path.dirname(os.path.abspath(p)) for p in paths}:
+                notifier.watch(directory)
+            selector = selectors.DefaultSelector()
+            selector.register(notifier.fd, selectors.EVENT_READ)
+        except (OSError, AttributeError):
+            if notifier is not None:
+                notifier.close()
+            notifier = selector = None
+
+    interval = LOG_POLL_MIN
+    try:
+        while not (stop and stop()):
+            activity = False
+            for followed in files:
+                lines, events = followed.read_lines()
+                for note in events:
+                    emit(followed.path, None, note)
+                if lines:
+                    activity = True
+                for line in lines:
+                    if all(f.search(line) for f in filters):
+                        emit(followed.path, line.decode('utf-8', errors='replace'))
+
+            # Files with more unread data are read again at once, without waiting
+            if any(f.fh is not None and f.offset < _file_size(f) for f in files):
+                continue
+            if selector is not None:
+                if selector.select(timeout=LOG_FOLLOW_RESYNC):
+                    notifier.drain()
+            else:
+                interval = LOG_POLL_MIN if activity else min(LOG_POLL_MAX, interval * 2)
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for followed in files:
+            followed.close()
+        if selector is not None:
+            selector.close()
+            notifier.close()
+
+def _file_size(followed):
+    try:
+        return os.fstat(followed.fh.fileno()).st_size
+    except (OSError, ValueError):
+        return 0
+
+# --- Error-signature clustering ---
+
+def compile_timestamp_formats(formats=None):
+    """Compiles (regex, strptime format) pairs; the regex is searched near the line start."""
+    return [(re.compile(regex.encode() if isinstance(regex, str) else regex), fmt)
+            for regex, fmt in (formats or LOG_TIMESTAMP_FORMATS)]
+
+def parse_log_timestamp(line, formats):
+    """
+    Returns the line's timestamp as a datetime (naive unless the format has %z), or
+    None. `line` is bytes.
+    """
+    head = line[:64]
+    for regex, fmt in formats:
+        match = regex.search(head)
+        if match:
+            text = match.group().decode('ascii', errors='ignore')
+            try:
+                stamp = datetime.strptime(text, fmt)
+            except ValueError:
+                try:
+                    stamp = datetime.strptime(text.replace('T', ' ', 1), fmt) # ISO 8601 'T' separator
+                except ValueError:
+                    continue
+            if "%Y" not in fmt:
+                stamp = stamp.replace(year=datetime.now().year)
+            return stamp
+    return None
+
+_SIGNATURE_MASKS = [
+    (re.compile(rb"^\W*(?:\d{4}[-/]\d{2}[-/]\d{2}[T ][\d:.,]+\S*|[A-Z][a-z]{2} [ \d]\d [\d:]+|\d{2}/[A-Z][a-z]{2}/\S+)\s*"), b""),
+    (re.compile(rb"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), b"<UUID>"),
+    (re.compile(rb"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), b"<IP>"),
+    (re.compile(rb"(?:[A-Za-z]:)?(?:[\\/][\w.\-]+){2,}[\\/]?"), b"<PATH>"),
+    (re.compile(rb"\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{6,}\b"), b"<HEX>"),
+    (re.compile(rb"\"[^\"]*\"|'[^']*'"), b"<STR>"),
+    (re.compile(rb"\d+"), b"<N>"),
+    (re.compile(rb"\s+"), b" "),
+]
+
+def log_signature(line):
+    """Normalizes a log line (bytes) into a signature by masking timestamps, IDs, paths and numbers."""
+    for regex, mask in _SIGNATURE_MASKS:
+        line = regex.sub(mask, line)
+    return line.strip()[:LOG_SIGNATURE_MAX]
+
+def _hash64(item):
+    return int.from_bytes(hashlib.blake2b(item, digest_size=8).digest(), 'little')
+
+class CountMinSketch:
+    """
+    Fixed-memory frequency estimates: `depth` rows of `width` counters. Estimates never
+    undercount. Sketches with the same dimensions merge by adding their counters.
+    """
+
+    def __init__(self, width=LOG_SKETCH_WIDTH, depth=LOG_SKETCH_DEPTH):
+        self.width, self.depth = width, depth
+        self.counts = array('Q', bytes(8 * width * depth))
+
+    def _slots(self, item):
+        h = _hash64(item)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        counts = self.counts
+        for slot in self._slots(item):
+            counts[slot] += count
+
+    def estimate(self, item):
+        counts = self.counts
+        return min(counts[slot] for slot in self._slots(item))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge sketches of different sizes")
+        self.counts = array('Q', map(operator.add, self.counts, other.counts))
+
+class HeavyHitters:
+    """
+    Misra-Gries summary keeping at most `capacity` candidate signatures, each with its
+    first and last timestamp. Any item seen more than n/(capacity+1) times is kept.
+    Counts here are lower bounds; the CountMinSketch supplies the estimate shown.
+    """
+
+    def __init__(self, capacity=LOG_HEAVY_HITTERS):
+        self.capacity = capacity
+        self.items = {}  # signature -> [count, first_ts, last_ts, example line]
+
+    def add(self, item, stamp=None, example=b""):
+        entry = self.items.get(item)
+        if entry is not None:
+            entry[0] += 1
+            if stamp is not None:
+                if entry[1] is None or stamp < entry[1]:
+                    entry[1] = stamp
+                if entry[2] is None or stamp > entry[2]:
+                    entry[2] = stamp
+            return
+        if len(self.items) >= self.capacity:
+            # Decrement everything once, dropping entries that reach zero
+            for key in [k for k, e in self.items.items() if e[0] <= 1]:
+                del self.items[key]
+            for e in self.items.values():
+                e[0] -= 1
+            if len(self.items) >= self.capacity:
+                return
+        self.items[item] = [1, stamp, stamp, example[:LOG_SIGNATURE_MAX]]
+
+    def merge(self, other):
+        for key, (count, first, last, example) in other.items.items():
+            entry = self.items.get(key)
+            if entry is None:
+                self.items[key] = [count, first, last, example]
+                continue
+            entry[0] += count
+            if first is not None and (entry[1] is None or first < entry[1]):
+                entry[1], entry[3] = first, example # Keep the earliest example, whatever the merge order
+            if last is not None and (entry[2] is None or last > entry[2]):
+                entry[2] = last
+        if len(self.items) > self.capacity:
+            # Standard Misra-Gries merge: subtract the (capacity+1)-th largest count
+            cut = heapq.nlargest(self.capacity + 1, (e[0] for e in self.items.values()))[-1]
+            self.items = {k: e for k, e in self.items.items() if e[0] > cut}
+            for e in self.items.values():
+                e[0] -= cut
+
+def discover_log_files(paths):
+    """
+    Expands paths to include their rotations (app.log.1, app.log.2.gz, app.log-20250101.gz).
+    A directory expands to the files directly inside it.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(os.path.join(path, n) for n in os.listdir(path)
+                                if os.path.isfile(os.path.join(path, n))))
+            continue
+        if os.path.isfile(path):
+            found.append(path)
+        base = glob.escape(path)
+        for rotated in sorted(glob.glob(base + ".*") + glob.glob(base + "-*")):
+            if re.search(r"[.-](\d+)(\.gz)?$|\.gz$", rotated) and os.path.isfile(rotated):
+                found.append(rotated)
+    return list(dict.fromkeys(found))
+
+def open_log(path):
+    """Opens a log file for binary reading, transparently decompressing .gz files."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+def _cluster_ranges(path):
+    """
+    Splits a log into (start, end) byte ranges of LOG_CLUSTER_RANGE bytes. Compressed
+    logs can't be entered mid-stream, so they are one range; end=None reads to EOF.
+    """
+    range_bytes = LOG_CLUSTER_RANGE
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    if path.endswith('.gz') or size <= range_bytes:
+        return [(0, None)]
+    starts = list(range(0, size, range_bytes))
+    return list(zip(starts, starts[1:] + [None]))
+
+def _cluster_file(job):
+    """
+    Process-pool worker: summarizes one byte range of a file, i.e. the lines that
+    start inside it. Returns (path, sketch, hitters, lines, matched, bytes read).
+    """
+    path, start, end, level, pattern, formats, capacity, width, depth = job
+    filters = compile_log_filter(level, pattern)
+    formats = compile_timestamp_formats(formats)
+    sketch = CountMinSketch(width, depth)
+    hitters = HeavyHitters(capacity)
+    lines = matched = 0
+    pos = start
+    try:
+        with open_log(path) as f:
+            if start:
+                # The line running into the range belongs to the previous one
+                f.seek(start - 1)
+                pos = start - 1 + len(f.readline())
+            for line in f:
+                if end is not None and pos >= end:
+                    break
+                pos += len(line)
+                lines += 1
+                if not all(flt.search(line) for flt in filters):
+                    continue
+                matched += 1
+                line = line.rstrip(b"\r\n")
+                signature = log_signature(line)
+                sketch.add(signature)
+                hitters.add(signature, parse_log_timestamp(line, formats), line)
+    except (OSError, EOFError, zlib.error) as e:
+        return path, None, None, lines, str(e), 0
+    return path, sketch, hitters, lines, matched, pos - start
+
+def cluster_error_signatures(paths, level="error", pattern=None, top=20, workers=None,
+                             formats=None, capacity=LOG_HEAVY_HITTERS,
+                             width=LOG_SKETCH_WIDTH, depth=LOG_SKETCH_DEPTH):
+    """
+    Scans files (and their rotations) in a process pool and merges the per-worker
+    summaries. Each task is one file, or one LOG_CLUSTER_RANGE slice of a large
+    uncompressed file. Memory per worker is fixed by the sketch size and heavy-hitter
+    capacity, and at most two tasks per worker are pending, so memory stays bounded
+    whatever the input size. Returns (top_rows, stats).
+    """
+    import concurrent.futures
+    files = discover_log_files(paths)
+    jobs = [(path, start, end, level, pattern, formats, capacity, width, depth)
+            for path in files for start, end in _cluster_ranges(path)]
+    sketch = CountMinSketch(width, depth)
+    hitters = HeavyHitters(capacity)
+    stats = {"files": len(files), "lines": 0, "matched": 0, "errors": []}
+    COUNTERS.files_scanned += len(files)
+    failed = {}
+
+    def merge(result):
+        path, part_sketch, part_hitters, lines, matched, read = result
+        stats["lines"] += lines
+        if part_sketch is None:
+            failed.setdefault(path, matched) # Once per file, not per range
+            return
+        stats["matched"] += matched
+        COUNTERS.bytes_read += read
+        sketch.merge(part_sketch)
+        hitters.merge(part_hitters)
+
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            merge(_cluster_file(job))
+    else:
+        # Only about two tasks per worker are in flight, and results are merged as
+        # they finish (merging is order-independent), so finished summaries never pile
+        # up behind a slow task
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            window = 2 * (workers or os.cpu_count() or 1)
+            queued = iter(jobs)
+            in_flight = set()
+            while True:
+                while len(in_flight) < window:
+                    job = next(queued, None)
+                    if job is None:
+                        break
+                    in_flight.add(pool.submit(_cluster_file, job))
+                if not in_flight:
+                    break
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    merge(future.result())
+    stats["errors"] = [f"{path}: {failed[path]}" for path in files if path in failed]
+
+    rows = []
+    for signature, (_, first, last, example) in hitters.items.items():
+        rows.append({"signature": signature.decode('utf-8', errors='replace'),
+                     "count": sketch.estimate(signature), "first": first, "last": last,
+                     "example": example.decode('utf-8', errors='replace')})
+    rows = heapq.nsmallest(top, rows, key=lambda row: (-row["count"], row["signature"]))
+    latest = max((row["last"] for row in rows if row["last"]), default=None)
+    for row in rows:
+        row["new"] = bool(latest and row["first"] and latest - row["first"] <= timedelta(hours=LOG_NEW_WINDOW_HOURS))
+    return rows, stats
+
+# --- Time-range queries ---
+
+_STRPTIME_REGEX = {
+    "%Y": r"\d{4}", "%m": r"\d{1,2}", "%d": r"\d{1,2}", "%H": r"\d{1,2}", "%M": r"\d{2}",
+    "%S": r"\d{2}", "%f": r"\d{1,6}", "%b": r"[A-Za-z]{3}", "%y": r"\d{2}", "%j": r"\d{3}",
+    "%z": r"[+-]\d{4}", "%%": "%",
+}
+
+def strptime_regex(fmt):
+    """Builds a regex that finds text in the given strptime format (for custom formats)."""
+    parts = re.split(r"(%.)", fmt)
+    return "".join(_STRPTIME_REGEX.get(p, re.escape(p)) if p.startswith('%') else re.escape(p)
+                   for p in parts if p)
+
+def parse_time_bound(text, reference=None):
+    """
+    Parses a user-supplied time ('YYYY-MM-DD HH:MM[:SS]' or just 'HH:MM[:SS]', which
+    is taken on the date of `reference`). If `reference` carries a UTC offset (a %z
+    format), the time is taken at that offset. Raises ValueError if it can't be parsed.
+    """
+    text = text.strip().replace('T', ' ')
+    tzinfo = reference.tzinfo if reference is not None else None
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=tzinfo)
+        except ValueError:
+            pass
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            clock = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        day = (reference or datetime.now()).date()
+        return datetime.combine(day, clock.time(), tzinfo)
+    raise ValueError(f"unrecognised time '{text}' (use YYYY-MM-DD HH:MM[:SS] or HH:MM[:SS])")
+
+def _comparable(stamp, tzinfo):
+    """
+    Returns `stamp` with the same awareness as a bound in `tzinfo`: a naive stamp is
+    taken at that offset, an aware one loses its offset if the bound has none.
+    """
+    if (stamp.tzinfo is None) == (tzinfo is None):
+        return stamp
+    return stamp.replace(tzinfo=tzinfo)
+
+def _time_key(stamp):
+    """A sortable string for a stamp: aware stamps are converted to UTC first."""
+    if stamp.tzinfo is not None:
+        stamp = stamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return stamp.isoformat()
+
+def _stamp_after(view, offset, size, formats, limit=LOG_BLOCK_SIZE):
+    """
+    Finds the first line that starts at or after `offset` and carries a timestamp.
+    Returns (line_offset, datetime) or (None, None) if none within `limit` bytes.
+    """
+    if offset > 0:
+        newline = view.find(b"\n", offset - 1, min(size, offset + limit))
+        if newline < 0:
+            return None, None
+        offset = newline + 1
+    end = min(size, offset + limit)
+    while offset < end:
+        newline = view.find(b"\n", offset, end)
+        line_end = newline if newline >= 0 else end
+        stamp = parse_log_timestamp(view[offset:line_end], formats)
+        if stamp is not None:
+            return offset, stamp
+        if newline < 0:
+            break
+        offset = newline + 1
+    return None, None
+
+def find_time_offset(view, size, target, formats, lo=0, hi=None):
+    """
+    Binary-searches a time-sorted log for the offset of the first line stamped at or
+    after `target`, parsing timestamps only at the probe points. Returns an offset that
+    is at most one block before that line (the caller skims forward from it).
+    """
+    hi = size if hi is None else hi
+    while hi - lo > LOG_BLOCK_SIZE:
+        mid = (lo + hi) // 2
+        line_offset, stamp = _stamp_after(view, mid, size, formats)
+        if stamp is None or _comparable(stamp, target.tzinfo) >= target:
+            hi = mid
+        else:
+            lo = line_offset
+    return lo
+
+class LogTimeIndex:
+    """
+    Persistent sparse index for one log: the offset and timestamp of the first stamped
+    line after every LOG_TIME_INDEX_STEP bytes. Building it probes once per step
+    instead of reading the file; appends only probe the new tail. The file is
+    re-indexed from scratch if it was replaced or truncated. Stamps are stored as
+    _time_key() strings, so logs with UTC offsets sort correctly.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path, formats, index_path=None):
+        self.path = os.path.abspath(path)
+        self.formats = formats
+        if index_path is None:
+            digest = hashlib.sha1(self.path.encode('utf-8')).hexdigest()[:16]
+            index_path = os.path.join(INDEX_DIR, f"{digest}.tix")
+        self.index_path = index_path
+        self.step = LOG_TIME_INDEX_STEP
+        self.meta = {}
+        self.entries = []  # [offset, iso timestamp], offsets increasing
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (data.get("version") != self.VERSION or data.get("path") != self.path
+                or data.get("step") != self.step):
+            return False
+        self.meta, self.entries = data["meta"], data["entries"]
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "path": self.path, "step": self.step,
+                       "meta": self.meta, "entries": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def update(self, view, size, st):
+        """Indexes new data in an mmap'd view. Returns the number of probes made."""
+        head = hashlib.sha1(view[:4096]).hexdigest()
+        same_file = (self.meta.get("ident") == [st.st_dev, st.st_ino] and self.meta.get("head") == head
+                     and self.meta.get("size", 0) <= size)
+        if not same_file:
+            self.entries = []
+        if same_file and self.meta.get("size") == size:
+            return 0
+        offset = self.entries[-1][0] + self.step if self.entries else 0
+        probes = 0
+        while offset < size:
+            line_offset, stamp = _stamp_after(view, offset, size, self.formats)
+            probes += 1
+            if stamp is not None and (not self.entries or line_offset > self.entries[-1][0]):
+                self.entries.append([line_offset, _time_key(stamp)])
+            offset += self.step
+        self.meta = {"ident": [st.st_dev, st.st_ino], "head": head, "size": size}
+        self.save()
+        return probes
+
+    def offset_before(self, target):
+        """Returns an offset at or before the first line stamped at or after `target`."""
+        stamps = [entry[1] for entry in self.entries]
+        i = bisect.bisect_left(stamps, _time_key(target))
+        return self.entries[i - 1][0] if i > 0 else 0
+
+def time_range_lines(path, start, end, level=None, pattern=None, formats=None, use_index=False):
+    """
+    Yields the lines (str) of a time-sorted log stamped between start and end
+    inclusive, plus un-stamped continuation lines (e.g. stack traces) inside the range.
+    Only the byte window holding the range is read: its start is found through the
+    sparse index or a binary search, and reading stops at the first line past `end`.
+    """
+    formats = compile_timestamp_formats(formats)
+    filters = compile_log_filter(level, pattern)
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if st.st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            size = st.st_size
+            reference = _stamp_after(view, 0, size, formats)[1]
+            if reference is not None: # Bounds and stamps must agree on having a UTC offset
+                start, end = _comparable(start, reference.tzinfo), _comparable(end, reference.tzinfo)
+            if use_index:
+                index = LogTimeIndex(path, formats)
+                index.load()
+                index.update(view, size, st)
+                offset = index.offset_before(start)
+            else:
+                offset = find_time_offset(view, size, start, formats)
+
+            in_range = False
+            first = offset
+            try:
+                while offset < size:
+                    newline = view.find(b"\n", offset)
+                    line_end = newline if newline >= 0 else size
+                    line = view[offset:line_end].rstrip(b"\r")
+                    offset = line_end + 1
+                    stamp = parse_log_timestamp(line, formats)
+                    if stamp is not None:
+                        stamp = _comparable(stamp, end.tzinfo)
+                        if stamp > end:
+                            break
+                        in_range = stamp >= start
+                    if in_range and all(flt.search(line) for flt in filters):
+                        yield line.decode('utf-8', errors='replace')
+            finally:
+                COUNTERS.bytes_read += min(offset, size) - first
+
+def last_log_timestamp(path, formats=None):
+    """Returns the timestamp of the last stamped line in a log (reads only its tail)."""
+    formats = compile_timestamp_formats(formats)
+    for count, line in enumerate(iter_lines_reverse(path)):
+        stamp = parse_log_timestamp(line, formats)
+        if stamp is not None or count > 1000:
+            return stamp
+    return None
+
+def start_log_clusterer():
+    paths_input = input("Enter log file(s) or folder(s) to analyze (comma-separated; rotations are included): ")
+    log_level = input("Enter Log Level to cluster (default: error; 'any' for all lines): ").lower() or "error"
+    pattern = input("Enter a regular expression to match (blank for none): ")
+    top_input = input("How many top signatures to show? (default: 20): ")
+
+    paths = [p.strip() for p in paths_input.split(',') if p.strip()]
+    if log_level == "any":
+        log_level = None
+    try:
+        top = int(top_input) if top_input else 20
+        if top <= 0:
+            raise ValueError
+        compile_log_filter(log_level, pattern)
+    except ValueError:
+        out_error("Invalid input. The count must be a positive number.")
+        wait_script(2)
+        return
+    except KeyError:
+        out_error(f"Invalid Log Level: '{log_level}'. Must be one of: {', '.join(LOG_LEVEL_PATTERNS)}.")
+        wait_script(2)
+        return
+    except re.error as e:
+        out_error(f"Invalid regular expression: {e}")
+        wait_script(2)
+        return
+
+    if not discover_log_files(paths):
+        out_error("No log files found. Aborting.")
+        wait_script(2)
+        return
+
+    out_info("Clustering error signatures in parallel...")
+    start = time.perf_counter()
+    rows, stats = cluster_error_signatures(paths, log_level, pattern, top)
+    elapsed = time.perf_counter() - start
+    out_separator()
+
+    def stamp(value):
+        return value.strftime("%Y-%m-%d %H:%M:%S") if value else "-"
+
+    print(f"{'Count':>9} {'First seen':<19} {'Last seen':<19}  Signature")
+    for row in rows:
+        line = f"{row['count']:>9} {stamp(row['first']):<19} {stamp(row['last']):<19}  {row['signature']}"
+        if row["new"]:
+            print(Fore.YELLOW + line + "  [NEW]")
+        else:
+            print(line)
+    out_separator()
+    for error in stats["errors"]:
+        out_error(f"Could not read {error}")
+    out_success(f"Scanned {stats['lines']} lines in {stats['files']} files ({stats['matched']} matched) "
+                f"in {elapsed:.1f}s. Counts are estimates (never under the true count).")
+    out_info(f"[NEW] = first seen within {LOG_NEW_WINDOW_HOURS}h of the latest match.")
+    suspend_script()
+
+def start_log_time_range():
+    log_path = input("Enter the path of the log file (sorted by time): ")
+    start_input = input("Start time (YYYY-MM-DD HH:MM[:SS], or HH:MM on the log's last day): ")
+    end_input = input("End time (same formats): ")
+    log_level = input("Enter Log Level (Critical, Error, Warning, Information, Debug; blank for any): ").lower()
+    pattern = input("Enter a regular expression to match (blank for none): ")
+    custom_format = input("Timestamp format, strptime style (blank to auto-detect common formats): ")
+    use_index = input("Keep a persistent time index for faster repeat queries? (y/n): ").lower()
+
+    if not os.path.isfile(log_path):
+        out_error(f"File not found: '{log_path}'. Aborting.")
+        wait_script(2)
+        return
+
+    formats = [(strptime_regex(custom_format), custom_format)] if custom_format else None
+    try:
+        compile_log_filter(log_level, pattern)
+        reference = last_log_timestamp(log_path, formats)
+        start = parse_time_bound(start_input, reference)
+        end = parse_time_bound(end_input, reference)
+    except KeyError:
+        out_error(f"Invalid Log Level: '{log_level}'. Must be one of: {', '.join(LOG_LEVEL_PATTERNS)}.")
+        wait_script(2)
+        return
+    except (ValueError, re.error) as e:
+        out_error(f"Invalid input: {e}")
+        wait_script(2)
+        return
+    except OSError as e:
+        out_error(f"Could not read log file: {e}")
+        wait_script(2)
+        return
+
+    if end < start:
+        start, end = end, start
+    out_info(f"Showing lines from {start} to {end}...")
+    out_separator()
+    shown = 0
+    try:
+        for line in time_range_lines(log_path, start, end, log_level, pattern, formats, use_index == 'y'):
+            print(line)
+            shown += 1
+    except (OSError, ValueError) as e:
+        out_error(f"Could not read log file: {e}")
+    out_separator()
+    if shown:
+        out_success(f"Query complete. {shown} lines in range.")
+    else:
+        out_info("Query complete. No lines in that time range.")
+    suspend_script()
+
+def start_log_follower():
+    paths_input = input("Enter the log file path(s) to follow (comma-separated): ")
+    log_level = input("Enter Log Level (Critical, Error, Warning, Information, Debug; blank for any): ").lower()
+    pattern = input("Enter a regular expression to match (blank for none): ")
+
+    paths = [p.strip() for p in paths_input.split(',') if p.strip()]
+    if not paths:
+        out_error("No log file given. Aborting.")
+        wait_script(2)
+        return
+    for path in paths:
+        if not os.path.isdir(os.path.dirname(os.path.abspath(path))):
+            out_error(f"Folder of '{path}' does not exist. Aborting.")
+            wait_script(2)
+            return
+
+    try:
+        compile_log_filter(log_level, pattern)
+    except KeyError:
+        out_error(f"Invalid Log Level: '{log_level}'. Must be one of: {', '.join(LOG_LEVEL_PATTERNS)}.")
+        wait_script(2)
+        return
+    except re.error as e:
+        out_error(f"Invalid regular expression: {e}")
+        wait_script(2)
+        return
+
+    show_name = len(paths) > 1
+    def emit(path, line, note=None):
+        if note:
+            out_info(f"{path}: {note}" if path else note)
+        elif show_name:
+            print(f"{Fore.GREEN}{os.path.basename(path)}:{Fore.RESET} {line}")
+        else:
+            print(line)
+
+    out_info(f"Following {len(paths)} file(s) for new matching lines. Press Ctrl+C to stop.")
+    out_separator()
+    follow_logs(paths, emit, log_level, pattern)
+    out_separator()
+    out_success("Stopped following.")
+    suspend_script()
+
+def start_log_file_analyzer():
+    mode = input("Show (r)ecent matches, a (t)ime range, (f)ollow file(s) for new lines, "
+                 "or (c)luster error signatures? (default: r): ").lower()
+    if mode == 't':
+        start_log_time_range()
+        return
+    if mode == 'f':
+        start_log_follower()
+        return
+    if mode == 'c':
+        start_log_clusterer()
+        return
+
+    log_path = input("Enter the path of the log file: ")
+    log_level = input("Enter Log Level (Critical, Error, Warning, Information, Debug; blank for any): ").lower()
+    pattern = input("Enter a regular expression to match (blank for none): ")
+    line_count = input("How many recent lines to show? (default: 10): ")
+
+    if not os.path.isfile(log_path):
+        out_error(f"File not found: '{log_path}'. Aborting.")
+        wait_script(2)
+        return
+
+    try:
+        count = int(line_count) if line_count else 10
+        if count <= 0:
+            raise ValueError
+    except ValueError:
+        out_error("Invalid input. Lines must be a positive number.")
+        wait_script(2)
+        return
+
+    try:
+        compile_log_filter(log_level, pattern)
+    except KeyError:
+        out_error(f"Invalid Log Level: '{log_level}'. Must be one of: {', '.join(LOG_LEVEL_PATTERNS)}.")
+        wait_script(2)
+        return
+    except re.error as e:
+        out_error(f"Invalid regular expression: {e}")
+        wait_script(2)
+        return
+
+    out_info(f"Searching '{log_path}' backwards for the {count} most recent matching lines...")
+    out_separator()
+    try:
+        matches = tail_matches(log_path, count, log_level, pattern)
+    except OSError as e:
+        out_error(f"Could not read log file: {e}")
+        wait_script(2)
+        return
+
+    for line in matches:
+        print(line)
+    out_separator()
+    if matches:
+        out_success(f"Search complete. Showing {len(matches)} most recent matches (newest first).")
+    else:
+        out_info("Search complete. No matches found.")
+    suspend_script()
+
+# Map friendly names to event log level numbers
+EVENT_LOG_LEVELS = {
+    "critical": 1,
+    "error": 2,
+    "warning": 3,
+    "information": 4,
+}
+
+def query_event_log(log_name, level, count=10):
+    """
+    Returns the `count` most recent events of a level from a Windows event log as
+    formatted text (most recent first), or "" if there are none.
+    """
+    import subprocess
+    level_num = EVENT_LOG_LEVELS.get(level)
+    if level_num is None:
+        raise ToolkitError(f"Invalid Log Level: '{level}'. Must be one of: {', '.join(EVENT_LOG_LEVELS)}.")
+
+    # Use wevtutil, the command-line equivalent of Get-WinEvent
+    xpath_query = f"*[System[Level={level_num}]]"
+    cmd = [
+        'wevtutil', 'qe', f'/l:{log_name}',
+        f'/c:{count}', '/rd:true', # /rd:true = reverse (most recent first)
+        f'/q:{xpath_query}', '/f:Text' # /f:Text = formatted text
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, shell=True)
+    except OSError as e:
+        raise ToolkitError(str(e), EXIT_UNAVAILABLE)
+
+    if proc.returncode != 0:
+        if "No events were found" in proc.stderr:
+            return ""
+        raise ToolkitError(proc.stderr or proc.stdout, EXIT_FAILURE)
+    return proc.stdout
+
+def start_log_analyzer():
+    out_header("Log File Analyzer")
+
+    default_backend = 'w' if os.name == 'nt' else 'f'
+    backend = input(f"Analyze a (w)indows event log or a text log (f)ile? (default: {default_backend}): ").lower()
+    if (backend or default_backend) == 'f':
+        start_log_file_analyzer()
+        return
+    
+    log_name = input("Enter Log Name (e.g., Application, System, Security): ")
+    log_level = input("Enter Log Level (e.g., Error, Warning, Information): ").lower()
+    line_count = input("How many recent lines to show? (default: 10): ")
+    
+    if log_level not in EVENT_LOG_LEVELS:
+        out_error(f"Invalid Log Level: '{log_level}'. Must be Error, Warning, or Information.")
+        wait_script(2)
+        return
+        
+    try:
+        count = int(line_count) if line_count else 10
+    except ValueError:
+        out_error("Invalid input. Lines must be a number.")
+        wait_script(2)
+        return
+
+    out_info(f"Searching '{log_name}' log for the {count} most recent '{log_level}' events...")
+    out_separator()
+    
+    try:
+        events = query_event_log(log_name, log_level, count)
+        if not events:
+            out_info("Search complete. No matches found.")
+        else:
+            print(events)
+            out_separator()
+            out_success("Search complete. Showing most recent matches.")
+            
+    except ToolkitError as e:
+        out_error(f"An error occurred: {e}")
+        out_info("Please ensure the Log Name is correct (e.g., 'System').")
+
+    suspend_script()
+
+
+# =============================================================================
+# RUN RECORDS (--profile / --trace / --record)
+# =============================================================================
+# Wraps whichever tool runs, from the menu or the command line, and writes one JSON
+# record per run: timing, exit code and COUNTERS, plus the cProfile top functions
+# (--profile) and the allocation sites at the memory peak (--trace).
+
+class RunRecorder:
+    """Runs tools under the requested instrumentation and emits their run records."""
+
+    def __init__(self, profile=False, profile_out=None, trace=False, record_path=None):
+        self.profile = profile or bool(profile_out)
+        self.profile_out = profile_out
+        self.trace = trace
+        self.record_path = record_path
+
+    def run(self, tool, func, *args):
+        """Calls func(*args), records the run and returns func's result (or re-raises)."""
+        COUNTERS.reset()
+        record = {"tool": tool, "argv": sys.argv[1:], "started": datetime.now().isoformat(timespec="milliseconds"),
+                  "pid": os.getpid(), "exit_code": None, "error": None}
+        profiler = peak = None
+        if self.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+        if self.trace:
+            peak = _PeakSnapshots() # Started last, so the tracing set-up is not in the snapshot
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                result = func(*args)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+            record["exit_code"] = result
+            return result
+        except BaseException as e:
+            record["error"] = f"{e.__class__.__name__}: {e}" if str(e) else e.__class__.__name__
+            raise
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.process_time() - cpu, 6)
+            record["counters"] = COUNTERS.snapshot()
+            if peak is not None:
+                record["memory"] = peak.stop()
+            if profiler is not None:
+                record["profile"] = self._profile_summary(profiler)
+            self.emit(record)
+
+    def _profile_summary(self, profiler):
+        """The PROFILE_TOP functions by cumulative time; the full profile goes to profile_out."""
+        import pstats
+        if self.profile_out:
+            profiler.dump_stats(self.profile_out)
+        rows = []
+        for (path, line, name), (primitive, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items():
+            rows.append({"function": f"{os.path.basename(path)}:{line}({name})", "calls": calls,
+                         "primitive_calls": primitive, "self_s": round(own, 6), "cumulative_s": round(cumulative, 6)})
+        return {"output": self.profile_out,
+                "top": heapq.nlargest(PROFILE_TOP, rows, key=lambda row: row["cumulative_s"])}
+
+    def emit(self, record):
+        """Appends the record as one JSON line to record_path, or writes it to stderr."""
+        line = json.dumps(record, default=str)
+        if self.record_path:
+            try:
+                with open(self.record_path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+                return
+            except OSError as e:
+                out_error(f"Could not write run record to {self.record_path}: {e}")
+        print(line, file=sys.stderr, flush=True)
+
+class _PeakSnapshots:
+    """
+    Traces allocations with tracemalloc and, from a background thread, takes a snapshot
+    whenever traced memory grows 10% past the last snapshot, so the allocation sites
+    reported are the ones alive near the peak rather than at the end of the run.
+    """
+
+    def __init__(self):
+        import tracemalloc
+        self._tracemalloc = tracemalloc
+        self.snapshot = None
+        self.snapshot_bytes = 0
+        self._stop = threading.Event()
+        tracemalloc.start()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def _watch(self):
+        while not self._stop.wait(TRACE_SAMPLE_INTERVAL):
+            self._check()
+
+    def _check(self):
+        current, _ = self._tracemalloc.get_traced_memory()
+        if current > self.snapshot_bytes * 1.1:
+            self.snapshot = self._tracemalloc.take_snapshot()
+            self.snapshot_bytes = current
+
+    def stop(self):
+        """Stops tracing. Returns the peak and the top allocation sites of the peak snapshot."""
+        self._stop.set()
+        self._thread.join()
+        self._check()
+        _, peak = self._tracemalloc.get_traced_memory()
+        self._tracemalloc.stop()
+        top = []
+        if self.snapshot is not None:
+            snapshot = self.snapshot.filter_traces((
+                self._tracemalloc.Filter(False, self._tracemalloc.__file__),
+                self._tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ))
+            top = [{"where": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                    "size_bytes": stat.size, "count": stat.count}
+                   for stat in snapshot.statistics('lineno')[:TRACE_TOP]]
+        return {"peak_bytes": peak, "snapshot_bytes": self.snapshot_bytes, "top": top}
+
+
+# =============================================================================
+# MAIN MENU & SCRIPT LOGIC CENTER (The Engine)
+# =============================================================================
+
+def show_main_menu():
+    """Displays the main menu text."""
+    clear_screen()
+    print(Fore.GREEN + Style.BRIGHT + "[##] ... XENO'S TOOLKIT ... [##]" + Style.RESET_ALL)
+    print(Fore.CYAN + "Select an option to proceed:")
+    print("")
+    print(" 1. Folder Organizer")
+    print(" 2. Password Generator")
+    print(" 3. Curf Remover (Safe File Cleaner)")
+    print(" 4. User Creation")
+    print(" 5. Indexer (Batch File Renamer)")
+    print(" 6. CSV Calculator")
+    print(" 7. Service Manager")
+    print(" 8. Online Image Extractor")
+    print(" 9. TarBall Mailer (.ZIP)")
+    print("10. Term/Phase Fetcher")
+    print("11. Network Diagnostic Tool")
+    print("12. System Health Dashboard")
+    print("13. Log File Analyzer")
+    print("")
+    print(Fore.RED + " q. Quit")
+    out_separator()
+
+# Map menu choices to their respective functions
+MENU_OPTIONS = {
+    '1': start_folder_organizer,
+    '2': start_password_generator,
+    '3': start_curf_remover,
+    '4': start_user_creator,
+    '5': start_indexer,
+    '6': start_csv_calculator,
+    '7': start_service_manager,
+    '8': start_image_extractor,
+    '9': start_tarball_mailer,
+    '10': start_term_fetcher,
+    '11': start_network_diagnostics,
+    '12': start_system_health,
+    '13': start_log_analyzer,
+}
+
+def main(recorder=None):
+    """Main execution loop for the toolkit. A RunRecorder, if given, wraps every tool run."""
+    while True:
+        show_main_menu()
+        choice = input("Enter your choice: ")
+        
+        if choice.lower() == 'q':
+            print("Ending Process!")
+            break
+            
+        # Get the function from the dictionary
+        action = MENU_OPTIONS.get(choice)
+        
+        if action:
+            try:
+                if recorder is not None:
+                    recorder.run(action.__name__, action)
+                else:
+                    action() # Execute the chosen function
+            except Exception as e:
+                out_error(f"An unexpected error occurred in {action.__name__}: {e}")
+                suspend_script()
+        else:
+            out_error(f"Invalid option '{choice}'. Please try again.")
+            wait_script(2)
+
+# =============================================================================
+# SCHEDULER DAEMON (python Toolkit.py daemon jobs.json)
+# =============================================================================
+# Runs command-line commands on a schedule inside one long-running process, so
+# recurring jobs skip interpreter startup and keep indexes and caches warm. Jobs
+# share a worker pool; each job limits its own concurrent runs and each I/O class
+# (e.g. "disk", "net") limits how many of its jobs run at once.
+
+_WARM_STATE = {}
+_WARM_LOCK = threading.Lock()
+
+@contextlib.contextmanager
+def warm_state(key, factory):
+    """
+    Yields the object kept under `key`, creating it with factory() the first time, and
+    holds its lock meanwhile. In the daemon it stays warm between runs (search indexes,
+    disk probers); a one-shot command simply creates it.
+    """
+    with _WARM_LOCK:
+        entry = _WARM_STATE.get(key)
+        if entry is None:
+            entry = _WARM_STATE[key] = [threading.Lock(), None]
+    with entry[0]:
+        if entry[1] is None:
+            entry[1] = factory()
+        yield entry[1]
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_duration(text):
+    """Parses '90', '90s', '15m', '1h30m' or '1d' into seconds. Raises ValueError."""
+    text = str(text).strip().lower()
+    if re.fullmatch(r"\d+(\.\d+)?", text):
+        seconds = float(text)
+    else:
+        parts = re.findall(r"(\d+(?:\.\d+)?)([smhd])", text)
+        if not parts or "".join(n + u for n, u in parts) != text:
+            raise ValueError(f"unrecognised duration '{text}' (use e.g. 90s, 15m, 1h30m, 1d)")
+        seconds = sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    if seconds <= 0:
+        raise ValueError(f"duration must be positive: '{text}'")
+    return seconds
+
+class SystemClock:
+    """Real time, for the scheduler."""
+
+    def time(self):
+        return time.time()
+
+    def wait(self, event, seconds):
+        return event.wait(max(0.0, seconds))
+
+class AcceleratedClock:
+    """
+    A fake clock that starts at `start` (epoch seconds, default now) and runs `speed`
+    times faster than real time, so a day of schedules can be checked in minutes.
+    """
+
+    def __init__(self, speed, start=None):
+        self.speed = speed
+        self.start = time.time() if start is None else start
+        self._t0 = time.monotonic()
+
+    def time(self):
+        return self.start + (time.monotonic() - self._t0) * self.speed
+
+    def wait(self, event, seconds):
+        return event.wait(max(0.0, seconds) / self.speed)
+
+class ScheduledJob:
+    """One job of the job file: its command, schedule, limits and run statistics."""
+
+    def __init__(self, name, argv, every=None, at=None, io_class="default", max_concurrent=1, output=None):
+        self.name = name
+        self.argv = argv
+        self.every = every
+        self.at = at
+        self.io_class = io_class
+        self.max_concurrent = max_concurrent
+        self.output = output
+        self.active = 0      # Runs queued or running
+        self.runs = 0
+        self.failures = 0
+        self.overlaps = 0    # Came due while an earlier run was still queued or running
+        self.skipped = 0     # ...and was dropped because max_concurrent was reached
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def next_after(self, now):
+        """The first due time after `now`: aligned to the interval, or the next HH:MM."""
+        if self.every:
+            return (math.floor(now / self.every) + 1) * self.every
+        moment = datetime.fromtimestamp(now)
+        due = moment.replace(hour=self.at[0], minute=self.at[1], second=0, microsecond=0)
+        if due <= moment:
+            due += timedelta(days=1)
+        return due.timestamp()
+
+    def stats(self):
+        return {"job": self.name, "runs": self.runs, "failures": self.failures, "overlaps": self.overlaps,
+                "skipped": self.skipped, "avg_s": round(self.total_s / self.runs, 3) if self.runs else None,
+                "max_s": round(self.max_s, 3)}
+
+def load_job_file(path):
+    """
+    Reads a JSON job file. Returns (jobs, settings) where settings holds 'workers',
+    'io_limits' and 'record'. Raises ToolkitError for an invalid file. A command is a
+    list of arguments, or a string split like a POSIX shell line (so no backslashes).
+
+    {"workers": 4, "io_limits": {"disk": 1, "net": 4}, "record": "runs.jsonl",
+     "jobs": [{"name": "cleanup", "every": "1h", "io_class": "disk",
+               "command": ["clean", "/scratch", "--days", "15", "--delete"]},
+              {"name": "backup", "at": "02:00", "command": "backup /srv/data /backups",
+               "max_concurrent": 1, "output": "backup.log"}]}
+    """
+    import shlex
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+    except OSError as e:
+        raise ToolkitError(f"Could not read job file '{path}': {e}", EXIT_FAILURE)
+    except ValueError as e:
+        raise ToolkitError(f"Job file '{path}' is not valid JSON: {e}")
+
+    parser = build_cli_parser()
+    jobs = []
+    for n, item in enumerate(spec.get("jobs") or []):
+        name = item.get("name") or f"job{n + 1}"
+        if any(job.name == name for job in jobs):
+            raise ToolkitError(f"Job '{name}': duplicate job name.")
+        argv = item.get("command")
+        argv = shlex.split(argv) if isinstance(argv, str) else [str(a) for a in argv or []]
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit:
+            raise ToolkitError(f"Job '{name}': invalid command {argv}.")
+        if not getattr(args, "handler", None) or args.command == "daemon":
+            raise ToolkitError(f"Job '{name}': the command must be a tool command.")
+        every = at = None
+        try:
+            if item.get("every"):
+                every = parse_duration(item["every"])
+            elif item.get("at"):
+                clock = datetime.strptime(item["at"], "%H:%M")
+                at = (clock.hour, clock.minute)
+            else:
+                raise ValueError("give 'every' (e.g. \"1h\") or 'at' (e.g. \"02:00\")")
+            max_concurrent = int(item.get("max_concurrent", 1))
+            if max_concurrent < 1:
+                raise ValueError("max_concurrent must be at least 1")
+        except (TypeError, ValueError) as e:
+            raise ToolkitError(f"Job '{name}': {e}")
+        jobs.append(ScheduledJob(name, argv, every, at, item.get("io_class", "default"),
+                                 max_concurrent, item.get("output")))
+    if not jobs:
+        raise ToolkitError(f"Job file '{path}' defines no jobs.")
+    try:
+        workers = int(spec.get("workers", DAEMON_WORKERS))
+        io_limits = {str(io_class): int(limit) for io_class, limit in dict(spec.get("io_limits") or {}).items()}
+        if workers < 1 or any(limit < 1 for limit in io_limits.values()):
+            raise ValueError("'workers' and every 'io_limits' value must be at least 1")
+    except (TypeError, ValueError) as e:
+        raise ToolkitError(f"Job file '{path}': {e}")
+    settings = {"workers": workers, "io_limits": io_limits, "record": spec.get("record")}
+    return jobs, settings
+
+class _ThreadStdout:
+    """
+    Stands in for sys.stdout while the daemon runs: each worker thread writes to its
+    job's stream, every other thread to the original stdout. Never a terminal, so
+    job messages carry no color codes.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    @property
+    def stream(self):
+        return getattr(self._local, "stream", None) or self.default
+
+    @contextlib.contextmanager
+    def use(self, stream):
+        self._local.stream = stream
+        try:
+            yield
+        finally:
+            self._local.stream = None
+
+    def write(self, text):
+        return self.stream.write(text)
+
+    def writelines(self, lines):
+        self.stream.writelines(lines)
+
+    def flush(self):
+        self.stream.flush()
+
+    def isatty(self):
+        return False
+
+def run_job_command(job, stream):
+    """Runs a job's command in this thread like the command line does. Returns its exit code."""
+    args = build_cli_parser().parse_args(job.argv) # Fresh each run: some handlers adjust args
+    try:
+        return args.handler(args, CLIOutput(stream, args.json))
+    except ToolkitError as e:
+        out_error(str(e))
+        return e.exit_code
+
+class Scheduler:
+    """
+    Runs ScheduledJobs on time through a shared thread pool. A due job whose earlier run
+    is still queued or running counts as an overlap; it is queued again only while it
+    has fewer than max_concurrent runs, otherwise skipped. Queued runs start in due
+    order as soon as a worker and a slot in their I/O class are free. Every run (and
+    every skipped one) is written as one JSON line to `record_path`. Its times, like
+    the statistics, are in clock seconds (sped up under an AcceleratedClock); wall_s
+    is the real time the run took.
+    """
+
+    def __init__(self, jobs, workers=DAEMON_WORKERS, io_limits=None, clock=None, record_path=None,
+                 runner=run_job_command, stream=None):
+        self.jobs = jobs
+        self.workers = max(1, workers)
+        self.io_limits = io_limits or {}
+        self.clock = clock or SystemClock()
+        self.record_path = record_path
+        self.runner = runner
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._queue = collections.deque()   # (job, due time) waiting for a worker / I/O slot
+        self._running = {}                  # run id -> (job, start time)
+        self._io_running = collections.Counter()
+        self._run_ids = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Makes run() return once running jobs are finished; safe from signal handlers."""
+        self._stop.set()
+        self._wake.set()
+
+    def _io_limit(self, io_class):
+        return self.io_limits.get(io_class, DAEMON_IO_LIMIT)
+
+    def _record(self, record):
+        if not self.record_path:
+            return
+        try:
+            with open(self.record_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            out_error(f"Could not write run record to {self.record_path}: {e}")
+
+    def _due(self, job, due):
+        overlap = job.active > 0
+        if overlap:
+            job.overlaps += 1
+        if job.active >= job.max_concurrent:
+            job.skipped += 1
+            out_error(f"{job.name}: skipped the {datetime.fromtimestamp(due):%H:%M:%S} run, "
+                      f"the previous one is still running.")
+            self._record({"job": job.name, "due": datetime.fromtimestamp(due).isoformat(timespec="seconds"),
+                          "skipped": True, "overlap": True})
+            return
+        job.active += 1
+        self._queue.append((job, due, overlap))
+
+    def _dispatch(self, pool, threads):
+        """Starts queued runs while workers and I/O slots are free (caller holds the lock)."""
+        for _ in range(len(self._queue)):
+            if len(self._running) >= self.workers:
+                return
+            job, due, overlap = self._queue.popleft()
+            if self._io_running[job.io_class] >= self._io_limit(job.io_class):
+                self._queue.append((job, due, overlap)) # Keeps due order within the queue
+                continue
+            self._run_ids += 1
+            started = self.clock.time()
+            concurrent = sorted({other.name for other, _ in self._running.values()})
+            self._running[self._run_ids] = (job, started)
+            self._io_running[job.io_class] += 1
+            pool.submit(self._run, self._run_ids, job, due, started, overlap, concurrent, threads)
+
+    def _run(self, run_id, job, due, started, overlap, concurrent, threads):
+        record = {"job": job.name, "due": datetime.fromtimestamp(due).isoformat(timespec="seconds"),
+                  "started": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+                  "queued_s": round(max(0.0, started - due), 3), "overlap": overlap,
+                  "concurrent_with": concurrent, "exit_code": None, "error": None}
+        begin = time.perf_counter()
+        stream = None
+        try:
+            stream = open(job.output, 'a', encoding='utf-8') if job.output else self.stream
+            with threads.use(stream):
+                record["exit_code"] = self.runner(job, stream)
+        except Exception as e:
+            record["error"] = f"{e.__class__.__name__}: {e}"
+        finally:
+            if stream is not None and stream is not self.stream:
+                stream.close()
+        record["wall_s"] = round(time.perf_counter() - begin, 6)
+        duration = max(0.0, self.clock.time() - started)
+        record["duration_s"] = round(duration, 3)
+        with self._lock:
+            del self._running[run_id]
+            self._io_running[job.io_class] -= 1
+            job.active -= 1
+            job.runs += 1
+            job.total_s += duration
+            job.max_s = max(job.max_s, duration)
+            if record["error"] or record["exit_code"]:
+                job.failures += 1
+        self._record(record)
+        out_info(f"{job.name}: exit code {record['exit_code']} in {duration:.2f}s"
+                 + (f" ({record['error']})" if record["error"] else ""))
+        self._wake.set()
+
+    def run(self, until=None):
+        """
+        Runs the schedule until clock time `until`, stop() or Ctrl+C, then waits for
+        running jobs to finish. Returns the statistics of every job.
+        """
+        import concurrent.futures
+        now = self.clock.time()
+        schedule = [(job.next_after(now), n, job) for n, job in enumerate(self.jobs)]
+        heapq.heapify(schedule)
+        threads = _ThreadStdout(sys.stdout)
+        real_stdout, sys.stdout = sys.stdout, threads
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="toolkit-job")
+        try:
+            while not self._stop.is_set():
+                now = self.clock.time()
+                if until is not None and now >= until:
+                    break
+                with self._lock:
+                    while schedule and schedule[0][0] <= now:
+                        due, n, job = heapq.heappop(schedule)
+                        self._due(job, due)
+                        heapq.heappush(schedule, (job.next_after(due), n, job))
+                    self._dispatch(pool, threads)
+                    self._wake.clear()
+                wake_at = schedule[0][0] if until is None else min(schedule[0][0], until)
+                self.clock.wait(self._wake, wake_at - self.clock.time())
+        except KeyboardInterrupt:
+            out_info("Stopping: waiting for running jobs to finish...")
+        finally:
+            with self._lock:
+                self._queue.clear()
+            pool.shutdown(wait=True)
+            sys.stdout = real_stdout
+        return [job.stats() for job in self.jobs]
+
+# =============================================================================
+# COMMAND-LINE INTERFACE (Non-interactive)
+# =============================================================================
+# Every tool can also run without the menu: python Toolkit.py <command> [options].
+# The commands call the same engines as the menu, never prompt or pause, print their
+# results on stdout (JSON with --json) and messages on stderr, and exit with EXIT_*.
+
+class CLIOutput:
+    """Writes a command's results to stdout, as plain text or as JSON (--json)."""
+
+    def __init__(self, stream, as_json=False):
+        self.stream = stream
+        self.as_json = as_json
+
+    def result(self, result, lines=()):
+        """Writes a whole result: one JSON document, or the given text lines."""
+        if self.as_json:
+            self.stream.write(json.dumps(result, indent=2, default=str) + "\n")
+        else:
+            self.stream.writelines(f"{line}\n" for line in lines)
+
+    def record(self, record, text):
+        """Writes one item of a streamed result: one JSON object per line, or the text."""
+        self.stream.write((json.dumps(record, default=str) if self.as_json else text) + "\n")
+        self.stream.flush()
+
+def _require(*package_names):
+    """Raises ToolkitError (EXIT_UNAVAILABLE) unless every package can be imported."""
+    for package_name in package_names:
+        try:
+            importlib.import_module(package_name)
+        except ImportError:
+            raise ToolkitError(f"Python dependency missing: '{package_name}' "
+                               f"(pip install {package_name})", EXIT_UNAVAILABLE)
+
+def _require_psutil():
+    _require("psutil")
+    import psutil
+    return psutil
+
+def _require_admin():
+    if not is_admin():
+        raise ToolkitError("This action requires Administrator privileges.", EXIT_UNAVAILABLE)
+
+def _log_level(value):
+    """Maps 'any' or blank to no level filter."""
+    return None if value in (None, "", "any") else value.lower()
+
+def cli_organize(args, out):
+    dest = args.dest or os.path.join(os.path.expanduser('~'), "MyShebangs")
+    if args.watch:
+        def emit(filename, category, error):
+            if error:
+                out_error(f"Failed to move {filename}: {error}")
+            else:
+                out.record({"file": filename, "category": category or "uncategorized"},
+                           f"{filename}\t{category or 'uncategorized'}")
+
+        counts = watch_folder(args.source, dest, emit, use_inotify=not args.poll)
+        return EXIT_FAILURE if counts["errors"] else EXIT_OK
+    result = organize_folder(args.source, dest)
+    lines = [f"{item['file']}\t{item['category']}" for item in result["moved"]]
+    lines += [f"{filename}\tuncategorized" for filename in result["uncategorized"]]
+    out.result(result, lines)
+    for item in result["errors"]:
+        out_error(f"Failed to move {item['file']}: {item['error']}")
+    return EXIT_FAILURE if result["errors"] else EXIT_OK
+
+def cli_password(args, out):
+    password = generate_password(args.length)
+    out.result({"length": args.length, "password": password}, [password])
+    return EXIT_OK
+
+def cli_clean(args, out):
+    if args.free:
+        return _cli_clean_free(args, out)
+    files, dirs = find_old_items(args.path, args.days)
+    result = {"path": args.path, "days": args.days, "dry_run": not args.delete,
+              "files": files, "dirs": dirs, "deleted": [], "errors": []}
+    if args.delete:
+        for path, is_file in [(f, True) for f in files] + [(d, False) for d in dirs]:
+            try:
+                remove_item(path, is_file)
+                result["deleted"].append(path)
+            except OSError as e:
+                result["errors"].append({"path": path, "error": str(e)})
+                out_error(f"Failed to delete {path}: {e}")
+    out.result(result, result["deleted"] if args.delete else files + dirs)
+    if not args.delete:
+        out_info(f"Dry run: {len(files)} files and {len(dirs)} empty folders would be deleted. "
+                 "Add --delete to delete them.")
+    return EXIT_FAILURE if result["errors"] else EXIT_OK
+
+def _cli_clean_free(args, out):
+    plan = plan_free_space(args.path, args.free)
+    result = dict(plan, dry_run=not args.delete)
+    if args.delete and plan["files"]:
+        def progress(freed, needed):
+            out_progress(f"Freed {human_bytes(freed)} of {human_bytes(needed)}")
+
+        result.update(free_space(plan, progress, args.workers))
+        for path in result["skipped"]:
+            out_info(f"Kept {path}: it changed after the dry run.")
+        for item in result["errors"]:
+            out_error(f"Failed to delete {item['path']}: {item['error']}")
+        out.result(result, result["deleted"])
+        return EXIT_OK if result["target_reached"] and not result["errors"] else EXIT_FAILURE
+
+    out.result(result, [item["path"] for item in plan["files"]])
+    if not plan["needed"]:
+        out_info(f"The drive already has {human_bytes(plan['free_before'])} free.")
+        return EXIT_OK
+    out_info(f"Dry run: deleting the {len(plan['files'])} oldest files would free "
+             f"{human_bytes(plan['selected_bytes'])} of the {human_bytes(plan['needed'])} needed. "
+             "Add --delete to delete them.")
+    return EXIT_OK if plan["reachable"] else EXIT_FAILURE
+
+def cli_adduser(args, out):
+    _require_admin()
+    check_new_username(args.username)
+    password = sys.stdin.readline().rstrip("\r\n")
+    if not password:
+        raise ToolkitError("No password given on standard input.")
+    create_user(args.username, password)
+    out.result({"username": args.username, "created": True}, [f"User '{args.username}' is ready."])
+    return EXIT_OK
+
+def cli_rename(args, out):
+    result = rename_files(args.directory, args.prefix)
+    out.result(result, [f"{item['from']}\t{item['to']}" for item in result["renamed"]])
+    for item in result["errors"]:
+        out_error(f"Failed to rename '{item['file']}': {item['error']}")
+    return EXIT_FAILURE if result["errors"] else EXIT_OK
+
+def cli_csv(args, out):
+    import csv
+    if not os.path.isfile(args.file):
+        raise ToolkitError(f"File not found: '{args.file}'.")
+    skipped = 0
+    try:
+        for row in iter_csv_totals(args.file, args.header):
+            if row is None:
+                skipped += 1
+                continue
+            out.record(row, f"{row['name']}\t{row['id']}\t{row['total']}\t{row['average']}")
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        raise ToolkitError(f"Failed to read file: {e}", EXIT_FAILURE)
+    if skipped:
+        out_info(f"Skipped {skipped} malformed lines.")
+    return EXIT_OK
+
+def cli_service(args, out):
+    _require_admin()
+    if args.action != "status":
+        control_service(args.name, args.action)
+    status = service_status(args.name)
+    out.result({"service": args.name, "action": args.action, "status": status}, [status])
+    return EXIT_OK
+
+def cli_images(args, out):
+    _require("requests", "bs4")
+    save_dir = args.dest or os.path.join(os.path.expanduser('~'), "Downloads", "ExtractedImages")
+    result = extract_images(args.url, save_dir, lambda name, url: out_progress(f"Downloading {name}..."))
+    out.result(result, [os.path.join(save_dir, item["file"]) for item in result["downloaded"]])
+    for item in result["errors"]:
+        out_error(f"Failed to download {item['url']}: {item['error']}")
+    return EXIT_FAILURE if result["errors"] else EXIT_OK
+
+def cli_backup(args, out):
+    import smtplib
+    email_pass = None
+    if args.email:
+        if not is_valid_email(args.email):
+            raise ToolkitError("Invalid email address format.")
+        email_pass = os.environ.get(SMTP_PASSWORD_ENV)
+        if not email_pass:
+            raise ToolkitError(f"Set {SMTP_PASSWORD_ENV} to the SMTP password to send the notification.")
+
+    archive_path = create_backup_archive(args.source, args.dest)
+    result = {"source": args.source, "archive": archive_path, "notified": None}
+    code = EXIT_OK
+    if args.email:
+        try:
+            send_backup_notification(archive_path, args.source, args.email, email_pass)
+            result["notified"] = args.email
+        except (OSError, smtplib.SMTPException) as e:
+            out_error(f"Could not send the email notification: {e}")
+            result["error"] = str(e)
+            code = EXIT_FAILURE
+    out.result(result, [archive_path])
+    return code
+
+def cli_search(args, out):
+    mode = "multi" if args.patterns else "regex" if args.regex else "literal"
+    if mode == "multi" and args.term is not None:
+        if args.directory != ".":
+            raise ToolkitError("Give either a search term or --patterns, not both.")
+        args.directory, args.term = args.term, None # 'search -f FILE DIR'
+    if not os.path.isdir(args.directory):
+        raise ToolkitError(f"Directory '{args.directory}' does not exist.")
+    if mode == "multi":
+        try:
+            patterns = load_patterns(args.patterns)
+        except OSError as e:
+            raise ToolkitError(f"Could not read pattern file '{args.patterns}': {e}")
+        if not patterns:
+            raise ToolkitError(f"Pattern file '{args.patterns}' contains no patterns.")
+    elif not args.term:
+        raise ToolkitError("No search term provided.")
+    else:
+        patterns = args.term
+        if mode == "regex":
+            try:
+                re.compile(patterns)
+            except re.error as e:
+                raise ToolkitError(f"Invalid regular expression: {e}")
+
+    matches = 0
+    with contextlib.ExitStack() as stack:
+        index = None
+        if args.index:
+            # Kept in memory by the daemon, so repeat searches only check for changed files
+            index = stack.enter_context(warm_state(("trigram", os.path.abspath(args.directory)),
+                                                   lambda: _loaded_index(args.directory)))
+            try:
+                index.update()
+            except OSError as e:
+                out_error(f"Could not update the search index: {e}. Searching without it.")
+                index = None
+
+        for file_path, line_no, line, matched in term_fetch(args.directory, patterns, args.ignore_case, index,
+                                                             mode, args.max_count, args.files_only):
+            matches += 1
+            line = line.rstrip("\r\n")
+            if args.files_only:
+                out.record({"path": file_path}, file_path)
+            else:
+                out.record({"path": file_path, "line": line_no, "text": line, "patterns": matched},
+                           f"{file_path}:{line_no}:{line}")
+    return EXIT_OK if matches else EXIT_FAILURE
+
+def _loaded_index(directory):
+    index = TrigramIndex(directory)
+    index.load()
+    return index
+
+def cli_net_diag(args, out):
+    results = run_network_diagnostics(args.domain, args.method, args.deadline)
+    lines = []
+    for result in results:
+        latency = f"{result['latency_ms']:.1f}ms" if result["latency_ms"] is not None else "-"
+        lines.append(f"{result['check']}\t{result['target']}\t{'PASS' if result['passed'] else 'FAIL'}"
+                     f"\t{latency}\t{result['detail'] or ''}")
+    out.result(results, lines)
+    return EXIT_OK if all(result["passed"] for result in results) else EXIT_FAILURE
+
+def cli_net_sweep(args, out):
+    try:
+        targets = parse_sweep_targets(args.targets, args.ports)
+    except (ValueError, OSError) as e:
+        raise ToolkitError(f"Invalid sweep targets: {e}")
+    if not targets:
+        raise ToolkitError("No targets given.")
+    results = run_reachability_sweep(targets, args.count, args.concurrency, args.timeout)
+    if args.export:
+        try:
+            export_sweep_results(results, args.export)
+        except OSError as e:
+            raise ToolkitError(f"Could not export results: {e}", EXIT_FAILURE)
+    if out.as_json:
+        out.result({"buckets_ms": SWEEP_BUCKETS_MS, "results": results})
+    else:
+        show_sweep_results(results, out.stream)
+    return EXIT_OK if all(row["open"] + row["closed"] for row in results) else EXIT_FAILURE
+
+def cli_net_dns(args, out):
+    try:
+        names = parse_name_list(",".join(args.names))
+    except OSError as e:
+        raise ToolkitError(f"Could not read names: {e}")
+    if not names:
+        raise ToolkitError("No names given.")
+    servers = system_nameservers()
+    server = args.server or (servers[0] if servers else None)
+    if args.fresh:
+        DNS_CACHE.clear()
+    results = run_dns_benchmark(names, args.repeats, server)
+    if out.as_json:
+        out.result(results)
+    else:
+        show_dns_results(results, out.stream)
+    return EXIT_FAILURE if any(not row["answers"] for row in results) else EXIT_OK
+
+def cli_health_snapshot(args, out):
+    psutil = _require_psutil()
+    # The daemon keeps one prober, so a hung mount is not probed again on every run
+    with warm_state(("disk_prober",), lambda: DiskProber(psutil)) as prober:
+        snapshot = health_snapshot(psutil, args.cpu_interval, prober)
+    lines = [f"host\t{snapshot['host']}"]
+    if "uptime_seconds" in snapshot:
+        lines += [f"uptime_seconds\t{snapshot['uptime_seconds']}", f"cpu_percent\t{snapshot['cpu_percent']}"]
+    if "memory" in snapshot:
+        lines += [f"memory_{key}\t{value}" for key, value in snapshot["memory"].items()]
+    for row in snapshot["disks"]:
+        lines.append(f"disk\t{row['mountpoint']}\t{row['total']}\t{row['free']}\t{'stale' if row['stale'] else 'ok'}")
+    out.result(snapshot, lines)
+    for section, error in snapshot["errors"].items():
+        out_error(f"Could not get {section} info: {error}")
+    return EXIT_FAILURE if snapshot["errors"] else EXIT_OK
+
+def cli_health_monitor(args, out):
+    psutil = _require_psutil()
+    duration = args.count * args.interval if args.count else None
+    if not out.as_json:
+        run_health_monitor(psutil, args.interval, duration, out.stream)
+        return EXIT_OK
+    # Machine-readable: one JSON sample per interval instead of a redrawn screen
+    monitor = HealthMonitor(psutil)
+    taken = 0
+    try:
+        while not args.count or taken < args.count:
+            time.sleep(args.interval)
+            monitor.sample()
+            taken += 1
+            record = {"time": datetime.now().isoformat(timespec="seconds")}
+            record.update({key: buf.values(last=1)[0] for key, buf in monitor.series.items() if len(buf)})
+            out.record(record, "")
+    except KeyboardInterrupt:
+        pass
+    return EXIT_OK
+
+def cli_health_top(args, out):
+    psutil = _require_psutil()
+    if not out.as_json:
+        run_process_view(psutil, args.n, args.sort, args.interval,
+                         args.count * args.interval if args.count else None, out.stream)
+        return EXIT_OK
+    sampler = ProcessSampler(psutil)
+    sampler.refresh() # Baseline for the first CPU/I-O deltas
+    taken = 0
+    try:
+        while not args.count or taken < args.count:
+            time.sleep(args.interval)
+            rows = sampler.refresh()
+            taken += 1
+            out.record({"time": datetime.now().isoformat(timespec="seconds"), "total": len(rows),
+                        "processes": sampler.top(rows, args.n, args.sort)}, "")
+    except KeyboardInterrupt:
+        pass
+    return EXIT_OK
+
+def cli_health_exporter(args, out):
+    run_metrics_exporter(_require_psutil(), args.host, args.port, args.interval)
+    return EXIT_OK
+
+def _compile_log_args(args):
+    try:
+        compile_log_filter(_log_level(args.level), args.pattern)
+    except KeyError:
+        raise ToolkitError(f"Invalid Log Level: '{args.level}'. Must be one of: {', '.join(LOG_LEVEL_PATTERNS)}.")
+    except re.error as e:
+        raise ToolkitError(f"Invalid regular expression: {e}")
+
+def cli_logs_tail(args, out):
+    if not os.path.isfile(args.file):
+        raise ToolkitError(f"File not found: '{args.file}'.")
+    _compile_log_args(args)
+    try:
+        matches = tail_matches(args.file, args.lines, _log_level(args.level), args.pattern)
+    except OSError as e:
+        raise ToolkitError(f"Could not read log file: {e}", EXIT_FAILURE)
+    for line in matches:
+        out.record({"path": args.file, "text": line}, line)
+    return EXIT_OK if matches else EXIT_FAILURE
+
+def cli_logs_range(args, out):
+    if not os.path.isfile(args.file):
+        raise ToolkitError(f"File not found: '{args.file}'.")
+    _compile_log_args(args)
+    formats = [(strptime_regex(args.format), args.format)] if args.format else None
+    try:
+        reference = last_log_timestamp(args.file, formats)
+        start = parse_time_bound(args.start, reference)
+        end = parse_time_bound(args.end, reference)
+    except (ValueError, re.error) as e:
+        raise ToolkitError(f"Invalid input: {e}")
+    except OSError as e:
+        raise ToolkitError(f"Could not read log file: {e}", EXIT_FAILURE)
+    if end < start:
+        start, end = end, start
+
+    shown = 0
+    try:
+        for line in time_range_lines(args.file, start, end, _log_level(args.level), args.pattern,
+                                     formats, args.index):
+            out.record({"path": args.file, "text": line}, line)
+            shown += 1
+    except (OSError, ValueError) as e:
+        raise ToolkitError(f"Could not read log file: {e}", EXIT_FAILURE)
+    return EXIT_OK if shown else EXIT_FAILURE
+
+def cli_logs_follow(args, out):
+    for path in args.files:
+        if not os.path.isdir(os.path.dirname(os.path.abspath(path))):
+            raise ToolkitError(f"Folder of '{path}' does not exist.")
+    _compile_log_args(args)
+    show_name = len(args.files) > 1
+
+    def emit(path, line, note=None):
+        if note:
+            out_info(f"{path}: {note}" if path else note)
+        else:
+            out.record({"path": path, "text": line}, f"{os.path.basename(path)}: {line}" if show_name else line)
+
+    follow_logs(args.files, emit, _log_level(args.level), args.pattern, from_end=not args.from_start)
+    return EXIT_OK
+
+def cli_logs_cluster(args, out):
+    _compile_log_args(args)
+    if not discover_log_files(args.paths):
+        raise ToolkitError("No log files found.", EXIT_FAILURE)
+    rows, stats = cluster_error_signatures(args.paths, _log_level(args.level), args.pattern,
+                                           args.top, args.workers)
+    lines = [f"{row['count']}\t{row['first'] or '-'}\t{row['last'] or '-'}\t{'NEW' if row['new'] else ''}"
+             f"\t{row['signature']}" for row in rows]
+    out.result({"signatures": rows, "stats": stats}, lines)
+    for error in stats["errors"]:
+        out_error(f"Could not read {error}")
+    return EXIT_FAILURE if stats["errors"] else EXIT_OK
+
+def cli_logs_events(args, out):
+    if os.name != 'nt':
+        raise ToolkitError("Windows event logs can only be read on Windows.", EXIT_UNAVAILABLE)
+    events = query_event_log(args.log_name, args.level.lower(), args.lines)
+    out.result({"log": args.log_name, "level": args.level.lower(), "events": events},
+               [events] if events else [])
+    return EXIT_OK if events else EXIT_FAILURE
+
+def _dry_run_job(job, stream):
+    out_info(f"{job.name}: would run: {' '.join(job.argv)}")
+    return EXIT_OK
+
+def cli_daemon(args, out):
+    import signal
+    jobs, settings = load_job_file(args.job_file)
+    clock = AcceleratedClock(args.speed) if args.speed else SystemClock()
+    scheduler = Scheduler(jobs, args.workers or settings["workers"], settings["io_limits"], clock,
+                          args.runs_log or settings["record"], _dry_run_job if args.dry_run else run_job_command,
+                          out.stream)
+    if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+
+    now = clock.time()
+    speed = f", clock running {args.speed:g}x" if args.speed else ""
+    out_info(f"Scheduler started: {len(jobs)} jobs, {scheduler.workers} workers{speed}. Ctrl+C to stop.")
+    for job in jobs:
+        when = f"every {job.every:g}s" if job.every else f"daily at {job.at[0]:02d}:{job.at[1]:02d}"
+        out_info(f"{job.name}: {when}, I/O class '{job.io_class}', first run "
+                 f"{datetime.fromtimestamp(job.next_after(now)):%Y-%m-%d %H:%M:%S}")
+    stats = scheduler.run(now + args.until if args.until else None)
+
+    out.result({"jobs": stats}, [f"{row['job']}\truns={row['runs']}\tfailures={row['failures']}\t"
+                                 f"overlaps={row['overlaps']}\tskipped={row['skipped']}\t"
+                                 f"avg_s={row['avg_s']}\tmax_s={row['max_s']}" for row in stats])
+    return EXIT_FAILURE if any(row["failures"] for row in stats) else EXIT_OK
+
+def _positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number: {value}")
+    return number
+
+def _non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be a non-negative number: {value}")
+    return number
+
+def _positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number: {value}")
+    return number
+
+def _duration(value):
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _size(value):
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _port_list(value):
+    return [int(p) for p in re.split(r'[,\s]+', value.strip()) if p]
+
+def build_cli_parser():
+    """Returns the argparse parser with one sub-command per tool."""
+    parser = argparse.ArgumentParser(
+        prog="Toolkit.py",
+        description="XENO'S TOOLKIT. Run without a command for the interactive menu.",
+        epilog=f"Exit codes: {EXIT_OK} success, {EXIT_FAILURE} failed or nothing found, "
+               f"{EXIT_USAGE} invalid input, {EXIT_UNAVAILABLE} missing dependency/privileges.")
+    parser.add_argument("--json", action="store_true",
+                        help="print results as JSON (streamed results as one JSON object per line)")
+    parser.add_argument("--output-mode", choices=OutputSink.MODES,
+                        help="how messages (stderr) are shown: normal, summary (no per-item lines or "
+                             "progress), quiet (errors only) or jsonl (one JSON object per message). "
+                             "Also applies to the interactive menu when given without a command.")
+    records = parser.add_argument_group(
+        "run records", "Write one JSON record per tool run (timing, files scanned, bytes read, network "
+                       "latencies) to stderr or --record FILE. Without a command, every tool run from "
+                       "the interactive menu is recorded.")
+    records.add_argument("--profile", action="store_true",
+                         help="add the top functions by cumulative time (cProfile) to the record")
+    records.add_argument("--profile-out", metavar="FILE",
+                         help="also save the full profile for pstats/snakeviz (implies --profile)")
+    records.add_argument("--trace", action="store_true",
+                         help="add the peak traced memory and its top allocation sites (tracemalloc)")
+    records.add_argument("--record", metavar="FILE", help="append the records to FILE as JSON lines")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    def command(parent, name, handler, help_text):
+        sub = parent.add_parser(name, help=help_text, description=help_text)
+        sub.set_defaults(handler=handler)
+        return sub
+
+    def group(name, help_text):
+        sub = commands.add_parser(name, help=help_text, description=help_text)
+        return sub.add_subparsers(dest="action", metavar="action", required=True)
+
+    def log_filters(sub, default_level=None):
+        sub.add_argument("--level", default=default_level,
+                         help=f"only lines of this level ({', '.join(LOG_LEVEL_PATTERNS)}, or any)")
+        sub.add_argument("--pattern", help="only lines matching this regular expression")
+
+    sub = command(commands, "organize", cli_organize, "1. Sort a folder's files into sub-folders by type")
+    sub.add_argument("source", help="folder to organize")
+    sub.add_argument("--dest", help=r"destination folder (default: ~\MyShebangs)")
+    sub.add_argument("--watch", action="store_true",
+                     help="keep running and organize files as they are dropped in (Ctrl+C to stop)")
+    sub.add_argument("--poll", action="store_true", help="with --watch: poll instead of using inotify")
+
+    sub = command(commands, "password", cli_password, "2. Generate a random password")
+    sub.add_argument("--length", type=int, default=16, help="password length (default: 16)")
+
+    sub = command(commands, "clean", cli_clean, "3. Find (and with --delete, delete) old files and empty folders")
+    sub.add_argument("path", help="folder to clean")
+    select = sub.add_mutually_exclusive_group()
+    select.add_argument("--days", type=_non_negative_int, default=15, help="minimum age in days (default: 15)")
+    select.add_argument("--free", type=_size, metavar="SIZE",
+                        help="instead, delete the oldest files until the drive has SIZE free (e.g. 200GB)")
+    sub.add_argument("--delete", action="store_true", help="delete them (default: dry run, list only)")
+    sub.add_argument("--workers", type=_positive_int, default=SPACE_DELETE_WORKERS,
+                     help=f"with --free: parallel deletions (default: {SPACE_DELETE_WORKERS})")
+
+    sub = command(commands, "adduser", cli_adduser, "4. Create a local user (password read from stdin)")
+    sub.add_argument("username")
+
+    sub = command(commands, "rename", cli_rename, "5. Rename all files in a folder to <prefix><number>")
+    sub.add_argument("directory")
+    sub.add_argument("--prefix", default="file-", help="new name prefix (default: file-)")
+
+    sub = command(commands, "csv", cli_csv, "6. Total and average the Val1/Val2 columns of a CSV file")
+    sub.add_argument("file")
+    sub.add_argument("--header", action="store_true", help="the file has a Name,ID,Val1,Val2 header row")
+
+    sub = command(commands, "service", cli_service, "7. Show, start, stop or restart a service")
+    sub.add_argument("name")
+    sub.add_argument("--action", choices=("status", "start", "stop", "restart"), default="status")
+
+    sub = command(commands, "images", cli_images, "8. Download the images linked from a web page")
+    sub.add_argument("url")
+    sub.add_argument("--dest", help=r"save folder (default: ~\Downloads\ExtractedImages)")
+
+    sub = command(commands, "backup", cli_backup, "9. Zip a folder and optionally email a notification")
+    sub.add_argument("source")
+    sub.add_argument("dest")
+    sub.add_argument("--email", help=f"notify this address (SMTP password from ${SMTP_PASSWORD_ENV})")
+
+    sub = command(commands, "search", cli_search, "10. Find text in files recursively")
+    sub.add_argument("term", nargs="?", help="text (or regular expression with --regex) to find")
+    sub.add_argument("directory", nargs="?", default=".", help="folder to search (default: .)")
+    sub.add_argument("-i", "--ignore-case", action="store_true")
+    sub.add_argument("-r", "--regex", action="store_true", help="treat the term as a regular expression")
+    sub.add_argument("-f", "--patterns", metavar="FILE", help="search for every pattern in FILE (one per line)")
+    sub.add_argument("-m", "--max-count", type=_non_negative_int, default=0, help="matches per file (default: all)")
+    sub.add_argument("-l", "--files-only", action="store_true", help="list only the files that match")
+    sub.add_argument("--index", action="store_true", help="use (and update) the persistent trigram index")
+
+    net = group("net", "11. Network diagnostics, reachability sweeps and DNS benchmarks")
+    sub = command(net, "diag", cli_net_diag, "Check gateway, internet and DNS")
+    sub.add_argument("--domain", default="google.com")
+    sub.add_argument("--method", choices=("ping", "tcp", "udp"), default="ping")
+    sub.add_argument("--deadline", type=_positive_float, default=NET_DIAG_DEADLINE)
+    sub = command(net, "sweep", cli_net_sweep, "Probe many hosts/ports (host, host:port, CIDR, @file)")
+    sub.add_argument("targets")
+    sub.add_argument("--ports", type=_port_list, default=[80, 443], help="ports for targets without one")
+    sub.add_argument("--count", type=_positive_int, default=3, help="probes per target (default: 3)")
+    sub.add_argument("--concurrency", type=_positive_int, default=SWEEP_CONCURRENCY)
+    sub.add_argument("--timeout", type=_positive_float, default=SWEEP_TIMEOUT)
+    sub.add_argument("--export", metavar="FILE", help="also write the results to a .json or .csv file")
+    sub = command(net, "dns", cli_net_dns, "Benchmark name resolution")
+    sub.add_argument("names", nargs="+", help="names to resolve (or @file)")
+    sub.add_argument("--repeats", type=_positive_int, default=5, help="lookups per name (default: 5)")
+    sub.add_argument("--server", help="DNS server to query (default: the first system nameserver)")
+    sub.add_argument("--fresh", action="store_true", help="ignore cached answers from earlier runs")
+
+    health = group("health", "12. System health snapshot, live monitor, top processes, metrics exporter")
+    sub = command(health, "snapshot", cli_health_snapshot, "Uptime, CPU, memory and disk usage")
+    sub.add_argument("--cpu-interval", type=_positive_float, default=1.0, help="CPU sampling time (default: 1)")
+    for name, handler, help_text, interval in (("monitor", cli_health_monitor, "Live CPU/memory/disk/network", 1.0),
+                                               ("top", cli_health_top, "Top processes", 2.0)):
+        sub = command(health, name, handler, help_text)
+        sub.add_argument("--interval", type=_positive_float, default=interval)
+        sub.add_argument("--count", type=_positive_int, help="stop after this many samples (default: Ctrl+C)")
+        if name == "top":
+            sub.add_argument("-n", type=_positive_int, default=15, help="processes to show (default: 15)")
+            sub.add_argument("--sort", choices=("cpu", "mem", "io"), default="cpu")
+    sub = command(health, "exporter", cli_health_exporter, "Serve Prometheus metrics until Ctrl+C")
+    sub.add_argument("--host", default=EXPORTER_HOST)
+    sub.add_argument("--port", type=int, default=EXPORTER_PORT)
+    sub.add_argument("--interval", type=_positive_float, default=EXPORTER_INTERVAL)
+
+    logs = group("logs", "13. Analyze text logs and Windows event logs")
+    sub = command(logs, "tail", cli_logs_tail, "Most recent matching lines, newest first")
+    sub.add_argument("file")
+    sub.add_argument("-n", "--lines", type=_positive_int, default=10)
+    log_filters(sub)
+    sub = command(logs, "range", cli_logs_range, "Lines between two times")
+    sub.add_argument("file")
+    sub.add_argument("--start", required=True, help="YYYY-MM-DD HH:MM[:SS], or HH:MM on the log's last day")
+    sub.add_argument("--end", required=True)
+    sub.add_argument("--format", help="timestamp format, strptime style (default: auto-detect)")
+    sub.add_argument("--index", action="store_true", help="keep a persistent time index")
+    log_filters(sub)
+    sub = command(logs, "follow", cli_logs_follow, "Print new matching lines until Ctrl+C")
+    sub.add_argument("files", nargs="+")
+    sub.add_argument("--from-start", action="store_true", help="print existing lines first")
+    log_filters(sub)
+    sub = command(logs, "cluster", cli_logs_cluster, "Group errors (incl. rotated/gzipped logs) by signature")
+    sub.add_argument("paths", nargs="+", help="log files or folders")
+    sub.add_argument("--top", type=_positive_int, default=20)
+    sub.add_argument("--workers", type=_positive_int)
+    log_filters(sub, default_level="error")
+    sub = command(logs, "events", cli_logs_events, "Most recent Windows event log entries")
+    sub.add_argument("log_name", help="e.g. Application, System, Security")
+    sub.add_argument("--level", choices=list(EVENT_LOG_LEVELS), type=str.lower, default="error")
+    sub.add_argument("-n", "--lines", type=_positive_int, default=10)
+
+    sub = command(commands, "daemon", cli_daemon, "Run the jobs of a JSON job file on schedule until stopped")
+    sub.add_argument("job_file", help="JSON file: {\"jobs\": [{\"name\", \"command\", \"every\" or \"at\", "
+                                      "\"io_class\", \"max_concurrent\", \"output\"}], \"workers\", "
+                                      "\"io_limits\", \"record\"}")
+    sub.add_argument("--workers", type=_positive_int, help=f"worker threads (default: job file, else {DAEMON_WORKERS})")
+    sub.add_argument("--runs-log", metavar="FILE", help="append one JSON line per run (default: the job file's 'record')")
+    sub.add_argument("--until", type=_duration, help="stop after this much clock time, e.g. 24h")
+    sub.add_argument("--speed", type=_positive_float,
+                     help="run the clock this many times faster than real time (for testing schedules)")
+    sub.add_argument("--dry-run", action="store_true", help="log each run instead of running the command")
+    return parser
+
+def cli_main(argv=None):
+    """Runs one command non-interactively and returns its exit code."""
+    parser = build_cli_parser()
+    args = parser.parse_args(argv)
+    if args.output_mode:
+        OUTPUT.mode = args.output_mode
+    recorder = None
+    if args.profile or args.profile_out or args.trace or args.record:
+        recorder = RunRecorder(args.profile, args.profile_out, args.trace, args.record)
+    if not getattr(args, "handler", None):
+        if recorder is None and not args.output_mode:
+            parser.print_help()
+            return EXIT_USAGE
+        main(recorder) # The interactive menu, with the options above applied
+        return EXIT_OK
+
+    out = CLIOutput(sys.stdout, args.json)
+
+    def run_command():
+        # Progress and error messages go to stderr, so stdout holds only the results
+        with contextlib.redirect_stdout(sys.stderr):
+            try:
+                return args.handler(args, out)
+            except ToolkitError as e:
+                out_error(str(e))
+                return e.exit_code
+            except KeyboardInterrupt:
+                return 130
+            except BrokenPipeError:
+                # The reader (e.g. head) has all it wanted; silence the final flush
+                os.dup2(os.open(os.devnull, os.O_WRONLY), out.stream.fileno())
+                return EXIT_OK
+
+    if recorder is None:
+        return run_command()
+    tool = " ".join(filter(None, (args.command, getattr(args, "action", None))))
+    return recorder.run(tool, run_command)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli_main(sys.argv[1:]))
+    main()